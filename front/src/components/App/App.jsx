@@ -26,6 +26,8 @@ export default function App() {
     scoreTimeline,
     awayPlayerTimeline,
     homePlayerTimeline,
+    awayCourt,
+    homeCourt,
     numQs,
     lastAction,
     playByPlaySectionRef,
@@ -104,6 +106,8 @@ export default function App() {
             scoreTimeline={scoreTimeline}
             awayPlayerTimeline={awayPlayerTimeline}
             homePlayerTimeline={homePlayerTimeline}
+            awayCourt={awayCourt}
+            homeCourt={homeCourt}
             numQs={numQs}
             sectionWidth={playByPlaySectionWidth}
             lastAction={lastAction}
@@ -125,6 +125,8 @@ export default function Play({
   scoreTimeline, 
   awayPlayerTimeline, 
   homePlayerTimeline, 
+  awayCourt,
+  homeCourt,
   numQs, 
   sectionWidth, 
   lastAction, 
@@ -145,6 +147,8 @@ export default function Play({
     scoreTimeline,
     awayPlayerTimeline,
     homePlayerTimeline,
+    awayCourt,
+    homeCourt,
     numQs,
     lastAction,
     gameDate,
@@ -243,6 +247,8 @@ export default function Play({
       scoreTimeline,
       awayPlayerTimeline,
       homePlayerTimeline,
+      awayCourt,
+      homeCourt,
       numQs,
       lastAction,
       gameDate,
@@ -258,6 +264,8 @@ export default function Play({
     scoreTimeline,
     awayPlayerTimeline,
     homePlayerTimeline,
+    awayCourt,
+    homeCourt,
     numQs,
     lastAction,
     gameDate,
@@ -282,6 +290,8 @@ export default function Play({
       scoreTimeline,
       awayPlayerTimeline,
       homePlayerTimeline,
+      awayCourt,
+      homeCourt,
       numQs,
       lastAction,
       gameDate,
@@ -297,6 +307,8 @@ export default function Play({
     scoreTimeline: displayScoreTimeline,
     awayPlayerTimeline: displayAwayPlayerTimeline,
     homePlayerTimeline: displayHomePlayerTimeline,
+    awayCourt: displayAwayCourt,
+    homeCourt: displayHomeCourt,
     numQs: displayNumQs,
     lastAction: displayLastAction,
     gameDate: displayGameDate,
@@ -733,8 +745,10 @@ export default function Play({
         exportStatusLabel,
         exportTimelineWindow,
       } = buildExportRangeData({
+        displayAwayCourt,
         displayAwayPlayers,
         displayAwayPlayerTimeline,
+        displayHomeCourt,
         displayHomePlayers,
         displayHomePlayerTimeline,
         displayLastAction,
@@ -1,3 +1,4 @@
+import { onCourtDuring } from '../../helpers/courtIndex';
 import { getGameTotalSeconds, getPeriodDurationSeconds, getPeriodStartSeconds, getSecondsElapsed } from '../../helpers/playTimeline';
 import { formatClock, formatStatusText } from '../../helpers/utils';
 
@@ -65,9 +66,25 @@ export const buildGameStatusLabel = ({
   return statusText;
 };
 
+// A period-range export only keeps the players who were on court during the
+// range or have an action in it. Without a court index every row is kept.
+const keepRangePlayers = (players, timeline, court, window) => {
+  if (!court || !window) return { players, timeline };
+  const onCourt = new Set(
+    onCourtDuring(court, window.startSeconds, window.startSeconds + window.durationSeconds)
+  );
+  const keep = (name) => onCourt.has(name) || (players[name] || []).length > 0;
+  return {
+    players: Object.fromEntries(Object.entries(players).filter(([name]) => keep(name))),
+    timeline: Object.fromEntries(Object.entries(timeline).filter(([name]) => keep(name))),
+  };
+};
+
 export const buildExportRangeData = ({
+  displayAwayCourt,
   displayAwayPlayers,
   displayAwayPlayerTimeline,
+  displayHomeCourt,
   displayHomePlayers,
   displayHomePlayerTimeline,
   displayLastAction,
@@ -108,30 +125,43 @@ export const buildExportRangeData = ({
     periodRange: exportRangeSnapshot,
     scoreTimeline: exportScoreTimeline,
   });
-  const exportAwayPlayers = Object.fromEntries(
+  const rangeAwayPlayers = Object.fromEntries(
     Object.entries(displayAwayPlayers || {}).map(([name, actions]) => [
       name,
       (actions || []).filter((action) => isInRange(action?.period)),
     ])
   );
-  const exportHomePlayers = Object.fromEntries(
+  const rangeHomePlayers = Object.fromEntries(
     Object.entries(displayHomePlayers || {}).map(([name, actions]) => [
       name,
       (actions || []).filter((action) => isInRange(action?.period)),
     ])
   );
-  const exportAwayPlayerTimeline = Object.fromEntries(
+  const rangeAwayPlayerTimeline = Object.fromEntries(
     Object.entries(displayAwayPlayerTimeline || {}).map(([name, timeline]) => [
       name,
       (timeline || []).filter((entry) => isInRange(entry?.period)),
     ])
   );
-  const exportHomePlayerTimeline = Object.fromEntries(
+  const rangeHomePlayerTimeline = Object.fromEntries(
     Object.entries(displayHomePlayerTimeline || {}).map(([name, timeline]) => [
       name,
       (timeline || []).filter((entry) => isInRange(entry?.period)),
     ])
   );
+  const courtWindow = hasRangeWindow && !exportRangeSnapshot.isFullGame ? exportTimelineWindow : null;
+  const { players: exportAwayPlayers, timeline: exportAwayPlayerTimeline } = keepRangePlayers(
+    rangeAwayPlayers,
+    rangeAwayPlayerTimeline,
+    displayAwayCourt,
+    courtWindow
+  );
+  const { players: exportHomePlayers, timeline: exportHomePlayerTimeline } = keepRangePlayers(
+    rangeHomePlayers,
+    rangeHomePlayerTimeline,
+    displayHomeCourt,
+    courtWindow
+  );
   const exportStartScoreDiff = hasRangeWindow
     ? (() => {
       const startSeconds = exportTimelineWindow.startSeconds;
@@ -90,6 +90,8 @@ export function useCourtVision() {
     scoreTimeline,
     homePlayerTimeline,
     awayPlayerTimeline,
+    awayCourt,
+    homeCourt,
     allActions,
     awayActions,
     homeActions,
@@ -493,6 +495,8 @@ export function useCourtVision() {
     scoreTimeline,
     awayPlayerTimeline,
     homePlayerTimeline,
+    awayCourt,
+    homeCourt,
     numQs,
     lastAction,
     playByPlaySectionRef,
@@ -1,5 +1,6 @@
 import { useState, useCallback } from 'react';
 import { PREFIX } from '../../environment';
+import { flowV3ToV2 } from '../../helpers/flowV3';
 import { GAME_NOT_STARTED_MESSAGE } from '../../helpers/gameSelectionUtils';
 
 /**
@@ -60,17 +61,18 @@ export function useGameData() {
     if (!payload || typeof payload !== 'object') {
       return { boxData: null, playData: null };
     }
+    // Poller-side FLOW_SCHEMA=3 publishes normalized flows; components read v2.
     if (payload.box || payload.flow) {
       return {
         boxData: payload.box ?? null,
-        playData: payload.flow ?? null,
+        playData: flowV3ToV2(payload.flow ?? null),
       };
     }
     if (payload.teams && payload.id) {
       return { boxData: payload, playData: null };
     }
-    if (payload.v === 2 || payload.schemaVersion === 1) {
-      return { boxData: null, playData: payload };
+    if (payload.v === 2 || payload.v === 3 || payload.schemaVersion === 1) {
+      return { boxData: null, playData: flowV3ToV2(payload) };
     }
     return { boxData: null, playData: null };
   }, []);
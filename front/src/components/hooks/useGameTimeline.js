@@ -165,6 +165,8 @@ export function useGameTimeline(playByPlay, homeTeamId, awayTeamId, lastAction,
         scoreTimeline: [],
         homePlayerTimeline: {},
         awayPlayerTimeline: {},
+        awayCourt: null,
+        homeCourt: null,
         allActions: [],
         awayActions: {},
         homeActions: {},
@@ -179,6 +181,8 @@ export function useGameTimeline(playByPlay, homeTeamId, awayTeamId, lastAction,
         scoreTimeline: normalizeCompactScoreTimeline(playByPlay.score),
         homePlayerTimeline: normalizeCompactTimeline(playByPlay.segments?.home),
         awayPlayerTimeline: normalizeCompactTimeline(playByPlay.segments?.away),
+        awayCourt: playByPlay.court?.away || null,
+        homeCourt: playByPlay.court?.home || null,
         allActions,
         awayActions: filterPlayerActions(awayActions, statOn),
         homeActions: filterPlayerActions(homeActions, statOn),
@@ -190,6 +194,8 @@ export function useGameTimeline(playByPlay, homeTeamId, awayTeamId, lastAction,
       scoreTimeline: playByPlay.scoreTimeline || [],
       homePlayerTimeline: playByPlay.homePlayerTimeline || {},
       awayPlayerTimeline: playByPlay.awayPlayerTimeline || {},
+      awayCourt: null,
+      homeCourt: null,
       allActions,
       awayActions: filterPlayerActions(playByPlay.awayActions, statOn),
       homeActions: filterPlayerActions(playByPlay.homeActions, statOn),
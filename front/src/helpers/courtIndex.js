@@ -0,0 +1,72 @@
+// Reader for the compact court index in the gamepack flow
+// (flow.court.away / flow.court.home): `t` is a sorted list of elapsed game
+// times in centiseconds and `on[i]` a bitmask over `names` of the players on
+// court from t[i] until t[i + 1].
+
+function upperBound(values, target) {
+  let lo = 0;
+  let hi = values.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (values[mid] <= target) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+function lowerBound(values, target) {
+  let lo = 0;
+  let hi = values.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (values[mid] < target) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+function namesInMask(names, mask) {
+  // Masks can exceed 32 bits, so avoid bitwise operators.
+  const result = [];
+  let rest = mask;
+  for (let bit = 0; bit < names.length && rest > 0; bit += 1) {
+    if (rest % 2 === 1) result.push(names[bit]);
+    rest = Math.floor(rest / 2);
+  }
+  return result;
+}
+
+function orMasks(a, b) {
+  let result = 0;
+  let place = 1;
+  let x = a;
+  let y = b;
+  while (x > 0 || y > 0) {
+    if (x % 2 === 1 || y % 2 === 1) result += place;
+    x = Math.floor(x / 2);
+    y = Math.floor(y / 2);
+    place *= 2;
+  }
+  return result;
+}
+
+export function onCourtAt(court, elapsedSeconds) {
+  const times = court?.t || [];
+  const i = upperBound(times, Math.round(elapsedSeconds * 100)) - 1;
+  if (i < 0) return [];
+  return namesInMask(court.names || [], court.on?.[i] || 0);
+}
+
+export function onCourtDuring(court, startSeconds, endSeconds) {
+  const times = court?.t || [];
+  const start = Math.round(startSeconds * 100);
+  const end = Math.round(endSeconds * 100);
+  if (end <= start) return [];
+  const lo = Math.max(upperBound(times, start) - 1, 0);
+  const hi = lowerBound(times, end);
+  let mask = 0;
+  for (let i = lo; i < hi; i += 1) {
+    mask = orMasks(mask, court.on?.[i] || 0);
+  }
+  return namesInMask(court.names || [], mask);
+}
@@ -0,0 +1,69 @@
+// Converts a v3 gamepack flow (player table, row arrays, integer clocks)
+// back to the v2 layout the components read; mirrors flow_v3_to_v2 in the
+// poller's nba_game_poller/flow_v3.py. v2 flows are returned as they are.
+
+function fromCs(clock) {
+  if (!Number.isInteger(clock)) return clock;
+  const pad = (n) => String(n).padStart(2, '0');
+  return `${pad(Math.floor(clock / 6000))}${pad(Math.floor(clock / 100) % 60)}.${pad(clock % 100)}`;
+}
+
+function actionDict(row) {
+  const [, quarter, clock, type, text, detail, seq, awayScore, homeScore, r] = row;
+  const action = { quarter, time: fromCs(clock), type, text, detail, seq, awayScore, homeScore };
+  if (r != null) action.r = r;
+  return action;
+}
+
+function mapTeams(obj, fn) {
+  return Object.fromEntries(Object.entries(obj || {}).map(([team, value]) => [team, fn(value)]));
+}
+
+export function flowV3ToV2(flow) {
+  if (!flow || flow.v !== 3) return flow;
+  const table = flow.players || [];
+  const rows = flow.actions || [];
+  const actions = rows.map(actionDict);
+
+  const byPlayer = new Map();
+  rows.forEach((row, i) => {
+    if (!byPlayer.has(row[0])) byPlayer.set(row[0], []);
+    byPlayer.get(row[0]).push(actions[i]);
+  });
+  const nameOf = (p) => table[p].name;
+
+  const result = {
+    v: 2,
+    periods: flow.periods,
+    last: flow.last == null ? null : {
+      quarter: flow.last.quarter,
+      time: fromCs(flow.last.clock),
+      awayScore: flow.last.awayScore,
+      homeScore: flow.last.homeScore,
+    },
+    score: (flow.score || []).map(([quarter, clock, awayScore, homeScore]) => ({
+      quarter, time: fromCs(clock), awayScore, homeScore,
+    })),
+    players: mapTeams(flow.roster, (indices) => Object.fromEntries(
+      indices.map((p) => [nameOf(p), byPlayer.get(p) || []]),
+    )),
+    segments: mapTeams(flow.segments, (entries) => Object.fromEntries(
+      entries.map(([p, segs]) => [nameOf(p), segs.map(([quarter, start, end]) => ({
+        quarter, start: fromCs(start), end: fromCs(end),
+      }))]),
+    )),
+    lineups: mapTeams(flow.lineups, (stints) => stints.map(
+      ([quarter, start, end, players, pointsFor, against]) => ({
+        quarter, start: fromCs(start), end: fromCs(end), players: players.map(nameOf), for: pointsFor, against,
+      }),
+    )),
+    court: mapTeams(flow.court, (entry) => ({
+      names: (entry.players || []).map(nameOf),
+      t: entry.t || [],
+      on: entry.on || [],
+    })),
+  };
+  if (flow.events) result.events = flow.events.map((i) => actions[i]);
+  if (flow.feed) result.feed = flow.feed.map(actionDict);
+  return result;
+}
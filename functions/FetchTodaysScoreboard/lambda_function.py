@@ -14,7 +14,9 @@ GAME_ID_MAP_PREFIX = os.environ.get('GAME_ID_MAP_PREFIX', 'private/gameIdMap/')
 if GAME_ID_MAP_PREFIX and not GAME_ID_MAP_PREFIX.endswith('/'):
     GAME_ID_MAP_PREFIX += '/'
 
-SCOREBOARD_URL = "https://cdn.nba.com/static/json/liveData/scoreboard/todaysScoreboard_00.json"
+# NBA_CDN_BASE_URL points at a local stand-in for offline runs.
+CDN_BASE_URL = os.environ.get('NBA_CDN_BASE_URL', '').strip() or 'https://cdn.nba.com'
+SCOREBOARD_URL = f"{CDN_BASE_URL.rstrip('/')}/static/json/liveData/scoreboard/todaysScoreboard_00.json"
 
 # Initialize S3 client outside the handler for connection reuse
 s3_client = boto3.client('s3', region_name=REGION)
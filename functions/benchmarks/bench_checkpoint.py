@@ -0,0 +1,90 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "nba-game-poller"))
+
+from nba_game_poller.playbyplay_processing import PlayByPlayProcessor  # noqa: E402
+
+FIXTURE_PATH = os.path.join(ROOT, "tests", "fixtures", "0012200039.json")
+AWAY_TEAM_ID = "1610612740"
+HOME_TEAM_ID = "1610612759"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare restoring a PlayByPlayProcessor checkpoint against replaying the feed."
+    )
+    parser.add_argument(
+        "--fixture",
+        default=FIXTURE_PATH,
+        help="Play-by-play actions JSON (list or {'actions': [...]}).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=50,
+        help="Timed iterations per strategy (default: 50).",
+    )
+    return parser.parse_args()
+
+
+def load_actions(path):
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    return payload["actions"] if isinstance(payload, dict) else payload
+
+
+def new_processor():
+    return PlayByPlayProcessor(
+        game_id="bench",
+        away_team_id=AWAY_TEAM_ID,
+        home_team_id=HOME_TEAM_ID,
+    )
+
+
+def time_per_call(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    args = parse_args()
+    actions = load_actions(args.fixture)
+
+    warm = new_processor()
+    warm.update(actions)
+    flow_body = json.dumps(warm.payload(include_actions=False, include_all_actions=False))
+    checkpoint_body = json.dumps(warm.checkpoint(), separators=(",", ":"))
+
+    def replay():
+        processor = new_processor()
+        processor.update(actions)
+        processor.payload(include_actions=False, include_all_actions=False)
+
+    def restore():
+        processor = PlayByPlayProcessor.from_checkpoint(
+            json.loads(checkpoint_body),
+            json.loads(flow_body),
+        )
+        processor.update(actions)
+        processor.payload(include_actions=False, include_all_actions=False)
+
+    replay_s = time_per_call(replay, args.repeat)
+    restore_s = time_per_call(restore, args.repeat)
+
+    print(f"Actions:          {len(actions)}")
+    print(f"Checkpoint bytes: {len(checkpoint_body)}")
+    print(f"Replay feed:      {replay_s * 1000:.2f} ms")
+    print(f"Restore + decode: {restore_s * 1000:.2f} ms")
+    print(f"Speedup:          {replay_s / restore_s:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "nba-game-poller"))
+
+from nba_game_poller.clock import clock_centiseconds, clock_seconds, trim_clock  # noqa: E402
+
+FIXTURE_PATH = os.path.join(ROOT, "tests", "fixtures", "0012200039.json")
+
+# Regex-only parser that clock.py replaced, kept here as the baseline.
+_CLOCK_RE = re.compile(r"^(?:PT)?(\d+)M(\d+)(?:\.(\d+))?S?$")
+_CLOCK_COMPACT_RE = re.compile(r"^(\d+)(\d{2})(?:\.(\d+))?$")
+_CLOCK_COLON_RE = re.compile(r"^(\d+):(\d+)(?:\.(\d+))?$")
+
+
+def regex_time_to_seconds(clock):
+    if not clock or not isinstance(clock, str):
+        return 0.0
+    for pattern in (_CLOCK_RE, _CLOCK_COMPACT_RE, _CLOCK_COLON_RE):
+        m = pattern.match(clock)
+        if m:
+            return int(m.group(1) or 0) * 60 + int(m.group(2) or 0) + int(m.group(3) or 0) / 100.0
+    return 0.0
+
+
+def regex_trim_clock(clock):
+    if not clock or not isinstance(clock, str):
+        return clock
+    trimmed = clock.strip()
+    if trimmed.startswith("PT"):
+        trimmed = trimmed[2:]
+    if trimmed.endswith("S"):
+        trimmed = trimmed[:-1]
+    if "M" in trimmed:
+        trimmed = trimmed.replace("M", "")
+    return trimmed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Microbenchmark clock parsing.")
+    parser.add_argument("--fixture", default=FIXTURE_PATH, help="Play-by-play actions JSON.")
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over the clocks (default: 200).")
+    return parser.parse_args()
+
+
+def time_pass(fn, values, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for value in values:
+            fn(value)
+    return (time.perf_counter() - start) / (repeat * len(values))
+
+
+def main():
+    args = parse_args()
+    with open(args.fixture, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    actions = payload["actions"] if isinstance(payload, dict) else payload
+
+    raw = [a.get("clock") for a in actions]
+    trimmed = [regex_trim_clock(c) for c in raw]
+    # Sort keys in the events list run over the trimmed form.
+    cases = [
+        ("seconds (feed clocks)", regex_time_to_seconds, clock_seconds, raw),
+        ("seconds (trimmed clocks)", regex_time_to_seconds, clock_seconds, trimmed),
+        ("centiseconds (feed clocks)", regex_time_to_seconds, clock_centiseconds, raw),
+        ("trim", regex_trim_clock, trim_clock, raw),
+    ]
+
+    print(f"{len(raw)} clocks, {len(set(raw))} distinct")
+    for label, before, after, values in cases:
+        before_ns = time_pass(before, values, args.repeat) * 1e9
+        after_ns = time_pass(after, values, args.repeat) * 1e9
+        print(f"{label:<28} {before_ns:7.0f} ns -> {after_ns:6.0f} ns ({before_ns / after_ns:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "nba-game-poller"))
+
+from nba_game_poller import codec  # noqa: E402
+from nba_game_poller.playbyplay_processing import process_playbyplay_payload  # noqa: E402
+
+FIXTURE_PATH = os.path.join(ROOT, "tests", "fixtures", "0012200039.json")
+AWAY_TEAM_ID = "1610612740"
+HOME_TEAM_ID = "1610612759"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare the codec backend against stdlib json on a gamepack and a schedule feed."
+    )
+    parser.add_argument(
+        "--fixture",
+        default=FIXTURE_PATH,
+        help="Play-by-play actions JSON (list or {'actions': [...]}).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=50,
+        help="Timed iterations per case (default: 50).",
+    )
+    return parser.parse_args()
+
+
+def load_actions(path):
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    return payload["actions"] if isinstance(payload, dict) else payload
+
+
+def schedule_team(team_id, wins, losses):
+    return {
+        "teamId": team_id,
+        "teamName": "Team",
+        "teamCity": "City",
+        "teamTricode": "TRI",
+        "teamSlug": "team",
+        "wins": wins,
+        "losses": losses,
+        "score": 0,
+        "seed": 0,
+    }
+
+
+def synthetic_schedule_feed(games=1230, games_per_day=8):
+    """Roughly the shape and size of scheduleLeagueV2_1.json for a full season."""
+    game_dates = []
+    for day in range((games + games_per_day - 1) // games_per_day):
+        date = f"10/{day % 28 + 1:02d}/2025 00:00:00"
+        day_games = []
+        for n in range(min(games_per_day, games - day * games_per_day)):
+            game_id = f"0022500{day * games_per_day + n + 1:03d}"
+            day_games.append({
+                "gameId": game_id,
+                "gameCode": f"20251021/AWYHOM{n}",
+                "gameStatus": 1,
+                "gameStatusText": "7:00 pm ET",
+                "gameSequence": n + 1,
+                "gameDateEst": "2025-10-21T00:00:00Z",
+                "gameTimeEst": "1900-01-01T19:00:00Z",
+                "gameDateTimeEst": "2025-10-21T19:00:00Z",
+                "gameDateUTC": "2025-10-21T04:00:00Z",
+                "gameTimeUTC": "1900-01-01T23:00:00Z",
+                "gameDateTimeUTC": "2025-10-21T23:00:00Z",
+                "day": "Tue",
+                "monthNum": 10,
+                "weekNumber": 1,
+                "weekName": "Week 1",
+                "ifNecessary": False,
+                "seriesText": "",
+                "arenaName": "Arena",
+                "arenaCity": "City",
+                "arenaState": "ST",
+                "postponedStatus": "A",
+                "broadcasters": {
+                    "nationalBroadcasters": [{"broadcasterId": 1, "broadcasterDisplay": "TNT"}],
+                    "homeTvBroadcasters": [{"broadcasterId": 2, "broadcasterDisplay": "Local"}],
+                    "awayTvBroadcasters": [],
+                },
+                "homeTeam": schedule_team(1610612737 + n, day, n),
+                "awayTeam": schedule_team(1610612750 + n, n, day),
+                "pointsLeaders": [],
+            })
+        game_dates.append({"gameDate": date, "games": day_games})
+    return {"meta": {"version": 1}, "leagueSchedule": {"seasonYear": "2025-26", "gameDates": game_dates}}
+
+
+def time_per_call(fn, repeat):
+    fn()
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def stdlib_dumps(obj):
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def main():
+    args = parse_args()
+    flow = process_playbyplay_payload(
+        game_id="bench",
+        actions=load_actions(args.fixture),
+        away_team_id=AWAY_TEAM_ID,
+        home_team_id=HOME_TEAM_ID,
+    )
+    cases = {"gamepack flow": flow, "schedule feed": synthetic_schedule_feed()}
+
+    print(f"Backend: {codec.BACKEND}")
+    for name, obj in cases.items():
+        body = codec.dumps(obj)
+        assert body == stdlib_dumps(obj)
+        rows = [
+            ("encode", time_per_call(lambda: stdlib_dumps(obj), args.repeat), time_per_call(lambda: codec.dumps(obj), args.repeat)),
+            ("decode", time_per_call(lambda: json.loads(body), args.repeat), time_per_call(lambda: codec.loads(body), args.repeat)),
+        ]
+        print(f"{name} ({len(body)} bytes)")
+        for label, stdlib_s, codec_s in rows:
+            print(
+                f"  {label}: stdlib {stdlib_s * 1000:.2f} ms, "
+                f"{codec.BACKEND} {codec_s * 1000:.2f} ms ({stdlib_s / codec_s:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "nba-game-poller"))
+
+from nba_game_poller import codec  # noqa: E402
+from nba_game_poller.playbyplay_processing import process_playbyplay_payload  # noqa: E402
+from nba_game_poller.storage import (  # noqa: E402
+    DEFAULT_COMPRESSION_POLICIES,
+    CompressionPolicy,
+    compress_body,
+    parse_compression_policies,
+)
+
+FIXTURE_PATH = os.path.join(ROOT, "tests", "fixtures", "0012200039.json")
+AWAY_TEAM_ID = "1610612740"
+HOME_TEAM_ID = "1610612759"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Bytes versus CPU of the upload compression policies, live and final."
+    )
+    parser.add_argument(
+        "--fixture",
+        default=FIXTURE_PATH,
+        help="Play-by-play actions JSON (list or {'actions': [...]}).",
+    )
+    parser.add_argument(
+        "--policies",
+        default=None,
+        help="Extra gamepack policies to compare, e.g. '1:6,6:9' (live:final).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=20,
+        help="Timed iterations per case (default: 20).",
+    )
+    return parser.parse_args()
+
+
+def load_actions(path):
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    return payload["actions"] if isinstance(payload, dict) else payload
+
+
+def time_per_call(fn, repeat):
+    fn()
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def main():
+    args = parse_args()
+    actions = load_actions(args.fixture)
+    bodies = {}
+    # Live uploads at halftime and late in the game, then the one final upload.
+    slices = (("halftime", len(actions) // 2), ("late", len(actions) * 9 // 10), ("final", len(actions)))
+    for label, end in slices:
+        flow = process_playbyplay_payload(
+            game_id="bench",
+            actions=actions[:end],
+            away_team_id=AWAY_TEAM_ID,
+            home_team_id=HOME_TEAM_ID,
+            include_actions=False,
+            include_all_actions=False,
+        )
+        bodies[label] = codec.dumps({"v": 1, "id": "bench", "publicId": "bench", "box": None, "flow": flow})
+
+    policies = [("default", DEFAULT_COMPRESSION_POLICIES["gamepack"])]
+    policies += [("gzip 9 (old)", CompressionPolicy(9, 9))]
+    for spec in (args.policies or "").split(","):
+        if spec.strip():
+            policies.append((spec, parse_compression_policies(f"gamepack={spec}")["gamepack"]))
+
+    for label, raw in bodies.items():
+        final = label == "final"
+        print(f"{label}: {len(raw)} bytes JSON")
+        for name, policy in policies:
+            encoding, body = compress_body(raw, policy, final=final)
+            seconds = time_per_call(lambda: compress_body(raw, policy, final=final), args.repeat)
+            print(f"  {name + ':':16s}{seconds * 1000:7.2f} ms  {encoding or 'identity'} {len(body)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "nba-game-poller"))
+
+from nba_game_poller import codec  # noqa: E402
+from nba_game_poller.gamepack_binary import decode_gamepack, encode_gamepack, read_columns  # noqa: E402
+from nba_game_poller.playbyplay_processing import process_playbyplay_payload  # noqa: E402
+
+FIXTURE_PATH = os.path.join(ROOT, "tests", "fixtures", "0012200039.json")
+AWAY_TEAM_ID = "1610612740"
+HOME_TEAM_ID = "1610612759"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare the binary columnar gamepack against the JSON one (size and parse time)."
+    )
+    parser.add_argument(
+        "--fixture",
+        default=FIXTURE_PATH,
+        help="Play-by-play actions JSON (list or {'actions': [...]}).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=50,
+        help="Timed iterations per case (default: 50).",
+    )
+    return parser.parse_args()
+
+
+def load_actions(path):
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    return payload["actions"] if isinstance(payload, dict) else payload
+
+
+def time_per_call(fn, repeat):
+    fn()
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def main():
+    args = parse_args()
+    flow = process_playbyplay_payload(
+        game_id="bench",
+        actions=load_actions(args.fixture),
+        away_team_id=AWAY_TEAM_ID,
+        home_team_id=HOME_TEAM_ID,
+        include_actions=False,
+        include_all_actions=False,
+    )
+    gamepack = {"v": 1, "id": "bench", "publicId": "bench", "box": None, "flow": flow}
+
+    json_body = codec.dumps(gamepack)
+    binary_body = encode_gamepack(gamepack)
+    json_gz = gzip.compress(json_body)
+    binary_gz = gzip.compress(binary_body)
+    assert decode_gamepack(binary_body) == gamepack
+
+    print(f"JSON codec backend: {codec.BACKEND}")
+    print(f"JSON:   {len(json_body)} bytes, {len(json_gz)} gzipped")
+    print(f"Binary: {len(binary_body)} bytes, {len(binary_gz)} gzipped")
+    cases = [
+        ("encode JSON", lambda: gzip.compress(codec.dumps(gamepack))),
+        ("encode binary", lambda: gzip.compress(encode_gamepack(gamepack))),
+        ("parse JSON", lambda: codec.loads(gzip.decompress(json_gz))),
+        ("decode binary to dicts", lambda: decode_gamepack(gzip.decompress(binary_gz))),
+        ("read binary columns", lambda: read_columns(gzip.decompress(binary_gz))),
+    ]
+    for label, fn in cases:
+        print(f"{label + ':':24s}{time_per_call(fn, args.repeat) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+from botocore.exceptions import ClientError
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "nba-game-poller"))
+
+from nba_game_poller.fake_cdn import FakeCdn, start_server  # noqa: E402
+from nba_game_poller.synthetic import generate_night  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Poll a synthetic night end to end against a local fake NBA CDN and report "
+            "poll latency, 304 rate and throughput."
+        )
+    )
+    parser.add_argument("--games", type=int, default=4, help="Games on the night (default: 4).")
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed (default: 0).")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=600.0,
+        help="Fake seconds per wall second (default: 600).",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=30,
+        help="Game seconds between feed snapshots (default: 30).",
+    )
+    parser.add_argument(
+        "--poll-seconds",
+        type=float,
+        default=0.1,
+        help="Wall seconds between poll rounds (default: 0.1).",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="CDN delay per request in ms.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra random CDN delay up to this many ms.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of CDN requests that fail.")
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=120.0,
+        help="Stop after this many wall seconds even if games are live (default: 120).",
+    )
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file.")
+    return parser.parse_args()
+
+
+class StubS3Client:
+    """Accepts uploads and has nothing stored, like a fresh bucket."""
+
+    def __init__(self):
+        self.puts = 0
+        self.bytes = 0
+
+    def put_object(self, **kwargs):
+        self.puts += 1
+        self.bytes += len(kwargs["Body"])
+
+    def get_object(self, **kwargs):
+        raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+
+
+def load_lambda(base_url):
+    # lambda_function reads its configuration at import time.
+    os.environ["NBA_CDN_BASE_URL"] = base_url
+    for name, value in (
+        ("DATA_BUCKET", "bench"),
+        ("POLLER_RULE_NAME", "bench"),
+        ("AWS_DEFAULT_REGION", "us-east-1"),
+    ):
+        os.environ.setdefault(name, value)
+    import lambda_function
+
+    lambda_function.s3_client = StubS3Client()
+    return lambda_function
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(args):
+    games = generate_night("2025-10-21", count=args.games, seed=args.seed)
+    cdn = FakeCdn.from_night(
+        games,
+        interval=args.interval,
+        speed=args.speed,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    server, base_url = start_server(cdn)
+    lambda_function = load_lambda(base_url)
+    items = [
+        {
+            "id": game.game_id,
+            "nbaGameId": game.game_id,
+            "awayTeamId": game.team_ids["away"],
+            "homeTeamId": game.team_ids["home"],
+        }
+        for game in games
+    ]
+
+    fetch_ms = []
+    process_ms = []
+    live = list(items)
+    started = time.perf_counter()
+    cdn.set_time(0)
+    try:
+        while live and time.perf_counter() - started < args.max_seconds:
+            round_start = time.perf_counter()
+            for item in list(live):
+                with redirect_stdout(io.StringIO()):
+                    t0 = time.perf_counter()
+                    poll = lambda_function.start_game(item)
+                    t1 = time.perf_counter()
+                    is_final, updates = lambda_function.finish_game(poll)
+                    t2 = time.perf_counter()
+                fetch_ms.append((t1 - t0) * 1000)
+                if poll is not None:
+                    process_ms.append((t2 - t1) * 1000)
+                item.update(updates)
+                if is_final:
+                    live.remove(item)
+            time.sleep(max(0.0, args.poll_seconds - (time.perf_counter() - round_start)))
+    finally:
+        server.shutdown()
+    wall = time.perf_counter() - started
+
+    stats = cdn.stats
+    fetched = stats.get(200, 0) + stats.get(304, 0)
+    return {
+        "games": len(games),
+        "final": len(games) - len(live),
+        "wall_s": round(wall, 2),
+        "polls": len(fetch_ms),
+        "polls_per_s": round(len(fetch_ms) / wall, 1) if wall else 0.0,
+        "fetch_ms": {
+            "p50": round(percentile(fetch_ms, 0.5), 3),
+            "p95": round(percentile(fetch_ms, 0.95), 3),
+            "max": round(max(fetch_ms, default=0.0), 3),
+        },
+        "process_ms": {
+            "p50": round(percentile(process_ms, 0.5), 3),
+            "p95": round(percentile(process_ms, 0.95), 3),
+            "max": round(max(process_ms, default=0.0), 3),
+        },
+        "cdn": {str(key): value for key, value in stats.items()},
+        "not_modified_rate": round(stats.get(304, 0) / fetched, 3) if fetched else 0.0,
+        "uploads": lambda_function.s3_client.puts,
+        "upload_bytes": lambda_function.s3_client.bytes,
+    }
+
+
+def main():
+    args = parse_args()
+    report = run(args)
+    print(f"{report['final']}/{report['games']} games final in {report['wall_s']}s wall")
+    print(f"{report['polls']} polls ({report['polls_per_s']}/s), 304 rate {report['not_modified_rate']:.1%}")
+    for name in ("fetch_ms", "process_ms"):
+        numbers = report[name]
+        print(f"{name:12s} p50 {numbers['p50']:8.3f}  p95 {numbers['p95']:8.3f}  max {numbers['max']:8.3f}")
+    print(f"CDN responses: {report['cdn']}")
+    print(f"S3 uploads: {report['uploads']} ({report['upload_bytes']} bytes)")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
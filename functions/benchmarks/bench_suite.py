@@ -0,0 +1,331 @@
+import argparse
+import copy
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "nba-game-poller"))
+
+from nba_game_poller import codec  # noqa: E402
+from nba_game_poller.clock import clock_seconds  # noqa: E402
+from nba_game_poller.gamepack import build_box_payload  # noqa: E402
+from nba_game_poller.playbyplay_processing import (  # noqa: E402
+    process_playbyplay_payload,
+    sort_actions,
+    time_to_seconds,
+)
+from nba_game_poller.storage import DEFAULT_COMPRESSION_POLICIES, upload_json_to_s3  # noqa: E402
+from nba_game_poller.synthetic import SyntheticGame  # noqa: E402
+
+FIXTURE_PATH = os.path.join(ROOT, "tests", "fixtures", "0012200039.json")
+AWAY_TEAM_ID = "1610612740"
+HOME_TEAM_ID = "1610612759"
+# Fractions of the fixture for the early/mid/late-game slices.
+SLICES = (("early", 0.25), ("mid", 0.5), ("late", 0.9))
+OVERTIMES = (2, 4)
+# Generated games for situations the fixture does not cover: (label, overtimes, sub_rate).
+SYNTHETIC = (("synthetic", 0, 1.0), ("synthetic-3ot", 3, 1.0), ("synthetic-subs", 0, 4.0))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark the poller's processing stages on the fixture, game slices and "
+            "multi-overtime variants, and save the results as JSON."
+        )
+    )
+    parser.add_argument(
+        "--fixture",
+        default=FIXTURE_PATH,
+        help="Play-by-play actions JSON (list or {'actions': [...]}).",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=20,
+        help="Timed iterations per case (default: 20).",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Write the results to this JSON file.",
+    )
+    parser.add_argument(
+        "--compare",
+        default=None,
+        help="Earlier --output file to compare against.",
+    )
+    parser.add_argument(
+        "--only",
+        default=None,
+        help="Only run cases whose name contains this string.",
+    )
+    return parser.parse_args()
+
+
+def load_actions(path):
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    return payload["actions"] if isinstance(payload, dict) else payload
+
+
+def time_per_call(fn, repeat):
+    fn()
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def _shift_score(value, points):
+    if value in (None, "") or not str(value).isdigit():
+        return value
+    return str(int(value) + points)
+
+
+def overtime_variant(actions, overtimes):
+    """
+    The game with `overtimes` extra periods, each a copy of the last five
+    minutes of the fourth (which is as long as an overtime), renumbered and
+    with the scores carried on.
+    """
+    tail = [
+        a for a in actions
+        if a.get("period") == 4 and clock_seconds(a.get("clock")) <= 300
+    ]
+    if not tail:
+        return list(actions)
+    start = next(a for a in reversed(actions) if a not in tail)
+    away_gain = int(tail[-1]["scoreAway"]) - int(start["scoreAway"])
+    home_gain = int(tail[-1]["scoreHome"]) - int(start["scoreHome"])
+    step = max(a.get("actionNumber") or 0 for a in actions) + 1
+
+    result = list(actions)
+    for n in range(1, overtimes + 1):
+        period_start = dict(actions[0], period=4 + n, clock="PT05M00.00S")
+        period_start["description"] = f"Start of {n}OT"
+        for a in [period_start] + tail:
+            a = dict(a)
+            a["period"] = 4 + n
+            a["actionNumber"] = (a.get("actionNumber") or 0) + step * n
+            if a.get("actionId") is not None:
+                a["actionId"] = a["actionId"] + step * n
+            a["scoreAway"] = _shift_score(a.get("scoreAway"), away_gain * n)
+            a["scoreHome"] = _shift_score(a.get("scoreHome"), home_gain * n)
+            result.append(a)
+    return result
+
+
+def box_from_actions(actions):
+    """Boxscore-shaped game dict with every player seen in the actions."""
+    teams = {}
+    for a in actions:
+        team_id = a.get("teamId")
+        if not team_id or not a.get("personId"):
+            continue
+        team = teams.setdefault(team_id, {
+            "teamId": team_id,
+            "teamTricode": a.get("teamTricode"),
+            "teamName": a.get("teamTricode"),
+            "players": {},
+        })
+        player = team["players"].setdefault(a["personId"], {
+            "personId": a["personId"],
+            "firstName": (a.get("playerNameI") or "").split(".")[0],
+            "familyName": a.get("playerName") or "",
+            "statistics": {"minutes": "PT24M13.00S", "points": 0, "fieldGoalsMade": 0, "fieldGoalsAttempted": 0},
+        })
+        stats = player["statistics"]
+        if a.get("isFieldGoal"):
+            stats["fieldGoalsAttempted"] += 1
+            if a.get("shotResult") == "Made":
+                stats["fieldGoalsMade"] += 1
+                stats["points"] += 2
+    away = teams.get(int(AWAY_TEAM_ID)) or {}
+    home = teams.get(int(HOME_TEAM_ID)) or {}
+    for team in (away, home):
+        team["players"] = list((team.get("players") or {}).values())
+    return {"gameEt": "2022-10-07T20:00:00Z", "awayTeam": away, "homeTeam": home}
+
+
+def schedule_games(count=15):
+    games = []
+    for n in range(count):
+        games.append({
+            "id": f"2025-10-21-team{n}-team{n + 1}",
+            "nbaGameId": f"0022500{n + 1:03d}",
+            "starttime": f"2025-10-21T{19 + n % 4}:00:00",
+            "status": "Q3 5:12",
+            "time": "512.00",
+            "homescore": 70 + n,
+            "awayscore": 68 + n,
+            "homerecord": "1-0",
+            "awayrecord": "0-1",
+            "hometeam": "HOM",
+            "awayteam": "AWY",
+            "homeTeamId": 1610612700 + n,
+            "awayTeamId": 1610612730 + n,
+            "play_etag": f'"{n:032x}"',
+            "box_etag": f'"{n + 1:032x}"',
+        })
+    return games
+
+
+class StubS3Client:
+    """put_object that only counts bytes, so uploads time serialization and compression."""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def put_object(self, **kwargs):
+        self.bytes += len(kwargs["Body"])
+
+
+def load_schedules_equal():
+    # lambda_function reads its configuration at import time.
+    for name, value in (
+        ("DATA_BUCKET", "bench"),
+        ("POLLER_RULE_NAME", "bench"),
+        ("AWS_DEFAULT_REGION", "us-east-1"),
+    ):
+        os.environ.setdefault(name, value)
+    import lambda_function
+
+    return lambda_function.schedules_equal
+
+
+def build_cases(actions):
+    games = {"full": actions}
+    for label, fraction in SLICES:
+        games[label] = actions[:int(len(actions) * fraction)]
+    for overtimes in OVERTIMES:
+        games[f"{overtimes}ot"] = overtime_variant(actions, overtimes)
+    for label, overtimes, sub_rate in SYNTHETIC:
+        synthetic = SyntheticGame("bench", AWAY_TEAM_ID, HOME_TEAM_ID, overtimes=overtimes, sub_rate=sub_rate)
+        games[label] = synthetic.actions
+
+    cases = []
+    for label, game in games.items():
+        def process(game=game):
+            return process_playbyplay_payload(
+                game_id="bench",
+                actions=game,
+                away_team_id=AWAY_TEAM_ID,
+                home_team_id=HOME_TEAM_ID,
+            )
+
+        def process_slim(game=game):
+            return process_playbyplay_payload(
+                game_id="bench",
+                actions=game,
+                away_team_id=AWAY_TEAM_ID,
+                home_team_id=HOME_TEAM_ID,
+                include_actions=False,
+                include_all_actions=False,
+            )
+
+        cases.append((f"process_playbyplay_payload[{label}]", len(game), process))
+        cases.append((f"process_playbyplay_payload.slim[{label}]", len(game), process_slim))
+
+    clocks = [a.get("clock") for a in actions]
+    cases.append(("time_to_seconds[full]", len(clocks), lambda: [time_to_seconds(c) for c in clocks]))
+
+    shuffled = list(reversed(actions))
+    cases.append(("sort_actions[full]", len(actions), lambda: sort_actions(shuffled)))
+    cases.append(("sort_actions[4ot]", len(games["4ot"]), lambda: sort_actions(games["4ot"][::-1])))
+
+    box = box_from_actions(actions)
+    cases.append(("build_box_payload", 1, lambda: build_box_payload("bench", box)))
+
+    gamepack = {"v": 1, "id": "bench", "publicId": "bench", "box": build_box_payload("bench", box)}
+    gamepack["flow"] = process_playbyplay_payload(
+        game_id="bench",
+        actions=actions,
+        away_team_id=AWAY_TEAM_ID,
+        home_team_id=HOME_TEAM_ID,
+        include_actions=False,
+        include_all_actions=False,
+    )
+    policy = DEFAULT_COMPRESSION_POLICIES["gamepack"]
+    for label, is_final in (("live", False), ("final", True)):
+        def upload(is_final=is_final):
+            upload_json_to_s3(
+                s3_client=StubS3Client(),
+                bucket="bench",
+                prefix="data/",
+                key="gamepack/bench.json",
+                data=gamepack,
+                is_final=is_final,
+                policy=policy,
+            )
+
+        cases.append((f"upload_json_to_s3[{label}]", 1, upload))
+
+    schedules_equal = load_schedules_equal()
+    existing = schedule_games()
+    merged = copy.deepcopy(existing)
+    changed = copy.deepcopy(existing)
+    changed[-1]["homescore"] += 1
+    cases.append(("schedules_equal[same]", len(existing), lambda: schedules_equal(existing, merged)))
+    cases.append(("schedules_equal[changed]", len(existing), lambda: schedules_equal(existing, changed)))
+    return cases
+
+
+def run(args):
+    actions = load_actions(args.fixture)
+    results = {}
+    for name, items, fn in build_cases(actions):
+        if args.only and args.only not in name:
+            continue
+        # Uploads print one line per object; keep the report readable.
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, "w")
+        try:
+            seconds = time_per_call(fn, args.repeat)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        results[name] = {"ms": round(seconds * 1000, 4), "items": items}
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "codec": codec.BACKEND,
+            "fixture": os.path.basename(args.fixture),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def main():
+    args = parse_args()
+    report = run(args)
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results") or {}
+
+    for name, result in report["results"].items():
+        line = f"{name:48s}{result['ms']:10.3f} ms  ({result['items']} items)"
+        before = baseline.get(name)
+        if before and before.get("ms"):
+            line += f"  x{result['ms'] / before['ms']:.2f} vs baseline"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,43 @@
 import gzip
-import json
 import boto3
 import os
 import random
+import secrets
 import time
 from collections import defaultdict
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from botocore.exceptions import ClientError
 
-from nba_game_poller.nba_api import USER_AGENTS, fetch_nba_data_urllib
-from nba_game_poller.playbyplay_processing import infer_team_ids_from_actions, process_playbyplay_payload
-from nba_game_poller.storage import upload_json_to_s3, upload_schedule_s3, update_manifest as update_manifest
+from nba_game_poller import codec
+from nba_game_poller.clock import trim_clock
+from nba_game_poller.delta import build_gamepack_delta
+from nba_game_poller.executor import make_executor
+from nba_game_poller.feed_stream import parse_playbyplay_feed
+from nba_game_poller.flow_v3 import flow_v3_to_v2
+from nba_game_poller.gamepack_binary import encode_gamepack
+from nba_game_poller.gamepack import build_box_payload
+from nba_game_poller.memory import MemoryProfile, memory_tracking, track_memory
+from nba_game_poller.nba_api import (
+    USER_AGENTS,
+    boxscore_url,
+    fetch_nba_data_urllib,
+    playbyplay_url,
+    schedule_feed_url,
+)
+from nba_game_poller.playbyplay_processing import (
+    ActionTextCache,
+    PlayByPlayProcessor,
+    build_playbyplay_processor,
+    infer_team_ids_from_actions,
+)
+from nba_game_poller.stages import StageTimer, stage, stage_timing
+from nba_game_poller.storage import (
+    parse_compression_policies,
+    upload_json_to_s3,
+    upload_schedule_s3,
+    update_manifest as update_manifest,
+)
 
 # --- Configuration & Environment ---
 REGION = os.environ.get('AWS_REGION', 'us-east-1')
@@ -29,10 +55,23 @@ RECONCILE_LEAD_MINUTES = 15
 RECONCILE_LATE_MINUTES = 45
 SCHEDULE_PREFIX = 'schedule/'
 GAMEPACK_PREFIX = 'gamepack/'
+# Deltas live outside gamepack/ so an S3 lifecycle rule on this prefix can
+# expire them (see terraform/storage.tf) and gamepack key parsers skip them.
+GAMEPACK_DELTA_PREFIX = 'gamepack-delta/'
+# Also publish gamepack/{game_key}.bin.gz (see gamepack_binary) next to the JSON.
+GAMEPACK_BINARY = os.environ.get("GAMEPACK_BINARY", "").lower() in ("1", "true", "yes")
+# gzip levels (live:final) per key family, e.g.
+# "gamepack=3:9,schedule=6:9"; see storage.parse_compression_policies.
+COMPRESSION_POLICIES = parse_compression_policies(os.environ.get("COMPRESSION_POLICIES"))
+# Flow layout in published gamepacks: 2 (default) or the normalized 3 (see flow_v3).
+FLOW_SCHEMA = 3 if os.environ.get("FLOW_SCHEMA", "2").strip() == "3" else 2
 GAME_ID_MAP_PREFIX = os.environ.get("GAME_ID_MAP_PREFIX", "private/gameIdMap/")
 if GAME_ID_MAP_PREFIX and not GAME_ID_MAP_PREFIX.endswith('/'):
     GAME_ID_MAP_PREFIX += '/'
-SCHEDULE_FEED_URL = "https://cdn.nba.com/static/json/staticData/scheduleLeagueV2_1.json"
+CHECKPOINT_PREFIX = os.environ.get("CHECKPOINT_PREFIX", "private/checkpoint/")
+if CHECKPOINT_PREFIX and not CHECKPOINT_PREFIX.endswith('/'):
+    CHECKPOINT_PREFIX += '/'
+SCHEDULE_FEED_URL = schedule_feed_url()
 SCHEDULE_RECONCILE_DAYS = os.environ.get("SCHEDULE_RECONCILE_DAYS", "3")
 
 # 3. Security (From Terraform)
@@ -47,24 +86,54 @@ scheduler_client = boto3.client('scheduler', region_name=REGION)
 ET_ZONE = ZoneInfo("America/New_York")
 UTC_ZONE = ZoneInfo("UTC")
 
+# Incremental play-by-play state, kept across polls while the container is warm.
+PLAYBYPLAY_PROCESSORS = {}
+ACTION_TEXT_CACHES = {}
+# Digest of the actions each processor has consumed (see parse_playbyplay_feed).
+FEED_WATERMARKS = {}
+# Last published gamepack per game, the parent of the next delta.
+LAST_GAMEPACKS = {}
+# Worker processes (or threads) for full play-by-play replays; see start_playbyplay_replay.
+# Not used with a single CPU.
+GAME_EXECUTOR = None
+POLLER_WORKERS = os.environ.get("POLLER_WORKERS")
+REPLAY_HANDOFF_MIN_ACTIONS = int(os.environ.get("REPLAY_HANDOFF_MIN_ACTIONS", "200"))
+# Log per-stage timings of every poll (see nba_game_poller.stages).
+STAGE_TIMING = os.environ.get("STAGE_TIMING", "").lower() in ("1", "true", "yes")
+# Log the peak traced memory of every task (see nba_game_poller.memory).
+MEMORY_PROFILE = os.environ.get("MEMORY_PROFILE", "").lower() in ("1", "true", "yes")
+
 # --- Main Handler ---
 
 def main_handler(event, context):
     """
     Dispatcher: routes execution based on the 'task' field in the event.
-    Pass 'context' to the poller for time-aware sleeping.
+    Pass 'context' to the poller for time-aware sleeping. "stageTiming": true
+    in the event (or STAGE_TIMING=1) logs per-stage timings of the poll, and
+    "memoryProfile": true (or MEMORY_PROFILE=1) the peak memory of the task,
+    its games and their steps, with tracemalloc.
     """
     task = event.get('task', 'poller')
     print(f"--- Execution started with task: {task} ---")
+    memory = MemoryProfile() if event.get("memoryProfile") or MEMORY_PROFILE else None
 
-    if task == 'manager':
-        return manager_logic()
-    elif task == 'enable_poller':
-        return enable_poller_logic()
-    elif task == 'reconcile':
-        return reconcile_logic()
-    else:
-        return poller_logic(context)
+    try:
+        with memory_tracking(memory, task):
+            if task == 'manager':
+                return manager_logic()
+            elif task == 'enable_poller':
+                return enable_poller_logic()
+            elif task == 'reconcile':
+                return reconcile_logic()
+            else:
+                return poller_logic(
+                    context,
+                    timing=bool(event.get("stageTiming")) or STAGE_TIMING,
+                    memory=memory,
+                )
+    finally:
+        if memory is not None:
+            log_memory({"task": task}, memory)
 
 # ==============================================================================
 # 1. MANAGER LOGIC (Runs Daily at Noon)
@@ -120,7 +189,7 @@ def create_one_time_schedule(name, run_at_dt, payload):
             Target={
                 'Arn': LAMBDA_ARN,
                 'RoleArn': SCHEDULER_ROLE_ARN,
-                'Input': json.dumps(payload)
+                'Input': codec.dumps(payload).decode("utf-8")
             },
             FlexibleTimeWindow={'Mode': 'OFF'}
         )
@@ -203,7 +272,7 @@ def enable_poller_logic():
 # ==============================================================================
 # 3. POLLER LOGIC (Runs Every Minute)
 # ==============================================================================
-def poller_logic(context):
+def poller_logic(context, timing=False, memory=None):
     today_str = get_nba_date()
     games = get_games_from_s3(today_str)
 
@@ -214,7 +283,8 @@ def poller_logic(context):
 
     game_id_map = load_game_id_map(today_str)
     if game_id_map is None:
-        feed = fetch_schedule_feed()
+        with track_memory("schedule.feed"):
+            feed = fetch_schedule_feed()
         if feed:
             game_id_map = build_game_id_map_from_feed(feed, today_str)
             if game_id_map:
@@ -247,6 +317,7 @@ def poller_logic(context):
             games_list=games,
             date_str=today_str,
             prefix=SCHEDULE_PREFIX,
+            policy=COMPRESSION_POLICIES["schedule"],
         )
         disable_self()
         return
@@ -264,31 +335,35 @@ def poller_logic(context):
     total_games_to_process = len(active_games)
     schedule_dirty = False
 
+    executor = get_game_executor()
+    # Games whose play-by-play replay was handed to the executor; they are
+    # finished after the next polite sleep so the replay runs during it.
+    deferred = []
+    # Per-stage timings of each game, rolled up for the whole invocation.
+    invocation_stages = StageTimer() if timing else None
+
     for i, game in enumerate(active_games):
+        schedule_dirty = finish_deferred_games(
+            deferred, date_str=today_str, invocation_stages=invocation_stages, invocation_memory=memory
+        ) or schedule_dirty
         game_key = game.get('id')
         
         try:
-            # Pass the SESSION user agent down
-            is_final, updates = process_game(
-                game,
-                user_agent=session_user_agent,
-                date_str=today_str,
-            )
-            
-            if is_final:
-                print(f"Poller: Game {game_key} went Final.")
-                update_manifest(
-                    s3_client=s3_client,
-                    bucket=BUCKET,
-                    manifest_key=MANIFEST_KEY,
-                    game_id=game_key,
-                )
-            
-            # --- UPDATE SCHEDULE FILE ---
-            # If we have updates, apply them to our local 'games' list and upload after polling
-            if updates:
-                game.update(updates) # Updates the object inside the 'games' list
-                schedule_dirty = True
+            timer = StageTimer() if timing else None
+            game_memory = MemoryProfile() if memory is not None else None
+            with stage_timing(timer), memory_tracking(game_memory, "game"):
+                # Pass the SESSION user agent down
+                poll = start_game(game, user_agent=session_user_agent, executor=executor)
+            if poll is not None and poll.get("replay") is not None:
+                poll["stages"] = timer
+                poll["memory"] = game_memory
+                deferred.append((game, poll))
+            else:
+                with stage_timing(timer), memory_tracking(game_memory, "game"):
+                    is_final, updates = finish_game(poll, date_str=today_str)
+                    schedule_dirty = record_game_result(game, is_final, updates) or schedule_dirty
+                log_game_stages(game_key, timer, invocation_stages)
+                log_game_memory(game_key, game_memory, memory)
 
             # --- DYNAMIC SLEEP LOGIC ---
             # We skip sleep after the very last game
@@ -299,6 +374,9 @@ def poller_logic(context):
 
         except Exception as e:
             print(f"Poller Error on game {game_key}: {e}")
+    schedule_dirty = finish_deferred_games(
+        deferred, date_str=today_str, invocation_stages=invocation_stages, invocation_memory=memory
+    ) or schedule_dirty
     if schedule_dirty:
         print("Poller: Updates found, refreshing schedule file.")
         upload_schedule_s3(
@@ -307,9 +385,80 @@ def poller_logic(context):
             games_list=games,
             date_str=today_str,
             prefix=SCHEDULE_PREFIX,
+            policy=COMPRESSION_POLICIES["schedule"],
         )
     # Update the global "Init State" file so the frontend knows where to land
     upload_init_state(games, today_str)
+    if invocation_stages is not None:
+        log_stages({"invocation": True, "games": total_games_to_process}, invocation_stages)
+
+
+def log_stages(fields, timer):
+    """One structured log line with a StageTimer's totals."""
+    print(f"Poller: stages {codec.dumps(dict(fields, stages=timer.to_json())).decode()}")
+
+
+def log_game_stages(game_key, timer, invocation_stages):
+    if timer is None:
+        return
+    log_stages({"game": game_key}, timer)
+    if invocation_stages is not None:
+        invocation_stages.merge(timer)
+
+
+def log_memory(fields, profile):
+    """One structured log line with a MemoryProfile's peaks and top allocation sites."""
+    print(f"Poller: memory {codec.dumps(dict(fields, memory=profile.to_json())).decode()}")
+
+
+def log_game_memory(game_key, profile, invocation_memory):
+    if profile is None:
+        return
+    log_memory({"game": game_key}, profile)
+    if invocation_memory is not None:
+        invocation_memory.merge(profile)
+
+def record_game_result(game, is_final, updates):
+    """
+    Applies one game's poll result: marks it in the manifest when it went
+    Final and merges updates into the schedule item. Returns True if the
+    schedule file needs re-uploading.
+    """
+    game_key = game.get('id')
+    if is_final:
+        print(f"Poller: Game {game_key} went Final.")
+        update_manifest(
+            s3_client=s3_client,
+            bucket=BUCKET,
+            manifest_key=MANIFEST_KEY,
+            game_id=game_key,
+            policy=COMPRESSION_POLICIES["manifest"],
+        )
+
+    # --- UPDATE SCHEDULE FILE ---
+    # If we have updates, apply them to our local 'games' list and upload after polling
+    if updates:
+        game.update(updates) # Updates the object inside the 'games' list
+        return True
+    return False
+
+
+def finish_deferred_games(deferred, date_str=None, invocation_stages=None, invocation_memory=None):
+    schedule_dirty = False
+    while deferred:
+        game, poll = deferred.pop(0)
+        timer = poll.get("stages")
+        game_memory = poll.get("memory")
+        try:
+            with stage_timing(timer), memory_tracking(game_memory, "game"):
+                is_final, updates = finish_game(poll, date_str=date_str)
+                schedule_dirty = record_game_result(game, is_final, updates) or schedule_dirty
+            log_game_stages(game.get('id'), timer, invocation_stages)
+            log_game_memory(game.get('id'), game_memory, invocation_memory)
+        except Exception as e:
+            print(f"Poller Error on game {game.get('id')}: {e}")
+    return schedule_dirty
+
 
 def upload_init_state(games_today, date_str):
     """
@@ -351,7 +500,7 @@ def upload_init_state(games_today, date_str):
     s3_client.put_object(
         Bucket=BUCKET,
         Key=f"{PREFIX}init.json",
-        Body=json.dumps(init_data),
+        Body=codec.dumps(init_data),
         ContentType='application/json',
         CacheControl='max-age=60'
     )
@@ -417,56 +566,111 @@ def disable_self():
 # ==============================================================================
 # CORE PROCESSING (Fetch -> Upload -> Update)
 # ==============================================================================
-def process_game(game_item, user_agent=None, date_str=None):
+def process_game(game_item, user_agent=None, date_str=None, executor=None):
     """
     Returns (is_final, updates_dict)
     """
+    return finish_game(start_game(game_item, user_agent=user_agent, executor=executor), date_str=date_str)
+
+
+def start_game(game_item, user_agent=None, executor=None):
+    """
+    Fetches both feeds for a game. Returns None if there is nothing to do,
+    otherwise the poll state for finish_game().
+
+    With an executor, a full play-by-play replay (cold container without a
+    checkpoint, or a rewritten feed) is started in the background and
+    collected by finish_game().
+    """
     game_key = game_item.get('id') or ""
     nba_game_id = coerce_nba_game_id(game_item.get('nbaGameId')) or coerce_nba_game_id(game_key)
     if not game_key:
         game_key = str(nba_game_id or "")
     if not nba_game_id:
         print(f"Poller: Missing nbaGameId for {game_key}, skipping.")
-        return False, {}
+        return None
     
     # Get stored ETags
     last_play_etag = game_item.get('play_etag')
     last_box_etag = game_item.get('box_etag')
 
     urls = {
-        'play': f"https://cdn.nba.com/static/json/liveData/playbyplay/playbyplay_{nba_game_id}.json",
-        'box': f"https://cdn.nba.com/static/json/liveData/boxscore/boxscore_{nba_game_id}.json"
+        'play': playbyplay_url(nba_game_id),
+        'box': boxscore_url(nba_game_id),
     }
 
     # Fetch Data
-    play_data, play_etag = fetch_nba_data_urllib(urls['play'], last_play_etag, user_agent)
-    box_data, box_etag = fetch_nba_data_urllib(urls['box'], last_box_etag, user_agent)
+    # Late in a game only the actions after the watermark are decoded.
+    watermark = FEED_WATERMARKS.get(game_key)
+    with stage("fetch.play"), track_memory("fetch.play"):
+        play_data, play_etag = fetch_nba_data_urllib(
+            urls['play'],
+            last_play_etag,
+            user_agent,
+            parse=lambda content: parse_playbyplay_feed(content, watermark),
+        )
+    with stage("fetch.box"):
+        box_data, box_etag = fetch_nba_data_urllib(urls['box'], last_box_etag, user_agent)
 
     # 304 Optimization: If neither changed, exit early
     if play_data is None and box_data is None:
-        return False, {}
+        return None
+
+    poll = {
+        "game_item": game_item,
+        "game_key": game_key,
+        "nba_game_id": nba_game_id,
+        "play_data": play_data,
+        "play_etag": play_etag,
+        "box_data": box_data,
+        "box_etag": box_etag,
+        "replay": None,
+    }
+    if executor is not None:
+        poll["replay"] = start_playbyplay_replay(poll, executor)
+    return poll
 
-    updates = {}
-    is_game_final = False
-    is_play_final = False
-    processed = None
-    slim_box = None
 
+def resolve_team_ids(game_item, play_game, box_game):
     # Best-effort team IDs for play-by-play processing (used when box is a 304).
     home_team_id = None
     away_team_id = None
-    play_game = play_data.get("game", {}) if play_data else {}
     if play_game:
         home_team_id = play_game.get("homeTeamId") or play_game.get("homeTeam", {}).get("teamId")
         away_team_id = play_game.get("awayTeamId") or play_game.get("awayTeam", {}).get("teamId")
 
-    box_game = box_data.get("game", {}) if box_data else {}
     if box_game:
         home_team_id = home_team_id or box_game.get("homeTeam", {}).get("teamId") or box_game.get("homeTeamId")
         away_team_id = away_team_id or box_game.get("awayTeam", {}).get("teamId") or box_game.get("awayTeamId")
 
     home_team_id = home_team_id or game_item.get("homeTeamId")
     away_team_id = away_team_id or game_item.get("awayTeamId")
+    return away_team_id, home_team_id
+
+
+def finish_game(poll, date_str=None):
+    """
+    Processes the feeds fetched by start_game() and uploads the gamepack.
+    Returns (is_final, updates_dict)
+    """
+    if poll is None:
+        return False, {}
+    game_key = poll["game_key"]
+    nba_game_id = poll["nba_game_id"]
+    play_data = poll["play_data"]
+    box_data = poll["box_data"]
+
+    updates = {}
+    is_game_final = False
+    is_play_final = False
+    processed = None
+    processor = None
+    checkpoint_dirty = False
+    slim_box = None
+
+    play_game = play_data.get("game", {}) if play_data else {}
+    box_game = box_data.get("game", {}) if box_data else {}
+    away_team_id, home_team_id = resolve_team_ids(poll["game_item"], play_game, box_game)
 
     # --- 1. Play by Play ---
     if play_data:
@@ -483,23 +687,40 @@ def process_game(game_item, user_agent=None, date_str=None):
                 home_team_id = home_team_id or inferred_home
 
             if home_team_id and away_team_id:
-                processed = process_playbyplay_payload(
-                    game_id=nba_game_id,
-                    actions=actions,
-                    away_team_id=away_team_id,
-                    home_team_id=home_team_id,
-                    include_actions=False,
-                    include_all_actions=False,
-                )
-
-            updates['play_etag'] = play_etag
+                with stage("pbp.restore"):
+                    processor = get_playbyplay_processor(game_key, nba_game_id, away_team_id, home_team_id)
+                if box_game:
+                    processor.roster.add_boxscore(box_game)
+                with stage("pbp.replay_wait"):
+                    replayed = collect_playbyplay_replay(game_key, poll.get("replay"), away_team_id, home_team_id)
+                if replayed is not None:
+                    # The worker decoded and consumed these same actions;
+                    # update() here would decode and hash all of them again.
+                    processor = replayed
+                    processor.adopt(actions)
+                    checkpoint_dirty = True
+                else:
+                    with track_memory("pbp.update"):
+                        checkpoint_dirty = processor.update(actions) > 0
+                log_feed_update(game_key, processor)
+                if getattr(actions, "watermark", None) is not None:
+                    FEED_WATERMARKS[game_key] = actions.watermark
+                with track_memory("pbp.payload"):
+                    processed = processor.payload(
+                        include_actions=False,
+                        include_all_actions=False,
+                        schema=FLOW_SCHEMA,
+                    )
+
+            updates['play_etag'] = poll["play_etag"]
 
     # --- 2. Box Score ---
     if box_data:
         status_text = box_game.get('gameStatusText', '').strip()
         is_game_final = status_text.startswith('Final')
 
-        slim_box = build_box_payload(nba_game_id, box_game)
+        with stage("box"):
+            slim_box = build_box_payload(nba_game_id, box_game)
 
         # Cache stable IDs so play-by-play processing can run even if boxscore is a 304 later.
         home_team_id = box_game.get("homeTeam", {}).get("teamId") or box_game.get("homeTeamId")
@@ -507,7 +728,7 @@ def process_game(game_item, user_agent=None, date_str=None):
         
         # Prepare schedule updates
         updates.update({
-            'box_etag': box_etag,
+            'box_etag': poll["box_etag"],
             'status': status_text,
             'time': trim_clock_value(box_game.get('gameClock', '')) or '',
             'homescore': box_game.get('homeTeam', {}).get('score', 0),
@@ -520,7 +741,7 @@ def process_game(game_item, user_agent=None, date_str=None):
 
     if processed is not None or slim_box is not None:
         if processed is None or slim_box is None:
-            existing = load_gamepack(game_key)
+            existing = previous_gamepack(game_key)
             if processed is None:
                 processed = (existing or {}).get("flow")
             if slim_box is None:
@@ -534,114 +755,237 @@ def process_game(game_item, user_agent=None, date_str=None):
                 "box": slim_box,
                 "flow": processed,
             }
-            upload_json_to_s3(
-                s3_client=s3_client,
-                bucket=BUCKET,
-                prefix=PREFIX,
-                key=f"{GAMEPACK_PREFIX}{game_key}.json",
-                data=gamepack,
-                is_final=is_game_final or is_play_final,
-            )
+            publish_gamepack(game_key, gamepack, is_final=is_game_final or is_play_final)
+            if processor is not None and checkpoint_dirty:
+                with stage("checkpoint"):
+                    upload_processor_checkpoint(game_key, processor)
         else:
             print(f"Poller: Skipping gamepack upload for {game_key}, missing data.")
 
+    if is_game_final or is_play_final:
+        PLAYBYPLAY_PROCESSORS.pop(game_key, None)
+        ACTION_TEXT_CACHES.pop(game_key, None)
+        FEED_WATERMARKS.pop(game_key, None)
+        LAST_GAMEPACKS.pop(game_key, None)
+
     return is_game_final, updates
 
 
-def load_gamepack(game_key):
-    key = f"{PREFIX}{GAMEPACK_PREFIX}{game_key}.json.gz"
+def previous_gamepack(game_key):
+    """
+    The last gamepack published for a game, from memory or (once per
+    container) S3. A failed load returns None without caching it, so the
+    next poll tries again.
+    """
+    if game_key not in LAST_GAMEPACKS:
+        with stage("gamepack.load"):
+            try:
+                LAST_GAMEPACKS[game_key] = load_gamepack(game_key)
+            except Exception as e:
+                print(f"Poller: Failed to load gamepack {game_key}: {e}")
+                return None
+    return LAST_GAMEPACKS[game_key]
+
+
+def publish_gamepack(game_key, gamepack, is_final=False):
+    """
+    Uploads the gamepack as the next version of the game. When the previous
+    version is known, a delta against it is uploaded first under an
+    immutable per-version key, so a client holding version n - 1 can fetch
+    the delta instead of the whole gamepack.
+
+    Versions count within a lineage. Without a usable previous version (a
+    new game, or its gamepack failed to load) a new lineage starts at
+    version 1 with no delta; delta keys include the lineage, so they never
+    overwrite those of an earlier one.
+    """
+    previous = previous_gamepack(game_key) or {}
+    parent = previous.get("version")
+    lineage = previous.get("lineage")
+    if not isinstance(parent, int) or not lineage:
+        parent = None
+        lineage = secrets.token_hex(4)
+    gamepack["lineage"] = lineage
+    gamepack["version"] = (parent or 0) + 1
+    gamepack["parent"] = parent
+
+    if parent is not None:
+        with stage("delta"):
+            delta = build_gamepack_delta(previous, gamepack)
+        upload_json_to_s3(
+            s3_client=s3_client,
+            bucket=BUCKET,
+            prefix=PREFIX,
+            key=gamepack_delta_key(game_key, lineage, gamepack["version"]),
+            data=delta,
+            is_final=True,
+            policy=COMPRESSION_POLICIES["gamepack"],
+            compress_final=False,
+        )
+    upload_json_to_s3(
+        s3_client=s3_client,
+        bucket=BUCKET,
+        prefix=PREFIX,
+        key=f"{GAMEPACK_PREFIX}{game_key}.json",
+        data=gamepack,
+        is_final=is_final,
+        policy=COMPRESSION_POLICIES["gamepack"],
+        # The binary layout is defined over v2 flows only.
+        binary_encoder=encode_gamepack if GAMEPACK_BINARY and (gamepack.get("flow") or {}).get("v") == 2 else None,
+    )
+    LAST_GAMEPACKS[game_key] = gamepack
+
+
+def gamepack_delta_key(game_key, lineage, version):
+    return f"{GAMEPACK_DELTA_PREFIX}{game_key}/{lineage}/{version}.json"
+
+
+def get_playbyplay_processor(game_key, nba_game_id, away_team_id, home_team_id):
+    text_cache = ACTION_TEXT_CACHES.setdefault(game_key, ActionTextCache())
+    processor = PLAYBYPLAY_PROCESSORS.get(game_key)
+    if processor is None:
+        # First touch in this container: resume from the durable checkpoint if possible.
+        processor = restore_playbyplay_processor(game_key, text_cache)
+    if processor is None or not processor.matches(away_team_id, home_team_id):
+        processor = PlayByPlayProcessor(
+            game_id=nba_game_id,
+            away_team_id=away_team_id,
+            home_team_id=home_team_id,
+            text_cache=text_cache,
+        )
+    PLAYBYPLAY_PROCESSORS[game_key] = processor
+    return processor
+
+
+def start_playbyplay_replay(poll, executor):
+    """
+    Hands a full play-by-play replay to the executor when the processor for
+    this game would have to consume at least REPLAY_HANDOFF_MIN_ACTIONS
+    actions. Warm polls only add a handful of actions and stay inline.
+    """
+    actions = ((poll["play_data"] or {}).get("game") or {}).get("actions") or []
+    if len(actions) < REPLAY_HANDOFF_MIN_ACTIONS:
+        return None
+    play_game = (poll["play_data"] or {}).get("game") or {}
+    box_game = (poll["box_data"] or {}).get("game") or {}
+    away_team_id, home_team_id = resolve_team_ids(poll["game_item"], play_game, box_game)
+    if not (away_team_id and home_team_id):
+        return None
+
+    game_key = poll["game_key"]
+    processor = get_playbyplay_processor(game_key, poll["nba_game_id"], away_team_id, home_team_id)
+    if box_game:
+        processor.roster.add_boxscore(box_game)
+    pending = processor.pending(actions)
+    if pending < REPLAY_HANDOFF_MIN_ACTIONS:
+        return None
+    return executor.submit(
+        build_playbyplay_processor,
+        game_id=poll["nba_game_id"],
+        actions=actions,
+        away_team_id=away_team_id,
+        home_team_id=home_team_id,
+        roster=processor.roster,
+        track_edits=True,
+    )
+
+
+def log_feed_update(game_key, processor):
+    """One line per poll that changed earlier actions, with the running counts."""
+    update = processor.last_update or {}
+    if update.get("kind", "append") == "append":
+        return
+    print(
+        f"Poller: Feed {update['kind']} for {game_key} from action {update['from']}, "
+        f"reprocessed {update['consumed']} actions; totals {processor.feed_stats()}"
+    )
+
+
+def collect_playbyplay_replay(game_key, replay, away_team_id, home_team_id):
+    if replay is None:
+        return None
     try:
-        resp = s3_client.get_object(Bucket=BUCKET, Key=key)
-        body = resp["Body"].read()
-        if body.startswith(b"\x1f\x8b"):
-            body = gzip.decompress(body)
-        return json.loads(body)
+        processor = replay.result()
     except Exception as e:
-        print(f"Poller: Failed to load gamepack {game_key}: {e}")
+        print(f"Poller: Replay for {game_key} failed ({e}), processing inline.")
+        return None
+    if not processor.matches(away_team_id, home_team_id):
         return None
+    processor.use_text_cache(ACTION_TEXT_CACHES.setdefault(game_key, ActionTextCache()))
+    PLAYBYPLAY_PROCESSORS[game_key] = processor
+    return processor
 
 
-def build_box_payload(game_id, box_game):
-    if not isinstance(box_game, dict):
+def get_game_executor():
+    """
+    The executor for full replays, or None to process inline. With one vCPU
+    (Lambda below 1769 MB) a worker only adds handoff cost, so there is none.
+    """
+    global GAME_EXECUTOR
+    if GAME_EXECUTOR is None:
+        cpus = os.cpu_count() or 1
+        workers = parse_positive_int(POLLER_WORKERS, None) or cpus
+        if cpus <= 1 or workers <= 1:
+            return None
+        GAME_EXECUTOR = make_executor(workers)
+    return GAME_EXECUTOR
+
+
+def restore_playbyplay_processor(game_key, text_cache=None):
+    checkpoint = load_processor_checkpoint(game_key)
+    if checkpoint is None:
         return None
-    return {
-        "start": (
-            box_game.get("gameEt")
-            or box_game.get("gameTimeUTC")
-            or box_game.get("gameDateTimeUTC")
-        ),
-        "teams": {
-            "away": build_team_payload(box_game.get("awayTeam")),
-            "home": build_team_payload(box_game.get("homeTeam")),
-        },
-    }
+    flow = (previous_gamepack(game_key) or {}).get("flow")
+    if (flow or {}).get("v") == 3:
+        flow = flow_v3_to_v2(flow)
+    processor = PlayByPlayProcessor.from_checkpoint(checkpoint, flow, text_cache=text_cache)
+    if processor is None:
+        print(f"Poller: Checkpoint for {game_key} does not match gamepack, replaying feed.")
+    return processor
+
 
-def build_team_payload(team):
-    if not isinstance(team, dict):
+def load_processor_checkpoint(game_key):
+    key = f"{CHECKPOINT_PREFIX}{game_key}.json"
+    try:
+        resp = s3_client.get_object(Bucket=BUCKET, Key=key)
+        data = codec.loads(resp["Body"].read())
+        return data if isinstance(data, dict) else None
+    except ClientError as e:
+        code = e.response.get("Error", {}).get("Code")
+        if code not in ("NoSuchKey", "404", "NotFound"):
+            print(f"S3 Checkpoint Error: {e}")
+        return None
+    except Exception as e:
+        print(f"S3 Checkpoint Error: {e}")
         return None
-    players = []
-    for player in team.get("players") or []:
-        if not isinstance(player, dict):
-            continue
-        stats = player.get("statistics") or {}
-        players.append({
-            "first": (player.get("firstName") or "").strip(),
-            "last": (player.get("familyName") or "").strip(),
-            "stats": {
-                "min": normalize_minutes(stats.get("minutes")),
-                "pts": safe_int(stats.get("points")),
-                "fgm": safe_int(stats.get("fieldGoalsMade")),
-                "fga": safe_int(stats.get("fieldGoalsAttempted")),
-                "tpm": safe_int(stats.get("threePointersMade")),
-                "tpa": safe_int(stats.get("threePointersAttempted")),
-                "ftm": safe_int(stats.get("freeThrowsMade")),
-                "fta": safe_int(stats.get("freeThrowsAttempted")),
-                "oreb": safe_int(stats.get("reboundsOffensive")),
-                "dreb": safe_int(stats.get("reboundsDefensive")),
-                "ast": safe_int(stats.get("assists")),
-                "stl": safe_int(stats.get("steals")),
-                "blk": safe_int(stats.get("blocks")),
-                "to": safe_int(stats.get("turnovers")),
-                "pf": safe_int(stats.get("foulsPersonal")),
-                "pm": safe_int(stats.get("plusMinusPoints")),
-            },
-        })
-    return {
-        "id": team.get("teamId"),
-        "abbr": team.get("teamTricode"),
-        "name": team.get("teamName"),
-        "players": players,
-    }
 
-def normalize_minutes(raw_minutes):
-    if not raw_minutes:
-        return "00:00"
-    if isinstance(raw_minutes, str):
-        minutes = raw_minutes.strip()
-        if minutes.startswith("PT") and minutes.endswith("S"):
-            stripped = minutes[2:-1]
-            if "M" in stripped:
-                mins_part, sec_part = stripped.split("M", 1)
-                mins = safe_int(mins_part)
-                secs = int(float(sec_part)) if sec_part else 0
-            else:
-                mins = 0
-                secs = int(float(stripped)) if stripped else 0
-            return f"{mins:02d}:{secs:02d}"
-        if ":" in minutes:
-            return minutes
-    return "00:00"
-
-def safe_int(value):
-    if value is None:
-        return 0
+
+def upload_processor_checkpoint(game_key, processor):
+    key = f"{CHECKPOINT_PREFIX}{game_key}.json"
     try:
-        return int(value)
-    except (TypeError, ValueError):
-        try:
-            return int(float(value))
-        except (TypeError, ValueError):
-            return 0
+        s3_client.put_object(
+            Bucket=BUCKET,
+            Key=key,
+            Body=codec.dumps(processor.checkpoint()),
+            ContentType="application/json",
+        )
+    except Exception as e:
+        print(f"Checkpoint Upload Error: {e}")
+
+
+def load_gamepack(game_key):
+    key = f"{PREFIX}{GAMEPACK_PREFIX}{game_key}.json.gz"
+    try:
+        resp = s3_client.get_object(Bucket=BUCKET, Key=key)
+        body = resp["Body"].read()
+        if body.startswith(b"\x1f\x8b"):
+            body = gzip.decompress(body)
+        return codec.loads(body)
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404", "NotFound"):
+            return None
+        raise
+
 
 def get_nba_date():
     """
@@ -760,7 +1104,7 @@ def get_games_from_s3(date_str):
             payload = gzip.decompress(payload)
         except OSError:
             pass
-        data = json.loads(payload.decode("utf-8"))
+        data = codec.loads(payload)
         return data if isinstance(data, list) else []
     except ClientError as e:
         code = e.response.get("Error", {}).get("Code")
@@ -784,12 +1128,14 @@ def reconcile_recent_schedule():
         print(f"Reconcile: Invalid NBA date '{today_str}', skipping.")
         return
 
-    feed = fetch_schedule_feed()
+    with track_memory("schedule.feed"):
+        feed = fetch_schedule_feed()
     if not feed:
         print("Reconcile: Schedule feed unavailable, skipping.")
         return
 
-    feed_map = build_schedule_feed_map(feed)
+    with track_memory("schedule.map"):
+        feed_map = build_schedule_feed_map(feed)
     if not feed_map:
         print("Reconcile: Schedule feed empty, skipping.")
         return
@@ -798,11 +1144,12 @@ def reconcile_recent_schedule():
     for offset in range(days):
         date_str = (today - timedelta(days=offset)).strftime("%Y-%m-%d")
         feed_games = feed_map.get(date_str, {})
-        if reconcile_schedule_date(date_str, feed_games):
-            updated += 1
-        map_for_date = build_game_id_map_from_feed(feed, date_str)
-        if map_for_date:
-            upload_game_id_map(date_str, map_for_date)
+        with track_memory("schedule.reconcile"):
+            if reconcile_schedule_date(date_str, feed_games):
+                updated += 1
+            map_for_date = build_game_id_map_from_feed(feed, date_str)
+            if map_for_date:
+                upload_game_id_map(date_str, map_for_date)
 
     if updated:
         print(f"Reconcile: Updated {updated} schedule file(s).")
@@ -843,6 +1190,7 @@ def reconcile_schedule_date(date_str, feed_games):
         games_list=merged,
         date_str=date_str,
         prefix=SCHEDULE_PREFIX,
+        policy=COMPRESSION_POLICIES["schedule"],
     )
     return True
 
@@ -968,16 +1316,7 @@ def build_game_slug(date_str, away_team, home_team, fallback_id=None):
     return None
 
 def trim_clock_value(clock):
-    if not clock or not isinstance(clock, str):
-        return clock
-    trimmed = clock.strip()
-    if trimmed.startswith("PT"):
-        trimmed = trimmed[2:]
-    if trimmed.endswith("S"):
-        trimmed = trimmed[:-1]
-    if "M" in trimmed:
-        trimmed = trimmed.replace("M", "")
-    return trimmed
+    return trim_clock(clock)
 
 def coerce_nba_game_id(value):
     if value is None:
@@ -1025,7 +1364,7 @@ def load_game_id_map(date_str):
     try:
         resp = s3_client.get_object(Bucket=BUCKET, Key=key)
         payload = resp["Body"].read()
-        data = json.loads(payload.decode("utf-8"))
+        data = codec.loads(payload)
         return data if isinstance(data, dict) else {}
     except ClientError as e:
         code = e.response.get("Error", {}).get("Code")
@@ -1045,7 +1384,7 @@ def upload_game_id_map(date_str, mapping):
         s3_client.put_object(
             Bucket=BUCKET,
             Key=key,
-            Body=json.dumps(mapping),
+            Body=codec.dumps(mapping),
             ContentType="application/json",
             CacheControl="s-maxage=0, max-age=0, must-revalidate",
         )
@@ -1061,7 +1400,7 @@ def normalize_schedule_list(games):
     )
 
 def schedules_equal(existing, merged):
-    return json.dumps(existing, sort_keys=True) == json.dumps(merged, sort_keys=True)
+    return codec.dumps(existing, sort_keys=True) == codec.dumps(merged, sort_keys=True)
 
 def is_cancelled_status(status_text):
     status = normalize_status(status_text)
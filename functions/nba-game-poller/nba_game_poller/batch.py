@@ -0,0 +1,81 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from nba_game_poller import codec
+from nba_game_poller.gamepack import build_gamepack
+from nba_game_poller.storage import DEFAULT_COMPRESSION_POLICIES, compress_body
+
+
+def _load_feed(value):
+    # Raw feeds may be passed as the undecoded response body, so parsing
+    # happens in the worker rather than in the parent.
+    if isinstance(value, (bytes, bytearray, str)):
+        return codec.loads(value)
+    return value
+
+
+def process_game_payload(raw):
+    """
+    Builds one gamepack from a raw payload dict:
+    {"id": game_key, "nbaGameId": ..., "play": play feed, "box": boxscore feed}.
+
+    Only a small result dict goes back to the caller: the gamepack as gzipped
+    JSON bytes ("body", None if the feeds were incomplete), whether the
+    game is final, and an error string if processing raised.
+    """
+    game_key = raw.get("id")
+    nba_game_id = raw.get("nbaGameId")
+    result = {"id": game_key, "nbaGameId": nba_game_id, "body": None, "final": False, "error": None}
+    try:
+        gamepack, is_final = build_gamepack(
+            game_key,
+            nba_game_id,
+            _load_feed(raw.get("play")),
+            _load_feed(raw.get("box")),
+        )
+        if gamepack is not None:
+            _, result["body"] = compress_body(
+                codec.dumps(gamepack), DEFAULT_COMPRESSION_POLICIES["gamepack"], final=is_final
+            )
+            result["final"] = is_final
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def process_games_batch(raw_payloads, workers=None, pool=None):
+    """
+    Processes raw game payloads (see process_game_payload) across a process
+    pool and yields the results in completion order.
+
+    raw_payloads can be a lazy iterable; at most 2 * workers games are in
+    flight, so feeds are fetched and consumed at the pool's pace. workers=1
+    runs inline without a pool. A caller processing several batches can
+    pass its own pool (with workers set to its size) so worker startup is
+    paid once; it is left running.
+    """
+    workers = workers or os.cpu_count() or 1
+    if pool is not None:
+        yield from _process_in_pool(pool, raw_payloads, workers)
+        return
+    if workers <= 1:
+        for raw in raw_payloads:
+            yield process_game_payload(raw)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from _process_in_pool(pool, raw_payloads, workers)
+
+
+def _process_in_pool(pool, raw_payloads, workers):
+    pending = set()
+    for raw in raw_payloads:
+        pending.add(pool.submit(process_game_payload, raw))
+        if len(pending) >= 2 * workers:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
@@ -0,0 +1,154 @@
+import re
+from functools import lru_cache
+
+
+_CLOCK_RE = re.compile(r"^(?:PT)?(\d+)M(\d+)(?:\.(\d+))?S?$")
+_CLOCK_COMPACT_RE = re.compile(r"^(\d+)(\d{2})(?:\.(\d+))?$")
+_CLOCK_COLON_RE = re.compile(r"^(\d+):(\d+)(?:\.(\d+))?$")
+
+# Distinct clock strings in a night of games number in the low thousands.
+CLOCK_CACHE_SIZE = 8192
+
+
+def _is_canonical(clock):
+    # Fixed-offset check for the NBA feed shape "PTmmMss.ccS".
+    return (
+        len(clock) == 11
+        and clock[0] == "P"
+        and clock[1] == "T"
+        and clock[4] == "M"
+        and clock[7] == "."
+        and clock[10] == "S"
+        and clock[2:4].isdecimal()
+        and clock[5:7].isdecimal()
+        and clock[8:10].isdecimal()
+    )
+
+
+@lru_cache(maxsize=CLOCK_CACHE_SIZE)
+def _parse_clock(clock):
+    """
+    Returns (whole_seconds, fraction) for a clock string. The fraction is the
+    digits after the decimal point read as hundredths, as the feed writes them.
+    """
+    if _is_canonical(clock):
+        return int(clock[2:4]) * 60 + int(clock[5:7]), int(clock[8:10])
+    for pattern in (_CLOCK_RE, _CLOCK_COMPACT_RE, _CLOCK_COLON_RE):
+        m = pattern.match(clock)
+        if m:
+            minutes = int(m.group(1) or 0)
+            seconds = int(m.group(2) or 0)
+            fraction = int(m.group(3) or 0)
+            return minutes * 60 + seconds, fraction
+    return 0, 0
+
+
+def clock_centiseconds(clock):
+    """
+    Clock string ("PT11M43.00S", "1143.00" or "11:43.00") as integer
+    centiseconds. Unparseable values are 0.
+    """
+    if not clock or not isinstance(clock, str):
+        return 0
+    seconds, fraction = _parse_clock(clock)
+    return seconds * 100 + fraction
+
+
+REGULATION_PERIOD_CENTISECONDS = 12 * 60 * 100
+OVERTIME_PERIOD_CENTISECONDS = 5 * 60 * 100
+
+
+def period_length_centiseconds(period):
+    return REGULATION_PERIOD_CENTISECONDS if (period or 0) <= 4 else OVERTIME_PERIOD_CENTISECONDS
+
+
+def game_time_centiseconds(period, clock):
+    """Elapsed game time at (period, clock remaining), as on the frontend timeline."""
+    period = safe_int(period)
+    if period <= 0:
+        return 0
+    if period <= 4:
+        start = (period - 1) * REGULATION_PERIOD_CENTISECONDS
+    else:
+        start = 4 * REGULATION_PERIOD_CENTISECONDS + (period - 5) * OVERTIME_PERIOD_CENTISECONDS
+    return start + period_length_centiseconds(period) - clock_centiseconds(clock)
+
+
+def clock_seconds(clock):
+    if not clock or not isinstance(clock, str):
+        return 0.0
+    seconds, fraction = _parse_clock(clock)
+    return seconds + fraction / 100.0
+
+
+@lru_cache(maxsize=CLOCK_CACHE_SIZE)
+def _trim_clock_str(clock):
+    if _is_canonical(clock):
+        return clock[2:4] + clock[5:10]
+    trimmed = clock.strip()
+    if trimmed.startswith("PT"):
+        trimmed = trimmed[2:]
+    if trimmed.endswith("S"):
+        trimmed = trimmed[:-1]
+    if "M" in trimmed:
+        trimmed = trimmed.replace("M", "")
+    return trimmed
+
+
+def trim_clock(clock):
+    """"PT11M43.00S" -> "1143.00". Non-string and empty values pass through."""
+    if not clock or not isinstance(clock, str):
+        return clock
+    return _trim_clock_str(clock)
+
+
+def format_trimmed_clock(centiseconds):
+    """Inverse of clock_centiseconds for trimmed clocks: 70300 -> "1143.00"."""
+    return f"{centiseconds // 6000:02d}{centiseconds // 100 % 60:02d}.{centiseconds % 100:02d}"
+
+
+def trimmed_clock_centiseconds(clock):
+    """
+    Centiseconds for a trimmed clock ("1143.00") that format_trimmed_clock
+    gives back unchanged, otherwise None.
+    """
+    if not isinstance(clock, str):
+        return None
+    cs = clock_centiseconds(clock)
+    return cs if format_trimmed_clock(cs) == clock else None
+
+
+def safe_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return 0
+
+
+def format_minutes(raw_minutes):
+    """
+    Boxscore minutes ("PT25M01.00S") as "mm:ss" with seconds truncated.
+    Values already in "mm:ss" pass through; anything else is "00:00".
+    """
+    if not raw_minutes:
+        return "00:00"
+    if isinstance(raw_minutes, str):
+        minutes = raw_minutes.strip()
+        if _is_canonical(minutes):
+            return f"{int(minutes[2:4]):02d}:{int(minutes[5:7]):02d}"
+        if minutes.startswith("PT") and minutes.endswith("S"):
+            stripped = minutes[2:-1]
+            if "M" in stripped:
+                mins_part, sec_part = stripped.split("M", 1)
+                mins = safe_int(mins_part)
+                secs = int(float(sec_part)) if sec_part else 0
+            else:
+                mins = 0
+                secs = int(float(stripped)) if stripped else 0
+            return f"{mins:02d}:{secs:02d}"
+        if ":" in minutes:
+            return minutes
+    return "00:00"
@@ -0,0 +1,60 @@
+import json
+
+# orjson or msgspec are used when bundled with the Lambda; the stdlib is the
+# fallback. dumps() returns compact UTF-8 bytes (no whitespace, non-ASCII
+# unescaped), which are the same for every backend.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def _stdlib_dumps(obj, sort_keys=False):
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys).encode("utf-8")
+
+
+if orjson is not None:
+    BACKEND = "orjson"
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj, *, sort_keys=False):
+        option = _ORJSON_OPTIONS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            # Integers beyond 64 bits and similar edge cases.
+            return _stdlib_dumps(obj, sort_keys)
+
+    loads = orjson.loads
+
+elif msgspec is not None:
+    BACKEND = "msgspec"
+    _ENCODER = msgspec.json.Encoder()
+    _SORTED_ENCODER = msgspec.json.Encoder(order="sorted")
+    _DECODER = msgspec.json.Decoder()
+
+    def dumps(obj, *, sort_keys=False):
+        try:
+            return (_SORTED_ENCODER if sort_keys else _ENCODER).encode(obj)
+        except (TypeError, OverflowError):
+            return _stdlib_dumps(obj, sort_keys)
+
+    def loads(data):
+        try:
+            return _DECODER.decode(data)
+        except msgspec.DecodeError as e:
+            raise json.JSONDecodeError(str(e), "", 0) from None
+
+else:
+    BACKEND = "stdlib"
+
+    def dumps(obj, *, sort_keys=False):
+        return _stdlib_dumps(obj, sort_keys)
+
+    loads = json.loads
+
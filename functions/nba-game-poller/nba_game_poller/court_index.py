@@ -0,0 +1,94 @@
+from bisect import bisect_left, bisect_right
+
+from nba_game_poller.clock import game_time_centiseconds
+
+
+class CourtIndex:
+    """
+    Interval index over one team's playtime segments in elapsed game time
+    (centiseconds, see game_time_centiseconds).
+
+    boundaries is sorted; active[i] is a bitmask over names of the players on
+    court from boundaries[i] up to boundaries[i + 1]. on_court_at() is one
+    bisect, and overlap() is two bisects plus an OR over the snapshots in
+    the range.
+    """
+
+    def __init__(self, names=(), boundaries=(), active=()):
+        self.names = list(names)
+        self.boundaries = list(boundaries)
+        self.active = list(active)
+
+    def __len__(self):
+        return len(self.boundaries)
+
+    @classmethod
+    def from_playtimes(cls, names, playtimes, open_end=None):
+        """
+        Builds the index from Playtime records. An open stint (on court with
+        no end yet) runs to open_end, the clock of the latest action.
+        """
+        names = list(names)
+        events = []
+        for bit, name in enumerate(names):
+            pt = playtimes.get(name)
+            if pt is None:
+                continue
+            last = len(pt.times) - 1
+            for i, seg in enumerate(pt.times):
+                end = seg.end
+                if pt.on and i == last:
+                    end = open_end
+                if end is None:
+                    continue
+                start_t = game_time_centiseconds(seg.period, seg.start)
+                end_t = game_time_centiseconds(seg.period, end)
+                if end_t > start_t:
+                    events.append((start_t, 1, bit))
+                    events.append((end_t, -1, bit))
+        events.sort()
+
+        boundaries = []
+        active = []
+        # Per-player counts, since inferred segments of one player can overlap.
+        counts = [0] * len(names)
+        mask = 0
+        for t, delta, bit in events:
+            counts[bit] += delta
+            if counts[bit] > 0:
+                mask |= 1 << bit
+            else:
+                mask &= ~(1 << bit)
+            if boundaries and boundaries[-1] == t:
+                active[-1] = mask
+            else:
+                boundaries.append(t)
+                active.append(mask)
+        return cls(names, boundaries, active)
+
+    def _names_in(self, mask):
+        return [name for bit, name in enumerate(self.names) if mask >> bit & 1]
+
+    def on_court_at(self, t):
+        """Players on court at elapsed game time t (centiseconds)."""
+        i = bisect_right(self.boundaries, t) - 1
+        return self._names_in(self.active[i]) if i >= 0 else []
+
+    def overlap(self, start, end):
+        """Players on court at any moment in [start, end)."""
+        if end <= start:
+            return []
+        lo = max(bisect_right(self.boundaries, start) - 1, 0)
+        hi = bisect_left(self.boundaries, end)
+        mask = 0
+        for i in range(lo, hi):
+            mask |= self.active[i]
+        return self._names_in(mask)
+
+    def to_json(self):
+        return {"names": self.names, "t": self.boundaries, "on": self.active}
+
+    @classmethod
+    def from_json(cls, data):
+        data = data or {}
+        return cls(data.get("names") or (), data.get("t") or (), data.get("on") or ())
@@ -0,0 +1,108 @@
+DELTA_VERSION = 1
+
+
+def diff(previous, current):
+    """
+    Patch that turns previous into current (both JSON values). Returns None
+    if they are equal. Patch nodes:
+
+    {"=": value}                  replace the value
+    {"d": {key: patch}, "del": [key, ...]}
+                                  patch/add keys of a dict, drop others
+    {"at": k, "add": [...]}       keep the first k list items, append the rest
+    {"i": [[index, patch], ...]}  patch items of a list of unchanged length
+
+    Lists that only grew (score, per-player events) become "at"/"add";
+    an open segment or lineup whose end moved becomes an "i" patch of the
+    last item.
+    """
+    if previous == current:
+        return None
+    if isinstance(previous, dict) and isinstance(current, dict):
+        changed = {}
+        for key, value in current.items():
+            if key not in previous:
+                changed[key] = {"=": value}
+            elif previous[key] != value:
+                changed[key] = diff(previous[key], value)
+        patch = {"d": changed}
+        removed = [key for key in previous if key not in current]
+        if removed:
+            patch["del"] = removed
+        return patch
+    if isinstance(previous, list) and isinstance(current, list):
+        common = 0
+        limit = min(len(previous), len(current))
+        while common < limit and previous[common] == current[common]:
+            common += 1
+        if common == len(previous) or len(previous) != len(current):
+            return {"at": common, "add": current[common:]}
+        return {
+            "i": [
+                [i, diff(previous[i], current[i])]
+                for i in range(common, len(current))
+                if previous[i] != current[i]
+            ]
+        }
+    return {"=": current}
+
+
+def apply_patch(value, patch):
+    """
+    Reference implementation of diff() patches. Returns a new value and
+    leaves the input untouched; unchanged subtrees are shared.
+    """
+    if patch is None:
+        return value
+    if "=" in patch:
+        return patch["="]
+    if "d" in patch:
+        if not isinstance(value, dict):
+            raise ValueError("dict patch applied to a non-dict value")
+        result = dict(value)
+        for key in patch.get("del") or ():
+            result.pop(key, None)
+        for key, sub in patch["d"].items():
+            result[key] = apply_patch(result.get(key), sub)
+        return result
+    if not isinstance(value, list):
+        raise ValueError("list patch applied to a non-list value")
+    if "at" in patch:
+        if patch["at"] > len(value):
+            raise ValueError("list patch starts past the end of the list")
+        return value[:patch["at"]] + list(patch["add"])
+    result = list(value)
+    for index, sub in patch["i"]:
+        result[index] = apply_patch(result[index], sub)
+    return result
+
+
+def build_gamepack_delta(previous, current):
+    """
+    Delta object from gamepack version previous["version"] to current.
+    Both gamepacks must carry their lineage and version (see the poller's
+    publish step).
+    """
+    return {
+        "v": DELTA_VERSION,
+        "publicId": current.get("publicId"),
+        "lineage": current.get("lineage"),
+        "parent": previous.get("version"),
+        "version": current.get("version"),
+        "patch": diff(previous, current),
+    }
+
+
+def apply_gamepack_delta(previous, delta):
+    """Applies a build_gamepack_delta() object to the gamepack it was built against."""
+    if delta.get("v") != DELTA_VERSION:
+        raise ValueError(f"Unsupported delta version {delta.get('v')}")
+    if previous.get("lineage") != delta.get("lineage"):
+        raise ValueError(
+            f"Delta lineage {delta.get('lineage')} does not match gamepack lineage {previous.get('lineage')}"
+        )
+    if previous.get("version") != delta.get("parent"):
+        raise ValueError(
+            f"Delta parent {delta.get('parent')} does not match gamepack version {previous.get('version')}"
+        )
+    return apply_patch(previous, delta.get("patch"))
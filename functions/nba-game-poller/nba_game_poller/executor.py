@@ -0,0 +1,174 @@
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import wait
+
+
+class ExecutorTaskError(RuntimeError):
+    """A task raised in a worker process (or the worker died)."""
+
+
+def _worker_loop(conn):
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        fn, args, kwargs = task
+        try:
+            result = (True, fn(*args, **kwargs))
+        except Exception as e:
+            result = (False, f"{type(e).__name__}: {e}")
+        conn.send(result)
+    conn.close()
+
+
+class PipeTask:
+    def __init__(self, worker):
+        self._worker = worker
+        self._done = False
+        self._ok = False
+        self._value = None
+
+    def _set(self, ok, value):
+        self._done = True
+        self._ok = ok
+        self._value = value
+        self._worker = None
+
+    def done(self):
+        return self._done
+
+    def result(self):
+        if not self._done:
+            self._worker.collect()
+        if not self._ok:
+            raise ExecutorTaskError(self._value)
+        return self._value
+
+
+class _PipeWorker:
+    def __init__(self, ctx):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_loop, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.task = None
+
+    def collect(self):
+        task = self.task
+        self.task = None
+        try:
+            ok, value = self.conn.recv()
+        except (EOFError, OSError):
+            ok, value = False, "worker process exited"
+        task._set(ok, value)
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=1)
+        self.conn.close()
+
+
+class PipeProcessExecutor:
+    """
+    Long-lived worker processes, each driven over its own Pipe.
+
+    Only Process and Pipe are used; Pool, Queue and Lock all need POSIX
+    semaphores, which AWS Lambda lacks (no /dev/shm). Workers are forked
+    once and kept warm across invocations along with the container.
+    Functions and arguments must be picklable.
+    """
+
+    backend = "process"
+
+    def __init__(self, workers):
+        self._ctx = multiprocessing.get_context("fork")
+        self.workers = workers
+        self._workers = [_PipeWorker(self._ctx) for _ in range(workers)]
+
+    def _idle_worker(self):
+        while True:
+            for i, worker in enumerate(self._workers):
+                if worker.task is None:
+                    if not worker.process.is_alive():
+                        worker.conn.close()
+                        worker = self._workers[i] = _PipeWorker(self._ctx)
+                    return worker
+            ready = wait([w.conn for w in self._workers])
+            for worker in self._workers:
+                if worker.conn in ready and worker.task is not None:
+                    worker.collect()
+
+    def submit(self, fn, *args, **kwargs):
+        worker = self._idle_worker()
+        task = PipeTask(worker)
+        worker.task = task
+        try:
+            worker.conn.send((fn, args, kwargs))
+        except (BrokenPipeError, OSError) as e:
+            worker.task = None
+            task._set(False, f"worker unavailable: {e}")
+        return task
+
+    def map(self, fn, items):
+        tasks = [self.submit(fn, item) for item in items]
+        return [task.result() for task in tasks]
+
+    def close(self):
+        for worker in self._workers:
+            if worker.task is not None:
+                worker.collect()
+            worker.stop()
+        self._workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ThreadExecutor:
+    """Thread-pool fallback. Only helps when the work releases the GIL or overlaps I/O."""
+
+    backend = "thread"
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+
+    def submit(self, fn, *args, **kwargs):
+        return self._pool.submit(fn, *args, **kwargs)
+
+    def map(self, fn, items):
+        return list(self._pool.map(fn, items))
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def make_executor(workers=None, backend=None):
+    """
+    Process+Pipe executor when more than one CPU is available, otherwise (or
+    if worker processes cannot be started) a thread pool. backend="thread"
+    forces the fallback.
+    """
+    workers = workers or os.cpu_count() or 1
+    if backend != "thread" and workers > 1:
+        try:
+            return PipeProcessExecutor(workers)
+        except (OSError, ValueError) as e:
+            print(f"Executor: worker processes unavailable ({e}), using threads.")
+    return ThreadExecutor(workers)
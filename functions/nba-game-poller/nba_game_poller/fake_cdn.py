@@ -0,0 +1,309 @@
+import gzip
+import hashlib
+import random
+import re
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from nba_game_poller import codec
+
+# Local stand-in for the NBA CDN: the playbyplay, boxscore, scoreboard and
+# schedule endpoints, replaying snapshot sequences (recorded, or from
+# nba_game_poller.synthetic) on an accelerated clock. Responses carry an
+# ETag and honour If-None-Match with a 304, bodies are gzipped when the
+# client asks, and latency and error rates are configurable, so polls can be
+# measured offline end to end:
+#
+#     cdn = FakeCdn.from_night(generate_night("2025-10-21"), speed=60)
+#     server, base_url = start_server(cdn)
+#     NBA_CDN_BASE_URL=base_url ...
+#
+# A snapshot is (t, play, box): t is seconds after the game's tip-off on the
+# fake clock, play and box are the full CDN payloads at that point.
+
+_FEED_RE = re.compile(r"^/static/json/liveData/(playbyplay|boxscore)/(?:playbyplay|boxscore)_(\d+)\.json$")
+SCOREBOARD_PATH = "/static/json/liveData/scoreboard/todaysScoreboard_00.json"
+SCHEDULE_PATH = "/static/json/staticData/scheduleLeagueV2_1.json"
+_TEAM_KEYS = ("teamId", "teamName", "teamCity", "teamTricode", "wins", "losses", "score")
+
+
+def load_recording(path):
+    """Snapshots from a JSON lines file of {"t", "play", "box"} objects."""
+    snapshots = []
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                entry = codec.loads(line)
+                snapshots.append((entry["t"], entry.get("play"), entry.get("box")))
+    return snapshots
+
+
+def save_recording(path, snapshots):
+    with open(path, "wb") as f:
+        for t, play, box in snapshots:
+            f.write(codec.dumps({"t": t, "play": play, "box": box}) + b"\n")
+
+
+def _etag(body):
+    return f'"{hashlib.md5(body).hexdigest()}"'
+
+
+def _etag_matches(header, etag):
+    for tag in (header or "").split(","):
+        tag = tag.strip()
+        if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == etag:
+            return True
+    return False
+
+
+def _game_summary(box_game):
+    summary = {
+        key: box_game.get(key)
+        for key in ("gameId", "gameStatus", "gameStatusText", "period", "gameClock", "gameTimeUTC", "gameEt")
+    }
+    for side in ("homeTeam", "awayTeam"):
+        team = box_game.get(side) or {}
+        summary[side] = {key: team.get(key) for key in _TEAM_KEYS}
+    return summary
+
+
+class FakeCdn:
+    """
+    Serves snapshot sequences by game. speed is fake seconds per wall
+    second; latency (plus up to jitter) seconds are slept per request, and a
+    fraction error_rate of requests get a 503.
+    """
+
+    def __init__(self, speed=1.0, latency=0.0, jitter=0.0, error_rate=0.0, seed=0, clock=time.monotonic):
+        self.speed = speed
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.stats = {"requests": 0, "bytes": 0}
+        self._clock = clock
+        self._started = clock()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._games = {}
+        self._bodies = {}
+
+    def add_game(self, game_id, snapshots, tip_off=0.0, pregame_box=None):
+        """
+        Adds a game that tips off tip_off fake seconds after the clock
+        starts. Before its first snapshot the play-by-play is a 403, as on
+        the CDN, and the boxscore is pregame_box (or the first snapshot's).
+        """
+        snapshots = sorted(snapshots, key=lambda s: s[0])
+        self._add(
+            game_id,
+            [tip_off + t for t, _, _ in snapshots],
+            lambda index, kind: snapshots[index][1 if kind == "playbyplay" else 2],
+            pregame_box or (snapshots[0][2] if snapshots else None),
+        )
+        return self
+
+    def add_synthetic_game(self, game, tip_off=0.0, interval=30):
+        """
+        Adds a SyntheticGame with a snapshot every interval game seconds.
+        Payloads are built when a snapshot is first served rather than held
+        for the whole night.
+        """
+        points = game.snapshot_points(interval)
+        counts = [n for _, n in points]
+
+        def payload(index, kind):
+            if kind == "playbyplay":
+                return game.play_payload(counts[index])
+            return game.box_payload(counts[index])
+
+        self._add(game.game_id, [tip_off + t for t, _ in points], payload, game.box_payload(0))
+        return self
+
+    def _add(self, game_id, times, payload, pregame_box):
+        self._games[str(game_id)] = {"times": times, "payload": payload, "pregame": pregame_box, "box": {}}
+
+    @classmethod
+    def from_night(cls, games, interval=30, **kwargs):
+        """A FakeCdn for SyntheticGames, tipping off at their start_time offsets from the first."""
+        cdn = cls(**kwargs)
+        starts = {game.game_id: datetime.fromisoformat(game.start_time.replace("Z", "")) for game in games}
+        first = min(starts.values(), default=None)
+        for game in games:
+            cdn.add_synthetic_game(game, (starts[game.game_id] - first).total_seconds(), interval)
+        return cdn
+
+    def now(self):
+        """Fake seconds since the clock started."""
+        return (self._clock() - self._started) * self.speed
+
+    def set_time(self, fake_seconds):
+        """Moves the fake clock to fake_seconds."""
+        self._started = self._clock() - fake_seconds / self.speed
+
+    def _index(self, game, now):
+        """Index of the snapshot showing at now, -1 before the first."""
+        return bisect_right(game["times"], now) - 1
+
+    def _body(self, key, state, build):
+        """(body, etag, [gzipped]) for key in state, built once per state change."""
+        cached = self._bodies.get(key)
+        if cached is None or cached[0] != state:
+            payload = build()
+            if payload is None:
+                return None
+            body = codec.dumps(payload)
+            cached = self._bodies[key] = (state, (body, _etag(body), [None]))
+        return cached[1]
+
+    def _box(self, game, index):
+        if index < 0:
+            return game["pregame"]
+        # Only the latest boxscore is kept; the scoreboard and schedule read it too.
+        if index not in game["box"]:
+            game["box"] = {index: game["payload"](index, "boxscore")}
+        return game["box"][index]
+
+    def _feed(self, kind, game_id, now):
+        game = self._games.get(game_id)
+        if game is None:
+            return None
+        index = self._index(game, now)
+        if kind == "playbyplay":
+            if index < 0:
+                return None
+            return self._body((game_id, kind), index, lambda: game["payload"](index, kind))
+        return self._body((game_id, kind), index, lambda: self._box(game, index))
+
+    def _current_boxes(self, now):
+        boxes = []
+        state = []
+        for game in self._games.values():
+            index = self._index(game, now)
+            state.append(index)
+            box = self._box(game, index)
+            if box:
+                boxes.append(box.get("game") or {})
+        return tuple(state), boxes
+
+    def _scoreboard(self, now):
+        state, boxes = self._current_boxes(now)
+
+        def build():
+            dates = sorted((box.get("gameEt") or "")[:10] for box in boxes)
+            return {
+                "meta": {"version": 1, "code": 200},
+                "scoreboard": {
+                    "gameDate": dates[0] if dates else "",
+                    "leagueId": "00",
+                    "games": [_game_summary(box) for box in boxes],
+                },
+            }
+
+        return self._body("scoreboard", state, build)
+
+    def _schedule(self, now):
+        state, boxes = self._current_boxes(now)
+
+        def build():
+            by_date = {}
+            for box in boxes:
+                start = (box.get("gameEt") or "").replace("Z", "")
+                game = _game_summary(box)
+                game["gameDateEst"] = f"{start[:10]}T00:00:00Z"
+                game["gameDateTimeEst"] = f"{start}Z" if start else None
+                by_date.setdefault(start[:10], []).append(game)
+            game_dates = []
+            for day in sorted(by_date):
+                parsed = datetime.strptime(day, "%Y-%m-%d") if day else None
+                game_dates.append({
+                    "gameDate": parsed.strftime("%m/%d/%Y 00:00:00") if parsed else "",
+                    "games": by_date[day],
+                })
+            return {"meta": {"version": 1, "code": 200}, "leagueSchedule": {"leagueId": "00", "gameDates": game_dates}}
+
+        return self._body("schedule", state, build)
+
+    def respond(self, path, headers=None):
+        """Returns (status, headers, body) for a GET of path; request headers are a mapping."""
+        headers = headers or {}
+        path = path.split("?", 1)[0]
+        now = self.now()
+        with self._lock:
+            self.stats["requests"] += 1
+            failed = self.error_rate and self._rng.random() < self.error_rate
+            if failed:
+                return self._count(503, {}, b"")
+
+            match = _FEED_RE.match(path)
+            if match:
+                cached = self._feed(match.group(1), match.group(2), now)
+                missing = 403 if match.group(2) in self._games else 404
+            elif path == SCOREBOARD_PATH:
+                cached, missing = self._scoreboard(now), 404
+            elif path == SCHEDULE_PATH:
+                cached, missing = self._schedule(now), 404
+            else:
+                cached, missing = None, 404
+            if cached is None:
+                return self._count(missing, {}, b"")
+
+            body, etag, gzipped = cached
+            if _etag_matches(headers.get("If-None-Match"), etag):
+                return self._count(304, {"ETag": etag}, b"")
+            response_headers = {"ETag": etag, "Content-Type": "application/json"}
+            if "gzip" in (headers.get("Accept-Encoding") or ""):
+                if gzipped[0] is None:
+                    gzipped[0] = gzip.compress(body, compresslevel=6, mtime=0)
+                body = gzipped[0]
+                response_headers["Content-Encoding"] = "gzip"
+            return self._count(200, response_headers, body)
+
+    def _count(self, status, headers, body):
+        self.stats[status] = self.stats.get(status, 0) + 1
+        self.stats["bytes"] += len(body)
+        return status, headers, body
+
+    def delay(self):
+        """Seconds to sleep before answering one request."""
+        if not self.jitter:
+            return self.latency
+        with self._lock:
+            return self.latency + self._rng.uniform(0, self.jitter)
+
+
+def make_server(cdn, host="127.0.0.1", port=0):
+    """ThreadingHTTPServer answering GETs from cdn; port 0 picks a free port."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            delay = cdn.delay()
+            if delay:
+                time.sleep(delay)
+            status, headers, body = cdn.respond(self.path, self.headers)
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_server(cdn, host="127.0.0.1", port=0):
+    """Serves cdn from a daemon thread. Returns (server, base_url); stop with server.shutdown()."""
+    server = make_server(cdn, host, port)
+    thread = threading.Thread(target=server.serve_forever, name="fake-cdn", daemon=True)
+    thread.start()
+    address, bound_port = server.server_address[:2]
+    return server, f"http://{address}:{bound_port}"
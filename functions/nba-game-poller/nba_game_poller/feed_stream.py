@@ -0,0 +1,180 @@
+import hashlib
+import re
+from collections.abc import Sequence
+
+from nba_game_poller import codec
+
+
+# One flat action object (arrays of scalars allowed, no nested objects),
+# followed by the separator. Possessive quantifiers keep a failed match linear.
+_ACTION_SPAN = re.compile(
+    rb'\s*+(\{(?:[^{}"]++|"(?:[^"\\]++|\\.)*+")*+\})\s*+([,\]])'
+)
+_ACTIONS_KEY = re.compile(rb'"actions"\s*:\s*\[')
+_EMPTY_TAIL = re.compile(rb'\s*\]')
+_BOUNDARY = re.compile(rb'\}\s*,\s*\{')
+_ARRAY_END = re.compile(rb'\}\s*\]')
+
+
+class FeedWatermark:
+    """
+    What the previous poll consumed: the number of actions and a digest of
+    their raw bytes, so the next poll can tell whether they were edited.
+    """
+
+    __slots__ = ("count", "digest")
+
+    def __init__(self, count, digest):
+        self.count = count
+        self.digest = digest
+
+
+class LazyActions(Sequence):
+    """
+    game.actions of a play-by-play feed, decoded on access.
+
+    Only the byte span of each action is located up front; an action dict is
+    built the first time it is indexed. A processor that already consumed
+    the first N actions only touches actions[N - 1] and actions[N:].
+
+    watermark describes the whole list for the next poll. rewritten is True
+    when the actions covered by the previous watermark changed (edited,
+    removed or renumbered), in which case the consumer should replay, and
+    None when there was no watermark to compare against. unchanged is the
+    number of leading actions the previous watermark vouches for.
+    """
+
+    def __init__(self, body, spans, watermark=None, rewritten=None, unchanged=0):
+        self._body = body
+        self._spans = spans
+        self._decoded = {}
+        self.watermark = watermark
+        self.rewritten = rewritten
+        self.unchanged = unchanged
+
+    def __len__(self):
+        return len(self._spans)
+
+    def _decode(self, i):
+        action = self._decoded.get(i)
+        if action is None:
+            start, end = self._spans[i]
+            action = self._decoded[i] = codec.loads(self._body[start:end])
+        return action
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(*index.indices(len(self._spans)))]
+        if index < 0:
+            index += len(self._spans)
+        if not 0 <= index < len(self._spans):
+            raise IndexError("action index out of range")
+        return self._decode(index)
+
+    def __iter__(self):
+        for i in range(len(self._spans)):
+            yield self._decode(i)
+
+    def decoded_count(self):
+        return len(self._decoded)
+
+
+def _split_actions(body, pos):
+    # Fast path: cut at "},{" boundaries with C-level searches. The cuts are
+    # only trusted if every brace in the array is one of the cut points and
+    # there is one actionNumber key per piece, i.e. no brace appeared inside
+    # a string and no object is nested.
+    open_at = body.find(b"{", pos)
+    tail = _ARRAY_END.search(body, open_at) if open_at >= 0 else None
+    if tail is None or body[pos:open_at].strip():
+        return None, pos
+    close_at = tail.start() + 1
+    spans = []
+    start = open_at
+    for m in _BOUNDARY.finditer(body, open_at, close_at):
+        spans.append((start, m.start() + 1))
+        start = m.end() - 1
+    spans.append((start, close_at))
+    n = len(spans)
+    if (
+        body.count(b"{", open_at, close_at) != n
+        or body.count(b"}", open_at, close_at) != n
+        or body.count(b'"actionNumber":', open_at, close_at) != n
+    ):
+        return None, pos
+    return spans, tail.end()
+
+
+def _scan_actions(body, pos):
+    empty = _EMPTY_TAIL.match(body, pos)
+    if empty is not None:
+        return [], empty.end()
+    spans, end = _split_actions(body, pos)
+    if spans is not None:
+        return spans, end
+    # Slow path: match one action at a time.
+    spans = []
+    while True:
+        m = _ACTION_SPAN.match(body, pos)
+        if m is None:
+            return None, pos
+        spans.append(m.span(1))
+        pos = m.end()
+        if m.group(2) == b"]":
+            return spans, pos
+
+
+def parse_playbyplay_feed(body, watermark=None):
+    """
+    Parses a play-by-play feed body (bytes) into the same shape as codec.loads,
+    with game.actions as a LazyActions. Everything outside the actions array
+    is decoded normally.
+
+    With the watermark from the previous poll, the actions it covers are
+    compared by digest instead of being decoded. Falls back to a plain
+    codec.loads if the actions array is not in the expected flat form.
+    """
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    key = _ACTIONS_KEY.search(body)
+    spans = None
+    if key is not None:
+        spans, end = _scan_actions(body, key.end())
+    if spans is None:
+        return codec.loads(body)
+
+    try:
+        data = codec.loads(body[:key.end()] + b"]" + body[end:])
+    except ValueError:
+        data = None
+    game = data.get("game") if isinstance(data, dict) else None
+    if not isinstance(game, dict) or game.get("actions") != []:
+        return codec.loads(body)
+
+    # One hashing pass: the digest up to the old watermark is a snapshot of
+    # the running digest over the whole array.
+    view = memoryview(body)
+    first = spans[0][0] if spans else 0
+    digest = hashlib.sha1(usedforsecurity=False)
+    rewritten = None
+    unchanged = 0
+    pos = first
+    if watermark is not None and watermark.count:
+        count = watermark.count
+        if len(spans) < count:
+            rewritten = True
+        else:
+            pos = spans[count - 1][1]
+            digest.update(view[first:pos])
+            rewritten = digest.digest() != watermark.digest
+            if not rewritten:
+                unchanged = count
+    digest.update(view[pos:spans[-1][1] if spans else first])
+    game["actions"] = LazyActions(
+        body,
+        spans,
+        watermark=FeedWatermark(len(spans), digest.digest()),
+        rewritten=rewritten,
+        unchanged=unchanged,
+    )
+    return data
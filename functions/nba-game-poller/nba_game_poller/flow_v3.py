@@ -0,0 +1,255 @@
+from nba_game_poller.clock import format_trimmed_clock, trimmed_clock_centiseconds
+
+# v3 flow: players live in one table and everything else refers to them by
+# index. Actions, score entries, segments and lineup stints are rows (lists)
+# in the column order given by FIELDS, and clocks are integer centiseconds
+# left in the period. A clock that is not a plain trimmed clock ("1143.00")
+# is kept as it was, so flow_v3_to_v2() always gives back the v2 flow.
+#
+#   players:  [{"team", "name", "personId", "nameI"}, ...]
+#   roster:   {team: [player, ...]} in v2 "players" order, with no-action players
+#   actions:  rows grouped by player, in roster order
+#   segments: {team: [[player, [segment row, ...]], ...]}
+#   events:   indices into actions, in play order (when requested)
+#   feed:     action rows for the whole feed, player index null (when requested)
+
+FLOW_VERSION = 3
+
+ACTION_FIELDS = ["p", "quarter", "clock", "type", "text", "detail", "seq", "awayScore", "homeScore", "r"]
+SCORE_FIELDS = ["quarter", "clock", "awayScore", "homeScore"]
+SEGMENT_FIELDS = ["quarter", "start", "end"]
+LINEUP_FIELDS = ["quarter", "start", "end", "players", "for", "against"]
+FIELDS = {
+    "actions": ACTION_FIELDS,
+    "score": SCORE_FIELDS,
+    "segments": SEGMENT_FIELDS,
+    "lineups": LINEUP_FIELDS,
+}
+_TEAMS = ("away", "home")
+
+
+def _to_cs(clock):
+    cs = trimmed_clock_centiseconds(clock)
+    return clock if cs is None else cs
+
+
+def _from_cs(clock):
+    if isinstance(clock, int) and not isinstance(clock, bool):
+        return format_trimmed_clock(clock)
+    return clock
+
+
+def _action_row(p, action):
+    return [
+        p,
+        action.get("quarter"),
+        _to_cs(action.get("time")),
+        action.get("type"),
+        action.get("text"),
+        action.get("detail"),
+        action.get("seq"),
+        action.get("awayScore"),
+        action.get("homeScore"),
+        action.get("r"),
+    ]
+
+
+def _action_dict(row):
+    _, quarter, clock, action_type, text, detail, seq, away, home, result = row
+    action = {
+        "quarter": quarter,
+        "time": _from_cs(clock),
+        "type": action_type,
+        "text": text,
+        "detail": detail,
+        "seq": seq,
+        "awayScore": away,
+        "homeScore": home,
+    }
+    if result is not None:
+        action["r"] = result
+    return action
+
+
+def _row_key(action):
+    return tuple(sorted(action.items(), key=lambda item: item[0]))
+
+
+def flow_v2_to_v3(flow, people=None):
+    """
+    Converts a v2 flow payload to v3. people maps (team, name) to the first
+    action of that player ({"personId", "playerNameI", ...}) for the player
+    table; names without an entry get null ids.
+    """
+    people = people or {}
+    players = flow.get("players") or {}
+    segments = flow.get("segments") or {}
+    lineups = flow.get("lineups") or {}
+    court = flow.get("court") or {}
+
+    table = []
+    index = {}
+
+    def player_index(team, name):
+        key = (team, name)
+        p = index.get(key)
+        if p is None:
+            p = index[key] = len(table)
+            first = people.get(key) or {}
+            table.append({
+                "team": team,
+                "name": name,
+                "personId": first.get("personId"),
+                "nameI": first.get("playerNameI"),
+            })
+        return p
+
+    roster = {}
+    actions = []
+    rows_by_value = {}
+    for team in _TEAMS:
+        if team not in players:
+            continue
+        roster[team] = []
+        for name, acts in players[team].items():
+            p = player_index(team, name)
+            roster[team].append(p)
+            for action in acts:
+                rows_by_value.setdefault(_row_key(action), len(actions))
+                actions.append(_action_row(p, action))
+
+    segment_rows = {}
+    for team in _TEAMS:
+        if team not in segments:
+            continue
+        segment_rows[team] = [
+            [
+                player_index(team, name),
+                [[seg.get("quarter"), _to_cs(seg.get("start")), _to_cs(seg.get("end"))] for seg in segs],
+            ]
+            for name, segs in segments[team].items()
+        ]
+
+    lineup_rows = {}
+    for team in _TEAMS:
+        if team not in lineups:
+            continue
+        lineup_rows[team] = [
+            [
+                stint.get("quarter"),
+                _to_cs(stint.get("start")),
+                _to_cs(stint.get("end")),
+                [player_index(team, name) for name in stint.get("players") or []],
+                stint.get("for"),
+                stint.get("against"),
+            ]
+            for stint in lineups[team]
+        ]
+
+    court_v3 = {}
+    for team in _TEAMS:
+        if team not in court:
+            continue
+        entry = court[team] or {}
+        court_v3[team] = {
+            "players": [player_index(team, name) for name in entry.get("names") or []],
+            "t": entry.get("t") or [],
+            "on": entry.get("on") or [],
+        }
+
+    last = flow.get("last")
+    result = {
+        "v": FLOW_VERSION,
+        "fields": FIELDS,
+        "periods": flow.get("periods"),
+        "last": None if last is None else {
+            "quarter": last.get("quarter"),
+            "clock": _to_cs(last.get("time")),
+            "awayScore": last.get("awayScore"),
+            "homeScore": last.get("homeScore"),
+        },
+        "players": table,
+        "roster": roster,
+        "actions": actions,
+        "score": [
+            [entry.get("quarter"), _to_cs(entry.get("time")), entry.get("awayScore"), entry.get("homeScore")]
+            for entry in flow.get("score") or []
+        ],
+        "segments": segment_rows,
+        "lineups": lineup_rows,
+        "court": court_v3,
+    }
+    if "events" in flow:
+        result["events"] = [rows_by_value[_row_key(action)] for action in flow["events"]]
+    if "feed" in flow:
+        result["feed"] = [_action_row(None, action) for action in flow["feed"]]
+    return result
+
+
+def flow_v3_to_v2(flow):
+    """Converts a v3 flow back to the v2 payload older clients read."""
+    table = flow.get("players") or []
+    actions = [_action_dict(row) for row in flow.get("actions") or []]
+
+    by_player = {}
+    for row, action in zip(flow.get("actions") or [], actions):
+        by_player.setdefault(row[0], []).append(action)
+    players = {
+        team: {table[p]["name"]: by_player.get(p, []) for p in indices}
+        for team, indices in (flow.get("roster") or {}).items()
+    }
+    segments = {
+        team: {
+            table[p]["name"]: [
+                {"quarter": quarter, "start": _from_cs(start), "end": _from_cs(end)}
+                for quarter, start, end in segs
+            ]
+            for p, segs in rows
+        }
+        for team, rows in (flow.get("segments") or {}).items()
+    }
+
+    last = flow.get("last")
+    result = {
+        "v": 2,
+        "periods": flow.get("periods"),
+        "last": None if last is None else {
+            "quarter": last.get("quarter"),
+            "time": _from_cs(last.get("clock")),
+            "awayScore": last.get("awayScore"),
+            "homeScore": last.get("homeScore"),
+        },
+        "score": [
+            {"quarter": quarter, "time": _from_cs(clock), "awayScore": away, "homeScore": home}
+            for quarter, clock, away, home in flow.get("score") or []
+        ],
+        "players": players,
+        "segments": segments,
+        "lineups": {
+            team: [
+                {
+                    "quarter": quarter,
+                    "start": _from_cs(start),
+                    "end": _from_cs(end),
+                    "players": [table[p]["name"] for p in lineup_players],
+                    "for": pts_for,
+                    "against": pts_against,
+                }
+                for quarter, start, end, lineup_players, pts_for, pts_against in rows
+            ]
+            for team, rows in (flow.get("lineups") or {}).items()
+        },
+        "court": {
+            team: {
+                "names": [table[p]["name"] for p in entry.get("players") or []],
+                "t": entry.get("t") or [],
+                "on": entry.get("on") or [],
+            }
+            for team, entry in (flow.get("court") or {}).items()
+        },
+    }
+    if "events" in flow:
+        result["events"] = [actions[i] for i in flow["events"]]
+    if "feed" in flow:
+        result["feed"] = [_action_dict(row) for row in flow["feed"]]
+    return result
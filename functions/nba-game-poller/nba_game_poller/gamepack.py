@@ -0,0 +1,105 @@
+from nba_game_poller.clock import format_minutes, safe_int
+from nba_game_poller.playbyplay_processing import process_playbyplay_payload
+
+
+def build_box_payload(game_id, box_game):
+    if not isinstance(box_game, dict):
+        return None
+    return {
+        "start": (
+            box_game.get("gameEt")
+            or box_game.get("gameTimeUTC")
+            or box_game.get("gameDateTimeUTC")
+        ),
+        "teams": {
+            "away": build_team_payload(box_game.get("awayTeam")),
+            "home": build_team_payload(box_game.get("homeTeam")),
+        },
+    }
+
+
+def build_team_payload(team):
+    if not isinstance(team, dict):
+        return None
+    players = []
+    for player in team.get("players") or []:
+        if not isinstance(player, dict):
+            continue
+        stats = player.get("statistics") or {}
+        players.append({
+            "first": (player.get("firstName") or "").strip(),
+            "last": (player.get("familyName") or "").strip(),
+            "stats": {
+                "min": format_minutes(stats.get("minutes")),
+                "pts": safe_int(stats.get("points")),
+                "fgm": safe_int(stats.get("fieldGoalsMade")),
+                "fga": safe_int(stats.get("fieldGoalsAttempted")),
+                "tpm": safe_int(stats.get("threePointersMade")),
+                "tpa": safe_int(stats.get("threePointersAttempted")),
+                "ftm": safe_int(stats.get("freeThrowsMade")),
+                "fta": safe_int(stats.get("freeThrowsAttempted")),
+                "oreb": safe_int(stats.get("reboundsOffensive")),
+                "dreb": safe_int(stats.get("reboundsDefensive")),
+                "ast": safe_int(stats.get("assists")),
+                "stl": safe_int(stats.get("steals")),
+                "blk": safe_int(stats.get("blocks")),
+                "to": safe_int(stats.get("turnovers")),
+                "pf": safe_int(stats.get("foulsPersonal")),
+                "pm": safe_int(stats.get("plusMinusPoints")),
+            },
+        })
+    return {
+        "id": team.get("teamId"),
+        "abbr": team.get("teamTricode"),
+        "name": team.get("teamName"),
+        "players": players,
+    }
+
+
+def build_gamepack(game_key, nba_game_id, play_data, box_data):
+    """
+    Gamepack for one finished or in-progress game from its raw play-by-play
+    and boxscore feeds. Returns (gamepack, is_final), or (None, False) if
+    either feed is missing or empty.
+    """
+    if not play_data or not box_data:
+        return None, False
+
+    play_game = play_data.get("game", {})
+    actions = play_game.get("actions", [])
+    box_game = box_data.get("game", {})
+    if not actions or not box_game:
+        return None, False
+
+    home_team_id = (
+        box_game.get("homeTeam", {}).get("teamId") or box_game.get("homeTeamId")
+    )
+    away_team_id = (
+        box_game.get("awayTeam", {}).get("teamId") or box_game.get("awayTeamId")
+    )
+    home_team_id = home_team_id or play_game.get("homeTeamId") or play_game.get("homeTeam", {}).get("teamId")
+    away_team_id = away_team_id or play_game.get("awayTeamId") or play_game.get("awayTeam", {}).get("teamId")
+
+    processed = process_playbyplay_payload(
+        game_id=str(nba_game_id),
+        actions=actions,
+        away_team_id=away_team_id,
+        home_team_id=home_team_id,
+        include_actions=False,
+        include_all_actions=False,
+    )
+    slim_box = build_box_payload(str(nba_game_id), box_game)
+
+    last_desc = (actions[-1].get("description") or "").strip()
+    is_play_final = last_desc.startswith("Game End")
+    status_text = (box_game.get("gameStatusText") or "").strip()
+    is_box_final = status_text.startswith("Final")
+
+    gamepack = {
+        "v": 1,
+        "id": str(nba_game_id),
+        "publicId": str(game_key),
+        "box": slim_box,
+        "flow": processed,
+    }
+    return gamepack, is_play_final or is_box_final
@@ -0,0 +1,268 @@
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate
+
+from nba_game_poller import codec
+from nba_game_poller.clock import format_trimmed_clock, trimmed_clock_centiseconds
+
+# Binary columnar gamepack, shipped next to the JSON one.
+#
+#   b"CVGP" | u8 format version | u32 header length | header JSON | columns
+#
+# The header holds a string/value dictionary, the record shapes (key lists),
+# the per-player offset ranges and a descriptor per column; everything that
+# is not a per-action table (box, segments, lineups, court, ...) stays in
+# header["rest"] as plain JSON. Column data is little-endian.
+
+MAGIC = b"CVGP"
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct("<4sBI")
+_INT32_MIN = -(2 ** 31)
+_INT32_MAX = 2 ** 31 - 1
+_EMPTY_SCORE = -1
+
+
+def _score_value(value):
+    if value == "":
+        return _EMPTY_SCORE
+    if isinstance(value, str) and value.isdigit() and str(int(value)) == value:
+        return int(value)
+    return None
+
+
+def _int_value(value):
+    if isinstance(value, int) and not isinstance(value, bool) and _INT32_MIN <= value <= _INT32_MAX:
+        return value
+    return None
+
+
+# Column kinds: how a value is stored in an integer column and read back.
+_KINDS = {
+    "clock": (trimmed_clock_centiseconds, format_trimmed_clock),
+    "score": (_score_value, lambda v: "" if v == _EMPTY_SCORE else str(v)),
+    "int": (_int_value, lambda v: v),
+}
+
+
+class _Dictionary:
+    def __init__(self):
+        self.values = []
+        self._index = {}
+
+    def code(self, value):
+        # Keyed by type as well, so 1, "1" and True stay distinct entries.
+        key = (type(value), value)
+        code = self._index.get(key)
+        if code is None:
+            code = self._index[key] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _little_endian(column):
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _int_typecode(values):
+    low = min(values, default=0)
+    high = max(values, default=0)
+    if -128 <= low and high <= 127:
+        return "b"
+    if -32768 <= low and high <= 32767:
+        return "h"
+    return "i"
+
+
+def _encode_column(values, present, dictionary):
+    for kind, (encode, _) in _KINDS.items():
+        encoded = []
+        for value, p in zip(values, present):
+            e = encode(value) if p else 0
+            if e is None:
+                break
+            encoded.append(e)
+        else:
+            return kind, encoded
+    return "dict", [dictionary.code(v) if p else 0 for v, p in zip(values, present)]
+
+
+def _pack_column(values):
+    """
+    Smallest-typed array for the column, stored as first differences when
+    that compresses better (sequence numbers, dictionary codes of mostly
+    new strings). Returns (array, delta).
+    """
+    plain = array(_int_typecode(values), values)
+    deltas = [values[0]] + [b - a for a, b in zip(values, values[1:])] if values else []
+    delta = array(_int_typecode(deltas), deltas)
+    if len(zlib.compress(delta.tobytes())) < len(zlib.compress(plain.tobytes())):
+        return delta, True
+    return plain, False
+
+
+def _encode_table(records, dictionary, shapes, shape_index, blobs, offset):
+    """Columns for a list of flat records. Returns (descriptor, new offset)."""
+    keys = []
+    shape_codes = array("H")
+    for record in records:
+        shape = tuple(record)
+        code = shape_index.get(shape)
+        if code is None:
+            code = shape_index[shape] = len(shapes)
+            shapes.append(list(shape))
+        shape_codes.append(code)
+        for key in shape:
+            if key not in keys:
+                keys.append(key)
+
+    columns = []
+    blob = _little_endian(shape_codes)
+    blobs.append(blob)
+    columns.append({"key": None, "kind": "shape", "type": "H", "offset": offset})
+    offset += len(blob)
+    for key in keys:
+        present = [key in record for record in records]
+        values = [record.get(key) for record in records]
+        kind, encoded = _encode_column(values, present, dictionary)
+        column, delta = _pack_column(encoded)
+        blob = _little_endian(column)
+        blobs.append(blob)
+        descriptor = {"key": key, "kind": kind, "type": column.typecode, "offset": offset}
+        if delta:
+            descriptor["delta"] = True
+        columns.append(descriptor)
+        offset += len(blob)
+    return {"rows": len(records), "columns": columns}, offset
+
+
+def _flat_records(records):
+    return all(
+        isinstance(r, dict) and all(not isinstance(v, (dict, list)) for v in r.values())
+        for r in records
+    )
+
+
+def encode_gamepack(gamepack):
+    """
+    Binary encoding of a gamepack whose flow is v2. The per-player actions
+    and the score timeline become column tables; decode_gamepack() gives
+    back an equal gamepack.
+    """
+    flow = gamepack.get("flow")
+    if not isinstance(flow, dict) or flow.get("v") != 2:
+        raise ValueError("gamepack has no v2 flow")
+    players = flow.get("players") or {}
+    score = flow.get("score") or []
+
+    ranges = []
+    actions = []
+    for team in ("away", "home"):
+        for name, acts in (players.get(team) or {}).items():
+            ranges.append([team, name, len(actions), len(acts)])
+            actions.extend(acts)
+    if not _flat_records(actions) or not _flat_records(score):
+        raise ValueError("gamepack flow has nested values in actions or score")
+
+    rest = dict(gamepack)
+    rest["flow"] = {k: v for k, v in flow.items() if k not in ("players", "score")}
+    flow_keys = list(flow)
+
+    dictionary = _Dictionary()
+    shapes = []
+    shape_index = {}
+    blobs = []
+    actions_table, offset = _encode_table(actions, dictionary, shapes, shape_index, blobs, 0)
+    score_table, offset = _encode_table(score, dictionary, shapes, shape_index, blobs, offset)
+
+    header = codec.dumps({
+        "v": FORMAT_VERSION,
+        "strings": dictionary.values,
+        "shapes": shapes,
+        "players": ranges,
+        "teams": [team for team in ("away", "home") if team in players],
+        "flowKeys": flow_keys,
+        "actions": actions_table,
+        "score": score_table,
+        "rest": rest,
+    })
+    return _PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)) + header + b"".join(blobs)
+
+
+def read_columns(data):
+    """
+    Parses the header and maps every column to an array without building
+    any records. Returns (header, {"actions": {key: array}, "score": {...}}).
+    Clock columns hold centiseconds left in the period and score columns -1
+    for "no score", so clients can use them directly.
+    """
+    magic, version, header_len = _PREAMBLE.unpack_from(data, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("not a binary gamepack")
+    start = _PREAMBLE.size
+    header = codec.loads(data[start:start + header_len])
+    body = memoryview(data)[start + header_len:]
+
+    tables = {}
+    for name in ("actions", "score"):
+        table = header[name]
+        rows = table["rows"]
+        columns = {}
+        for column in table["columns"]:
+            values = array(column["type"])
+            end = column["offset"] + rows * values.itemsize
+            values.frombytes(body[column["offset"]:end])
+            if sys.byteorder == "big":
+                values.byteswap()
+            if column.get("delta"):
+                values = array("q", accumulate(values))
+            columns[column["key"]] = (column["kind"], values)
+        tables[name] = columns
+    return header, tables
+
+
+def _decode_table(table, columns, header):
+    strings = header["strings"]
+    shapes = header["shapes"]
+    decoded = {}
+    for key, (kind, values) in columns.items():
+        if key is None:
+            continue
+        if kind == "dict":
+            decoded[key] = [strings[v] for v in values]
+        else:
+            decode = _KINDS[kind][1]
+            decoded[key] = [decode(v) for v in values]
+    _, shape_codes = columns[None]
+    return [
+        {key: decoded[key][i] for key in shapes[code]}
+        for i, code in enumerate(shape_codes)
+    ]
+
+
+def decode_gamepack(data):
+    """Reference decoder: the gamepack that encode_gamepack() was given."""
+    header, tables = read_columns(data)
+    actions = _decode_table(header["actions"], tables["actions"], header)
+    score = _decode_table(header["score"], tables["score"], header)
+
+    players = {team: {} for team in header["teams"]}
+    for team, name, start, count in header["players"]:
+        players[team][name] = actions[start:start + count]
+
+    gamepack = header["rest"]
+    rest_flow = gamepack["flow"]
+    flow = {}
+    for key in header["flowKeys"]:
+        if key == "players":
+            flow[key] = players
+        elif key == "score":
+            flow[key] = score
+        else:
+            flow[key] = rest_flow[key]
+    gamepack["flow"] = flow
+    return gamepack
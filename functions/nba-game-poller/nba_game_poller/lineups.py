@@ -0,0 +1,109 @@
+from nba_game_poller.clock import trim_clock
+
+
+class LineupStint:
+    """A stretch of one period with an unchanged lineup and the points scored in it."""
+
+    __slots__ = ("period", "start", "end", "players", "pts_for", "pts_against")
+
+    def __init__(self, period, start, players=(), end=None, pts_for=0, pts_against=0):
+        self.period = period
+        self.start = start
+        self.end = end
+        self.players = players  # sorted tuple of display names
+        self.pts_for = pts_for
+        self.pts_against = pts_against
+
+    def to_json(self, open_end=None):
+        return {
+            "quarter": self.period,
+            "start": trim_clock(self.start),
+            "end": trim_clock(self.end if self.end is not None else open_end),
+            "players": list(self.players),
+            "for": self.pts_for,
+            "against": self.pts_against,
+        }
+
+    def to_checkpoint(self):
+        return [self.period, self.start, self.end, list(self.players), self.pts_for, self.pts_against]
+
+    @classmethod
+    def from_checkpoint(cls, entry):
+        period, start, end, players, pts_for, pts_against = entry
+        return cls(period, start, tuple(players), end, pts_for, pts_against)
+
+
+class LineupTracker:
+    """
+    Five-man lineup stints for one team, driven by the same playtime updates
+    that build segments.
+
+    Playtimes infer that a player who shows up in a period without being
+    subbed in was on court from the period start, so such a player is
+    backfilled into every stint of the period so far. Explicit substitutions
+    close the open stint and start a new one with the updated lineup.
+    """
+
+    def __init__(self):
+        self.stints = []
+        self._period_start = 0  # index of the current period's first stint
+        self._on = set()
+
+    def new_period(self, period, start_clock):
+        if self.stints and self.stints[-1].end is None:
+            self.stints[-1].end = "PT00M00.00S"
+        self._on = set()
+        self._period_start = len(self.stints)
+        self.stints.append(LineupStint(period, start_clock))
+
+    def backfill(self, name):
+        if name in self._on:
+            return
+        self._on.add(name)
+        for stint in self.stints[self._period_start:]:
+            stint.players = tuple(sorted(stint.players + (name,)))
+
+    def enter(self, name):
+        self._on.add(name)
+
+    def leave(self, name):
+        self._on.discard(name)
+
+    def settle(self, period, clock):
+        """Starts a new stint at clock if enters/leaves changed the lineup."""
+        current = self.stints[-1]
+        if len(self._on) == len(current.players) and self._on.issuperset(current.players):
+            return
+        players = tuple(sorted(self._on))
+        if current.start == clock and not (current.pts_for or current.pts_against):
+            # Several substitutions at one clock stop make a single change.
+            current.players = players
+            return
+        current.end = clock
+        self.stints.append(LineupStint(period, clock, players))
+
+    def score(self, pts_for, pts_against):
+        if self.stints:
+            current = self.stints[-1]
+            current.pts_for += pts_for
+            current.pts_against += pts_against
+
+    def to_json(self, open_end):
+        return [stint.to_json(open_end) for stint in self.stints]
+
+    def to_checkpoint(self):
+        return [stint.to_checkpoint() for stint in self.stints]
+
+    @classmethod
+    def from_checkpoint(cls, entries):
+        tracker = cls()
+        tracker.stints = [LineupStint.from_checkpoint(entry) for entry in entries or []]
+        if tracker.stints:
+            period = tracker.stints[-1].period
+            start = len(tracker.stints) - 1
+            while start > 0 and tracker.stints[start - 1].period == period:
+                start -= 1
+            tracker._period_start = start
+            if tracker.stints[-1].end is None:
+                tracker._on = set(tracker.stints[-1].players)
+        return tracker
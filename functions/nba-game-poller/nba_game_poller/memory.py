@@ -0,0 +1,151 @@
+import os
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Opt-in peak memory reporting with tracemalloc, in the same shape as
+# nba_game_poller.stages. Code marks a task with
+#
+#     with track_memory("pbp.payload"):
+#         ...
+#
+# which records the task's peak traced memory above what was allocated when
+# it started, and the source lines whose allocations it left behind (the
+# tracemalloc snapshot difference across the task). Both need a
+# MemoryProfile made active with memory_tracking(); otherwise track_memory
+# costs one ContextVar lookup. tracemalloc is process-wide, so allocations
+# by other threads during a task count towards its peak.
+
+_ACTIVE = ContextVar("memory_profile", default=None)
+# Tasks being tracked, innermost last; a task resets the tracemalloc peak,
+# so it hands the peak seen so far to its parent first.
+_OPEN = []
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class MemoryProfile:
+    """Peak bytes, number of calls and the top allocation sites per named task."""
+
+    def __init__(self, top=5):
+        self.top = top
+        self.tasks = {}
+
+    def add(self, name, peak, sites=()):
+        entry = self.tasks.get(name)
+        if entry is None:
+            entry = self.tasks[name] = [0, 0, {}]
+        entry[0] = max(entry[0], peak)
+        entry[1] += 1
+        for site, size in sites:
+            entry[2][site] = max(entry[2].get(site, 0), size)
+
+    def merge(self, other):
+        """Adds another profile's tasks, e.g. one game's into the invocation's."""
+        for name, (peak, calls, sites) in other.tasks.items():
+            entry = self.tasks.setdefault(name, [0, 0, {}])
+            entry[0] = max(entry[0], peak)
+            entry[1] += calls
+            for site, size in sites.items():
+                entry[2][site] = max(entry[2].get(site, 0), size)
+
+    def to_json(self):
+        report = {}
+        for name, (peak, calls, sites) in self.tasks.items():
+            top = sorted(sites.items(), key=lambda item: item[1], reverse=True)[: self.top]
+            report[name] = {
+                "peakKb": round(peak / 1024, 1),
+                "calls": calls,
+                "top": [[site, round(size / 1024, 1)] for site, size in top],
+            }
+        return report
+
+
+def _snapshot():
+    return tracemalloc.take_snapshot().filter_traces(_IGNORED)
+
+
+def _site(stat):
+    frame = stat.traceback[0]
+    return f"{os.path.basename(frame.filename)}:{frame.lineno}"
+
+
+class _Task:
+    __slots__ = ("profile", "name", "start", "seen", "before")
+
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.before = _snapshot() if self.profile.top else None
+        current, peak = tracemalloc.get_traced_memory()
+        if _OPEN:
+            _OPEN[-1].seen = max(_OPEN[-1].seen, peak)
+        tracemalloc.reset_peak()
+        self.start = current
+        self.seen = 0
+        _OPEN.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        _OPEN.remove(self)
+        peak = max(tracemalloc.get_traced_memory()[1], self.seen)
+        if _OPEN:
+            _OPEN[-1].seen = max(_OPEN[-1].seen, peak)
+        sites = ()
+        if self.before is not None:
+            stats = _snapshot().compare_to(self.before, "lineno")
+            sites = [(_site(stat), stat.size_diff) for stat in stats[: self.profile.top] if stat.size_diff > 0]
+        self.profile.add(self.name, peak - self.start, sites)
+        return False
+
+
+class _NullTask:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TASK = _NullTask()
+
+
+def track_memory(name):
+    """Context manager recording one task into the active MemoryProfile, if any."""
+    profile = _ACTIVE.get()
+    if profile is None or not tracemalloc.is_tracing():
+        return _NULL_TASK
+    return _Task(profile, name)
+
+
+@contextmanager
+def memory_tracking(profile, name=None):
+    """
+    Makes profile (a MemoryProfile, or None to disable) active for the
+    block, tracing allocations if nothing else is. With name, the whole
+    block is also recorded as that task.
+    """
+    if profile is None:
+        yield None
+        return
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    token = _ACTIVE.set(profile)
+    try:
+        if name is None:
+            yield profile
+        else:
+            with _Task(profile, name):
+                yield profile
+    finally:
+        _ACTIVE.reset(token)
+        if started:
+            tracemalloc.stop()
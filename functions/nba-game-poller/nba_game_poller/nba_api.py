@@ -1,9 +1,12 @@
 import gzip
 import json
+import os
 import random
 import urllib.error
 import urllib.request
 
+from nba_game_poller import codec
+
 
 USER_AGENTS = [
     # Chrome on Windows
@@ -18,10 +21,35 @@ USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36 Edg/131.0.0.0",
 ]
 
+# Base URL of the NBA CDN. NBA_CDN_BASE_URL points the poller and jobs at a
+# stand-in such as nba_game_poller.fake_cdn for offline runs.
+CDN_BASE_URL = os.environ.get("NBA_CDN_BASE_URL", "").strip() or "https://cdn.nba.com"
+
+
+def cdn_url(path, base_url=None):
+    return f"{(base_url or CDN_BASE_URL).rstrip('/')}/static/json/{path}"
+
+
+def playbyplay_url(nba_game_id, base_url=None):
+    return cdn_url(f"liveData/playbyplay/playbyplay_{nba_game_id}.json", base_url)
+
+
+def boxscore_url(nba_game_id, base_url=None):
+    return cdn_url(f"liveData/boxscore/boxscore_{nba_game_id}.json", base_url)
+
+
+def scoreboard_url(base_url=None):
+    return cdn_url("liveData/scoreboard/todaysScoreboard_00.json", base_url)
+
+
+def schedule_feed_url(base_url=None):
+    return cdn_url("staticData/scheduleLeagueV2_1.json", base_url)
+
 
-def fetch_nba_data_urllib(url, etag=None, user_agent=None):
+def fetch_nba_data_urllib(url, etag=None, user_agent=None, parse=None):
     """
     Fetch JSON from NBA CDN using only the stdlib, supporting ETag 304 short-circuiting.
+    parse replaces codec.loads on the (decompressed) body, e.g. parse_playbyplay_feed.
     Returns: (data_or_None, etag_or_original)
     """
     if not user_agent:
@@ -52,7 +80,7 @@ def fetch_nba_data_urllib(url, etag=None, user_agent=None):
                     pass
 
             try:
-                data = json.loads(content)
+                data = (parse or codec.loads)(content)
             except json.JSONDecodeError:
                 print(f"JSON Decode Error for {url}")
                 return None, etag
@@ -1,9 +1,19 @@
+import hashlib
+import heapq
 import re
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
+
+from nba_game_poller import codec
+from nba_game_poller.clock import clock_centiseconds, clock_seconds, safe_int, trim_clock
+from nba_game_poller.court_index import CourtIndex
+from nba_game_poller.flow_v3 import flow_v2_to_v3
+from nba_game_poller.lineups import LineupTracker
+from nba_game_poller.roster import RosterIndex
+from nba_game_poller.stages import stage
 
 
-_CLOCK_RE = re.compile(r"^(?:PT)?(\d+)M(\d+)(?:\.(\d+))?S?$")
-_CLOCK_COMPACT_RE = re.compile(r"^(\d+)(\d{2})(?:\.(\d+))?$")
-_CLOCK_COLON_RE = re.compile(r"^(\d+):(\d+)(?:\.(\d+))?$")
 _DISTANCE_RE = re.compile(r"(\d+)'")
 _FT_ATTEMPT_RE = re.compile(r"(\d+)\s*of\s*(\d+)", re.IGNORECASE)
 _JUMPBALL_RE = re.compile(
@@ -12,43 +22,14 @@ _JUMPBALL_RE = re.compile(
 )
 _SUB_IN_OUT_RE = re.compile(r"SUB\s+(in|out):\s*(.+)", re.IGNORECASE)
 _SUB_FOR_RE = re.compile(r"SUB:\s*(.+?)\s+FOR\s+(.+)", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+_SHOT_WORD_RE = re.compile(r"\bshot\b")
+_UNSET = object()
 
 
-def time_to_seconds(clock):
-    if not clock or not isinstance(clock, str):
-        return 0.0
-    m = _CLOCK_RE.match(clock)
-    if m:
-        minutes = int(m.group(1) or 0)
-        seconds = int(m.group(2) or 0)
-        milliseconds = int(m.group(3) or 0)
-        return minutes * 60 + seconds + milliseconds / 100.0
-    m = _CLOCK_COMPACT_RE.match(clock)
-    if m:
-        minutes = int(m.group(1) or 0)
-        seconds = int(m.group(2) or 0)
-        milliseconds = int(m.group(3) or 0)
-        return minutes * 60 + seconds + milliseconds / 100.0
-    m = _CLOCK_COLON_RE.match(clock)
-    if m:
-        minutes = int(m.group(1) or 0)
-        seconds = int(m.group(2) or 0)
-        milliseconds = int(m.group(3) or 0)
-        return minutes * 60 + seconds + milliseconds / 100.0
-    return 0.0
-
-
-def _trim_clock(clock):
-    if not clock or not isinstance(clock, str):
-        return clock
-    trimmed = clock.strip()
-    if trimmed.startswith("PT"):
-        trimmed = trimmed[2:]
-    if trimmed.endswith("S"):
-        trimmed = trimmed[:-1]
-    if "M" in trimmed:
-        trimmed = trimmed.replace("M", "")
-    return trimmed
+# Clock parsing lives in nba_game_poller.clock; these names are kept for existing callers.
+time_to_seconds = clock_seconds
+_trim_clock = trim_clock
 
 
 def _normalize_name(action):
@@ -58,17 +39,34 @@ def _normalize_name(action):
 def _clean_phrase(value):
     if not value or not isinstance(value, str):
         return ""
-    cleaned = value.strip().lower()
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    return cleaned
+    # split() collapses the same whitespace runs as re.sub(r"\s+", " ") at a fraction of the cost.
+    return " ".join(value.lower().split())
+
+
+_TERM_PHRASES = {}
+
+
+def _clean_term(term):
+    # actionType and subType come from small fixed vocabularies, so their
+    # cleaned forms are memoized.
+    try:
+        return _TERM_PHRASES[term]
+    except KeyError:
+        cleaned = _clean_phrase(term)
+        if isinstance(term, str) and len(_TERM_PHRASES) < 512:
+            _TERM_PHRASES[term] = cleaned
+        return cleaned
+    except TypeError:
+        return _clean_phrase(term)
 
 
+@lru_cache(maxsize=256)
 def _normalize_shot_detail(sub_type):
-    detail = _clean_phrase(sub_type)
+    detail = _clean_term(sub_type)
     if not detail:
         return ""
-    detail = re.sub(r"\bshot\b", "", detail).strip()
-    detail = re.sub(r"\s+", " ", detail)
+    detail = _SHOT_WORD_RE.sub("", detail).strip()
+    detail = _WHITESPACE_RE.sub(" ", detail)
     if detail == "jump":
         detail = "jumper"
     return detail
@@ -139,7 +137,7 @@ def _free_throw_attempt(action, desc):
 
 
 def _rebound_side(action, desc):
-    detail = _clean_phrase(action.get("subType"))
+    detail = _clean_term(action.get("subType"))
     if "offensive" in detail:
         return "off"
     if "defensive" in detail:
@@ -186,10 +184,15 @@ def _format_substitution(desc):
 def _format_action_text(action):
     action_type = _clean_phrase(action.get("actionType"))
     desc = _clean_phrase(action.get("description"))
+    is_shot = _is_shot_action(action_type, desc)
+    result = _shot_result(action, action_type, desc) if is_shot else None
+    return _format_clean_action_text(action, action_type, desc, is_shot, result, parse_assist_name(action))
+
+
+def _format_clean_action_text(action, action_type, desc, is_shot, result, assist):
     name = _normalize_name(action)
 
-    if _is_shot_action(action_type, desc):
-        result = _shot_result(action, action_type, desc)
+    if is_shot:
         verb = "make" if result == "m" else "miss" if result == "x" else "shot"
         if "freethrow" in action_type or "free throw" in action_type:
             att, total = _free_throw_attempt(action, desc)
@@ -202,7 +205,6 @@ def _format_action_text(action):
         points = _shot_points(action_type, desc)
         detail = _normalize_shot_detail(action.get("subType"))
         distance = _extract_shot_distance(action)
-        assist = parse_assist_name(action)
         parts = [name, verb]
         if points is not None:
             parts.append(f"{points}pt")
@@ -231,16 +233,16 @@ def _format_action_text(action):
         return f"{name} block".strip()
 
     if "turnover" in action_type:
-        detail = _clean_phrase(action.get("subType"))
-        detail = re.sub(r"turnover", "", detail).strip()
+        detail = _clean_term(action.get("subType"))
+        detail = detail.replace("turnover", "").strip()
         return f"{name} turnover {detail}".strip()
 
     if "foul" in action_type:
-        detail = _clean_phrase(action.get("subType"))
+        detail = _clean_term(action.get("subType"))
         return f"{name} foul {detail}".strip()
 
     if "violation" in action_type:
-        detail = _clean_phrase(action.get("subType"))
+        detail = _clean_term(action.get("subType"))
         return f"{name} violation {detail}".strip()
 
     if "jump" in action_type:
@@ -322,39 +324,123 @@ def parse_assist_name(action):
 
 
 def add_assist_actions(action, players):
-    desc = action.get("description") or ""
     name = parse_assist_name(action)
     if not name:
         return players
 
-    start_desc = desc.rfind("(") + 1
-    end_desc = desc.rfind(")")
-    assist_desc = desc[start_desc:end_desc] if start_desc > 0 and end_desc > start_desc else desc
-
     if name not in players:
         players[name] = []
 
     first = players[name][0] if players[name] else {}
+    players[name].append(_build_assist_action(action, first, name))
+    return players
+
+
+class AssistAction:
+    """
+    Synthetic action credited to the assisting player. Only ever read back
+    through get(), like a raw action dict, so it is kept as a slotted record.
+    """
+
+    __slots__ = (
+        "actionType",
+        "clock",
+        "description",
+        "actionId",
+        "actionNumber",
+        "teamId",
+        "scoreHome",
+        "scoreAway",
+        "personId",
+        "playerName",
+        "playerNameI",
+        "period",
+        "teamTricode",
+    )
+
+    def __init__(
+        self,
+        *,
+        actionType,
+        clock,
+        description,
+        actionId,
+        actionNumber,
+        teamId,
+        scoreHome,
+        scoreAway,
+        personId,
+        playerName,
+        playerNameI,
+        period,
+        teamTricode,
+    ):
+        self.actionType = actionType
+        self.clock = clock
+        self.description = description
+        self.actionId = actionId
+        self.actionNumber = actionNumber
+        self.teamId = teamId
+        self.scoreHome = scoreHome
+        self.scoreAway = scoreAway
+        self.personId = personId
+        self.playerName = playerName
+        self.playerNameI = playerNameI
+        self.period = period
+        self.teamTricode = teamTricode
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+
+class Segment:
+    """One on-court stint: period plus raw start/end clocks (end is None while open)."""
+
+    __slots__ = ("period", "start", "end")
+
+    def __init__(self, period, start, end=None):
+        self.period = period
+        self.start = start
+        self.end = end
+
+    def to_json(self):
+        return {"quarter": self.period, "start": _trim_clock(self.start), "end": _trim_clock(self.end)}
+
+
+class Playtime:
+    """A player's stints so far and whether the last one is still open."""
+
+    __slots__ = ("times", "on")
+
+    def __init__(self, times=None, on=False):
+        self.times = times if times is not None else []
+        self.on = on
+
+
+def _build_assist_action(action, first, name):
+    desc = action.get("description") or ""
+    start_desc = desc.rfind("(") + 1
+    end_desc = desc.rfind(")")
+    assist_desc = desc[start_desc:end_desc] if start_desc > 0 and end_desc > start_desc else desc
+
     base_id = action.get("actionId") or action.get("actionNumber")
     assist_player_name = first.get("playerName") or name
     assist_player_name_i = first.get("playerNameI") or action.get("assistPlayerNameInitial") or name
-    assist_action = {
-        "actionType": "Assist",
-        "clock": action.get("clock"),
-        "description": assist_desc,
-        "actionId": f"{base_id}a" if base_id is not None else None,
-        "actionNumber": f"{action.get('actionNumber')}a",
-        "teamId": action.get("teamId"),
-        "scoreHome": action.get("scoreHome"),
-        "scoreAway": action.get("scoreAway"),
-        "personId": action.get("assistPersonId") or first.get("personId"),
-        "playerName": assist_player_name,
-        "playerNameI": assist_player_name_i,
-        "period": action.get("period"),
-        "teamTricode": action.get("teamTricode"),
-    }
-    players[name].append(assist_action)
-    return players
+    return AssistAction(
+        actionType="Assist",
+        clock=action.get("clock"),
+        description=assist_desc,
+        actionId=f"{base_id}a" if base_id is not None else None,
+        actionNumber=f"{action.get('actionNumber')}a",
+        teamId=action.get("teamId"),
+        scoreHome=action.get("scoreHome"),
+        scoreAway=action.get("scoreAway"),
+        personId=action.get("assistPersonId") or first.get("personId"),
+        playerName=assist_player_name,
+        playerNameI=assist_player_name_i,
+        period=action.get("period"),
+        teamTricode=action.get("teamTricode"),
+    )
 
 
 def create_players(actions, away_team_id, home_team_id):
@@ -362,117 +448,120 @@ def create_players(actions, away_team_id, home_team_id):
     home_players = {}
 
     for a in actions or []:
-        player_name = fix_player_name(a)
-        if not player_name:
-            continue
+        if a.get("teamId") == away_team_id:
+            _add_player_action(a, away_players)
+        elif a.get("teamId") == home_team_id:
+            _add_player_action(a, home_players)
 
-        team_id = a.get("teamId")
-        description = a.get("description") or ""
-        action_type = a.get("actionType")
+    return {"awayPlayers": away_players, "homePlayers": home_players}
 
-        if team_id == away_team_id:
-            away_players.setdefault(player_name, []).append(a)
-            if "AST" in description:
-                away_players = add_assist_actions(a, away_players)
-            if action_type == "Substitution":
-                start_name = description.find("SUB:") + 5
-                end_name = description.find("FOR") - 1
-                name = description[start_name:end_name]
-                name = _normalize_special_cases(name, a.get("teamTricode"))
-                away_players.setdefault(name, [])
-        elif team_id == home_team_id:
-            home_players.setdefault(player_name, []).append(a)
-            if "AST" in description:
-                home_players = add_assist_actions(a, home_players)
-            if action_type == "Substitution":
-                start_name = description.find("SUB:") + 5
-                end_name = description.find("FOR") - 1
-                name = description[start_name:end_name]
-                name = _normalize_special_cases(name, a.get("teamTricode"))
-                home_players.setdefault(name, [])
 
-    return {"awayPlayers": away_players, "homePlayers": home_players}
+def _add_player_action(a, players):
+    player_name = fix_player_name(a)
+    if not player_name:
+        return players
+
+    description = a.get("description") or ""
+    players.setdefault(player_name, []).append(a)
+    if "AST" in description:
+        players = add_assist_actions(a, players)
+    if a.get("actionType") == "Substitution":
+        players.setdefault(_substitution_incoming_name(a), [])
+    return players
+
+
+def _substitution_incoming_name(action):
+    desc = action.get("description") or ""
+    start_name = desc.find("SUB:") + 5
+    end_name = desc.find("FOR") - 1
+    name = desc[start_name:end_name]
+    return _normalize_special_cases(name, action.get("teamTricode"))
 
 
 def create_playtimes(players):
     playtimes = {}
     for player in (players or {}).keys():
-        playtimes[player] = {"times": [], "on": False}
+        playtimes[player] = Playtime()
     return playtimes
 
 
+def _playtime_state(pt):
+    return (pt.on, len(pt.times)) if pt is not None else (False, 0)
+
+
+def _period_start_clock(period):
+    return "PT12M00.00S" if (period or 0) <= 4 else "PT05M00.00S"
+
+
 def update_playtime_for_name(player_name, action, playtimes):
-    if not player_name or player_name not in playtimes:
+    pt = playtimes.get(player_name) if player_name else None
+    if pt is None:
         return playtimes
-    if playtimes[player_name]["on"] is False:
-        playtimes[player_name]["on"] = True
-        playtimes[player_name]["times"].append(
-            {"start": "PT12M00.00S", "period": action.get("period"), "end": action.get("clock")}
-        )
-    else:
-        t = playtimes[player_name]["times"]
-        if t:
-            t[-1]["end"] = action.get("clock")
+    if pt.on is False:
+        pt.on = True
+        pt.times.append(Segment(action.get("period"), "PT12M00.00S", action.get("clock")))
+    elif pt.times:
+        pt.times[-1].end = action.get("clock")
     return playtimes
 
 
 def update_playtimes_with_action(action, playtimes):
-    player_name = fix_player_name(action)
+    return _update_playtimes(action, playtimes, fix_player_name(action), _UNSET)
+
+
+def _substitution_desc_name(desc):
+    name = desc[desc.find(":") + 2 :]
+    if name == "Yang":
+        name = "Hansen"
+    return name
+
+
+def _update_playtimes(action, playtimes, player_name, assist_name, sub_name=_UNSET):
     action_type = action.get("actionType")
 
     if action_type == "Substitution":
-        desc = action.get("description") or ""
-        start_name = desc.find("SUB:") + 5
-        end_name = desc.find("FOR") - 1
-        name = desc[start_name:end_name]
-        name = _normalize_special_cases(name, action.get("teamTricode"))
+        name = _substitution_incoming_name(action) if sub_name is _UNSET else sub_name
 
         if name not in playtimes:
-            playtimes[name] = {"times": [], "on": False}
-            print("PROBLEM: Player Name Not Found", name)
+            playtimes[name] = Playtime()
 
-        playtimes[name]["times"].append({"start": action.get("clock"), "period": action.get("period")})
-        playtimes[name]["on"] = True
+        incoming = playtimes[name]
+        incoming.times.append(Segment(action.get("period"), action.get("clock")))
+        incoming.on = True
 
         if player_name and player_name in playtimes:
-            t = playtimes[player_name]["times"]
-            if playtimes[player_name]["on"] is False:
-                if (action.get("period") or 0) <= 4:
-                    t.append({"start": "PT12M00.00S", "period": action.get("period")})
-                else:
-                    t.append({"start": "PT05M00.00S", "period": action.get("period")})
+            outgoing = playtimes[player_name]
+            t = outgoing.times
+            if outgoing.on is False:
+                t.append(Segment(action.get("period"), _period_start_clock(action.get("period"))))
 
-            t[-1]["end"] = action.get("clock")
-            playtimes[player_name]["on"] = False
+            t[-1].end = action.get("clock")
+            outgoing.on = False
 
     elif action_type == "substitution":
         desc = action.get("description") or ""
-        name = desc[desc.find(":") + 2 :]
-        if name == "Yang":
-            name = "Hansen"
+        name = _substitution_desc_name(desc) if sub_name is _UNSET else sub_name
 
         if name not in playtimes:
-            playtimes[name] = {"times": [], "on": False}
-            print("PROBLEM: Player Name Not Found", name)
+            playtimes[name] = Playtime()
 
-        t = playtimes[name]["times"]
+        pt = playtimes[name]
+        t = pt.times
         if "out:" in desc:
-            if playtimes[name]["on"] is False:
-                if (action.get("period") or 0) <= 4:
-                    t.append({"start": "PT12M00.00S", "period": action.get("period")})
-                else:
-                    t.append({"start": "PT05M00.00S", "period": action.get("period")})
+            if pt.on is False:
+                t.append(Segment(action.get("period"), _period_start_clock(action.get("period"))))
             if t:
-                t[-1]["end"] = action.get("clock")
-            playtimes[name]["on"] = False
+                t[-1].end = action.get("clock")
+            pt.on = False
         elif "in:" in desc:
-            playtimes[name]["times"].append({"start": action.get("clock"), "period": action.get("period")})
-            playtimes[name]["on"] = True
+            t.append(Segment(action.get("period"), action.get("clock")))
+            pt.on = True
 
     else:
         playtimes = update_playtime_for_name(player_name, action, playtimes)
         if action_type not in ("Assist", "assist"):
-            assist_name = parse_assist_name(action)
+            if assist_name is _UNSET:
+                assist_name = parse_assist_name(action)
             if assist_name and assist_name != player_name:
                 playtimes = update_playtime_for_name(assist_name, action, playtimes)
 
@@ -480,47 +569,89 @@ def update_playtimes_with_action(action, playtimes):
 
 
 def quarter_change(playtimes):
-    for player in (playtimes or {}).keys():
-        if playtimes[player].get("on") is True and playtimes[player].get("times"):
-            t = playtimes[player]["times"]
-            t[-1]["end"] = "PT00M00.00S"
-            playtimes[player]["on"] = False
+    for pt in (playtimes or {}).values():
+        if pt.on is True and pt.times:
+            pt.times[-1].end = "PT00M00.00S"
+            pt.on = False
     return playtimes
 
 
 def end_playtimes(playtimes, last_action):
     for player in list((playtimes or {}).keys()):
-        if playtimes[player].get("on") is True and playtimes[player].get("times"):
-            t = playtimes[player]["times"]
-            t[-1]["end"] = (last_action or {}).get("clock")
-        playtimes[player] = playtimes[player].get("times", [])
+        pt = playtimes[player]
+        if pt.on is True and pt.times:
+            pt.times[-1].end = (last_action or {}).get("clock")
+        playtimes[player] = pt.times
     return playtimes
 
 
+# Wider than any period clock in centiseconds, so period * span - clock orders
+# like the (period, -clock) tuple.
+_PERIOD_SPAN = 10**8
+
+
+def _event_sort_key(a):
+    period = a.get("period") or a.get("quarter") or 0
+    try:
+        period = int(period)
+    except Exception:
+        period = 0
+    clock = a.get("clock") or a.get("time")
+    return period * _PERIOD_SPAN - clock_centiseconds(clock)
+
+
 def sort_actions(actions):
-    def sort_key(a):
-        period = a.get("period") or a.get("quarter") or 0
-        try:
-            period = int(period)
-        except Exception:
-            period = 0
-        clock = a.get("clock") or a.get("time")
-        return (period, -time_to_seconds(clock))
+    return sorted(list(actions or []), key=_event_sort_key)
 
-    return sorted(list(actions or []), key=sort_key)
+
+def _sorted_runs(runs):
+    """
+    Materialized counterpart of iter_merged_events. The runs are concatenated
+    and sorted on their precomputed keys; each run is already in order, so
+    this is a run merge for the sort and costs no key calls.
+    """
+    keys = []
+    events = []
+    for run_keys, run in runs:
+        keys.extend(run_keys)
+        events.extend(run)
+    order = sorted(range(len(events)), key=keys.__getitem__)
+    return [events[i] for i in order]
 
 
-def _trim_action(action):
-    if not isinstance(action, dict):
+def iter_merged_events(runs):
+    """
+    Yields the actions of several (keys, actions) runs in sort_actions order
+    with a k-way heap merge, without building the combined list. Keys come
+    from _event_sort_key. A run that is out of order is sorted on its own
+    first; ties go to the earlier run, as in a stable sort of the
+    concatenation.
+    """
+    iterables = []
+    for keys, run in runs:
+        if any(keys[i] > keys[i + 1] for i in range(len(keys) - 1)):
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            iterables.append([(keys[i], run[i]) for i in order])
+        else:
+            iterables.append(zip(keys, run))
+    for _, action in heapq.merge(*iterables, key=itemgetter(0)):
+        yield action
+
+
+def _trim_action(action, assist_name=_UNSET):
+    if not isinstance(action, (dict, AssistAction)):
         return None
-    action_type = _clean_phrase(action.get("actionType"))
+    if assist_name is _UNSET:
+        assist_name = parse_assist_name(action)
+    action_type = _clean_term(action.get("actionType"))
     desc = _clean_phrase(action.get("description"))
-    result = _shot_result(action, action_type, desc) if _is_shot_action(action_type, desc) else None
+    is_shot = _is_shot_action(action_type, desc)
+    result = _shot_result(action, action_type, desc) if is_shot else None
     payload = {
         "quarter": action.get("period"),
         "time": _trim_clock(action.get("clock")),
         "type": action.get("actionType"),
-        "text": _format_action_text(action),
+        "text": _format_clean_action_text(action, action_type, desc, is_shot, result, assist_name),
         "detail": action.get("subType"),
         "seq": action.get("actionNumber"),
         "awayScore": action.get("scoreAway"),
@@ -531,6 +662,69 @@ def _trim_action(action):
     return payload
 
 
+# Every action field _trim_action reads (teamTricode via the assist name); with the
+# assist name passed in, equal keys produce equal compact actions.
+_ACTION_TEXT_FIELDS = (
+    "actionNumber",
+    "actionType",
+    "subType",
+    "description",
+    "shotResult",
+    "shotDistance",
+    "playerName",
+    "playerNameI",
+    "teamTricode",
+    "period",
+    "clock",
+    "scoreAway",
+    "scoreHome",
+)
+
+ACTION_TEXT_CACHE_SIZE = 2048
+
+
+class ActionTextCache:
+    """
+    Size-bounded, per-game memo of trimmed actions. Actions rarely change once
+    posted, so a replayed or re-fetched action reuses its compact dict instead
+    of running the text formatting again. Least recently used entries are
+    evicted past max_size.
+    """
+
+    def __init__(self, max_size=ACTION_TEXT_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def trim(self, action, assist_name=_UNSET):
+        if not isinstance(action, (dict, AssistAction)):
+            return None
+        try:
+            key = (assist_name, *(action.get(field) for field in _ACTION_TEXT_FIELDS))
+            compact = self._entries.get(key)
+        except TypeError:
+            return _trim_action(action, assist_name)
+
+        if compact is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return compact
+
+        self.misses += 1
+        compact = _trim_action(action, assist_name)
+        self._entries[key] = compact
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return compact
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
 def _trim_action_map(players):
     trimmed = {}
     for name, acts in (players or {}).items():
@@ -564,16 +758,7 @@ def _trim_score_timeline(score_timeline):
 def _trim_segments(segments):
     trimmed = {}
     for name, segs in (segments or {}).items():
-        normalized = []
-        for seg in segs or []:
-            normalized.append(
-                {
-                    "quarter": seg.get("period"),
-                    "start": _trim_clock(seg.get("start")),
-                    "end": _trim_clock(seg.get("end")),
-                }
-            )
-        trimmed[name] = normalized
+        trimmed[name] = [seg.to_json() for seg in segs or []]
     return trimmed
 
 
@@ -611,6 +796,54 @@ def infer_team_ids_from_actions(actions):
     return team_ids[0], team_ids[1]
 
 
+def _coerce_team_id(team_id):
+    try:
+        return int(team_id) if team_id is not None else None
+    except Exception:
+        return None
+
+
+def _count_periods(last_action):
+    num_periods = 4
+    try:
+        if last_action and (last_action.get("period") or 0) > 4:
+            num_periods = int(last_action.get("period"))
+    except Exception:
+        pass
+    return num_periods
+
+
+def _trim_last_action(last_action):
+    if not last_action:
+        return None
+    return {
+        "quarter": last_action.get("period"),
+        "time": _trim_clock(last_action.get("clock")),
+        "awayScore": last_action.get("scoreAway"),
+        "homeScore": last_action.get("scoreHome"),
+    }
+
+
+def build_playbyplay_processor(
+    *, game_id, actions, away_team_id=None, home_team_id=None, roster=None, track_edits=False
+):
+    """
+    Replays a full feed into a fresh PlayByPlayProcessor. Module-level so it
+    can be handed to an executor worker; the processor pickles back without
+    the raw feed (see PlayByPlayProcessor.__getstate__ and adopt). Pass
+    track_edits when the processor will keep polling the live feed.
+    """
+    processor = PlayByPlayProcessor(
+        game_id=game_id,
+        away_team_id=away_team_id,
+        home_team_id=home_team_id,
+        roster=roster,
+        track_edits=track_edits,
+    )
+    processor.update(actions)
+    return processor
+
+
 def process_playbyplay_payload(
     *,
     game_id,
@@ -619,88 +852,629 @@ def process_playbyplay_payload(
     home_team_id=None,
     include_actions=True,
     include_all_actions=True,
+    schema=2,
 ):
     """
     Produces a compact play-by-play payload with trimmed field names.
+    Score timeline, players, playtimes and trimmed actions are all built in a
+    single traversal of the actions (see PlayByPlayProcessor). schema=3 gives
+    the normalized v3 layout (see flow_v3).
     """
-    try:
-        away_team_id = int(away_team_id) if away_team_id is not None else None
-    except Exception:
-        away_team_id = None
-    try:
-        home_team_id = int(home_team_id) if home_team_id is not None else None
-    except Exception:
-        home_team_id = None
+    processor = build_playbyplay_processor(
+        game_id=game_id,
+        actions=actions,
+        away_team_id=away_team_id,
+        home_team_id=home_team_id,
+    )
+    return processor.payload(
+        include_actions=include_actions,
+        include_all_actions=include_all_actions,
+        schema=schema,
+    )
 
-    actions = actions or []
-    last_action = actions[-1] if actions else None
-    num_periods = 4
-    try:
-        if last_action and (last_action.get("period") or 0) > 4:
-            num_periods = int(last_action.get("period"))
-    except Exception:
-        pass
 
-    score_timeline = process_score_timeline(actions)
-    players = create_players(actions, away_team_id, home_team_id)
-    away_players = players["awayPlayers"]
-    home_players = players["homePlayers"]
+CHECKPOINT_VERSION = 3
+FEED_UPDATE_KINDS = ("append", "edited", "reordered", "rewritten")
 
-    away_playtimes = create_playtimes(away_players)
-    home_playtimes = create_playtimes(home_players)
 
-    current_q = 1
-    for a in actions:
+def action_hash(action):
+    """Content hash of one raw feed action, to spot it being edited in a later poll."""
+    return hashlib.blake2b(codec.dumps(action), digest_size=8).digest()
+
+
+def _checkpoint_first(action):
+    if not action:
+        return None
+    return [action.get("playerName"), action.get("playerNameI"), action.get("personId")]
+
+
+class PlayByPlayProcessor:
+    """
+    Incremental counterpart to process_playbyplay_payload for live polling.
+
+    Pass the full actions list on every poll; only the actions after the last
+    seen actionNumber are processed, updating players, playtimes and the score
+    timeline in place. payload() is byte-identical to the batch function for
+    the same actions. If earlier actions were edited, removed or renumbered,
+    the processor rewinds to the period of the first change and replays the
+    feed from there (see update()).
+
+    With track_edits=False (one-shot batch builds) no action hashes or
+    period snapshots are kept; any change to consumed actions then replays
+    the whole feed.
+    """
+
+    def __init__(
+        self, *, game_id, away_team_id=None, home_team_id=None, text_cache=None, roster=None, track_edits=True
+    ):
+        self.game_id = game_id
+        self.track_edits = track_edits
+        self.away_team_id = _coerce_team_id(away_team_id)
+        self.home_team_id = _coerce_team_id(home_team_id)
+        # Survives reset() so a replayed feed reuses already-formatted actions.
+        self.use_text_cache(text_cache)
+        # personId -> display name; also kept across reset().
+        self.roster = roster if roster is not None else RosterIndex()
+        self._feed_stats = {kind: 0 for kind in FEED_UPDATE_KINDS}
+        self._feed_stats.update(consumed=0, replayed=0)
+        self.last_update = None
+        self.reset()
+
+    def reset(self):
+        self._actions = []
+        self._count = 0
+        self._last_action_number = None
+        self._current_q = 1
+        self._score = []
+        self._s_away = "0"
+        self._s_home = "0"
+        # Per-action compact payloads aligned with self._actions (None until trimmed).
+        self._compacts = []
+        self._players = {"away": {}, "home": {}}
+        # _event_sort_key of each compact action, aligned with self._players.
+        self._event_keys = {"away": {}, "home": {}}
+        self._firsts = {"away": {}, "home": {}}
+        self._playtimes = {"away": {}, "home": {}}
+        self._lineups = {"away": LineupTracker(), "home": LineupTracker()}
+        # Content hash and actionNumber of each consumed action.
+        self._hashes = []
+        self._numbers = []
+        # _state() taken before the first action of each period after the first.
+        self._rewind_points = []
+
+    def checkpoint(self):
+        """
+        Compact, versioned snapshot of the processor state. Per-player compact
+        actions and the score timeline are not duplicated here; they are taken
+        back from the flow payload this processor produced (see from_checkpoint).
+        The hashes of the consumed actions are included, so a restored
+        processor still finds edits to actions consumed before the restore.
+        """
+        state = self._state()
+        state["hashes"] = b"".join(self._hashes).hex()
+        state["numbers"] = list(self._numbers)
+        return state
+
+    def _state(self):
+        players = {}
+        playtimes = {}
+        for team in ("away", "home"):
+            players[team] = {
+                name: [len(acts), _checkpoint_first(self._firsts[team].get(name))]
+                for name, acts in self._players[team].items()
+            }
+            playtimes[team] = {
+                name: [
+                    1 if pt.on else 0,
+                    [[t.period, t.start, t.end] for t in pt.times],
+                ]
+                for name, pt in self._playtimes[team].items()
+            }
+        return {
+            "v": CHECKPOINT_VERSION,
+            "gameId": self.game_id,
+            "teams": [self.away_team_id, self.home_team_id],
+            "count": self._count,
+            "lastActionNumber": self._last_action_number,
+            "period": self._current_q,
+            "score": [self._s_away, self._s_home, len(self._score)],
+            "players": players,
+            "playtimes": playtimes,
+            "roster": self.roster.to_json(),
+            "lineups": {team: self._lineups[team].to_checkpoint() for team in ("away", "home")},
+        }
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint, flow, text_cache=None):
+        """
+        Rebuilds a processor from checkpoint() output and the v2 flow payload
+        uploaded alongside it. Returns None if the two do not line up.
+        """
+        if not isinstance(checkpoint, dict) or checkpoint.get("v") != CHECKPOINT_VERSION:
+            return None
+        if not isinstance(flow, dict) or flow.get("v") != 2:
+            return None
+        try:
+            away_team_id, home_team_id = checkpoint["teams"]
+            processor = cls(
+                game_id=checkpoint.get("gameId"),
+                away_team_id=away_team_id,
+                home_team_id=home_team_id,
+                text_cache=text_cache,
+                roster=RosterIndex.from_json(checkpoint.get("roster")),
+            )
+            s_away, s_home, score_len = checkpoint["score"]
+            score = flow.get("score") or []
+            if len(score) != score_len:
+                return None
+
+            for team in ("away", "home"):
+                flow_players = (flow.get("players") or {}).get(team) or {}
+                for name, (count, first) in checkpoint["players"][team].items():
+                    acts = flow_players.get(name)
+                    if acts is None or len(acts) != count:
+                        return None
+                    processor._players[team][name] = list(acts)
+                    processor._event_keys[team][name] = [_event_sort_key(c) for c in acts]
+                    if first is not None:
+                        processor._firsts[team][name] = {
+                            "playerName": first[0],
+                            "playerNameI": first[1],
+                            "personId": first[2],
+                        }
+                for name, (on, times) in checkpoint["playtimes"][team].items():
+                    processor._playtimes[team][name] = Playtime(
+                        [Segment(period, start, end) for period, start, end in times],
+                        bool(on),
+                    )
+                processor._lineups[team] = LineupTracker.from_checkpoint(checkpoint["lineups"][team])
+
+            processor._count = int(checkpoint["count"])
+            processor._last_action_number = checkpoint.get("lastActionNumber")
+            processor._current_q = checkpoint["period"]
+            processor._score = list(score)
+            processor._s_away = s_away
+            processor._s_home = s_home
+            processor._compacts = [None] * processor._count
+            hashes = bytes.fromhex(checkpoint["hashes"])
+            processor._hashes = [hashes[i:i + 8] for i in range(0, len(hashes), 8)]
+            processor._numbers = list(checkpoint["numbers"])
+            if not len(processor._hashes) == len(processor._numbers) == processor._count:
+                return None
+        except (KeyError, TypeError, ValueError):
+            return None
+        return processor
+
+    def use_text_cache(self, text_cache):
+        self.text_cache = text_cache
+        self._trim = text_cache.trim if text_cache is not None else _trim_action
+
+    def __getstate__(self):
+        # Pickled processors (handed back from executor workers) leave the raw
+        # feed behind; adopt() (or the next update()) with the same actions
+        # restores it.
+        state = self.__dict__.copy()
+        state["_actions"] = []
+        return state
+
+    def matches(self, away_team_id, home_team_id):
+        return (
+            self.away_team_id == _coerce_team_id(away_team_id)
+            and self.home_team_id == _coerce_team_id(home_team_id)
+        )
+
+    def update(self, actions):
+        """
+        Processes actions added since the previous call. Returns the number of
+        actions consumed.
+
+        Each consumed action's content hash is kept, so an edited, removed or
+        reordered earlier action is found on the next call. The processor then
+        rewinds to the start of the period holding the first changed action
+        and replays from there instead of from the first action.
+        """
+        actions = actions or []
+        with stage("pbp.classify", items=self._count):
+            kind, start = self._classify(actions)
+        if start < self._count:
+            with stage("pbp.rewind", items=self._count - start):
+                self._rewind(start)
+        self._feed_stats[kind] += 1
+
+        new_actions = actions[self._count:]
+        track_edits = self.track_edits
+        with stage("pbp.consume", items=len(new_actions)):
+            for a in new_actions:
+                if track_edits and (a.get("period") or 1) != self._current_q:
+                    self._rewind_points.append(self._state())
+                self._consume(a)
+                self._count += 1
+                self._last_action_number = a.get("actionNumber")
+                if track_edits:
+                    self._hashes.append(action_hash(a))
+                    self._numbers.append(a.get("actionNumber"))
+        self._actions = actions
+        self._feed_stats["consumed"] += len(new_actions)
+        if kind != "append":
+            self._feed_stats["replayed"] += self._count - start
+        self.last_update = {"kind": kind, "from": start, "consumed": len(new_actions)}
+        return len(new_actions)
+
+    def adopt(self, actions):
+        """
+        Re-attaches the feed this processor already consumed, e.g. one built by
+        build_playbyplay_processor in an executor worker, which pickles back
+        without it. Unlike update(), no action is decoded or hashed.
+        """
+        actions = actions or []
+        if len(actions) != self._count:
+            raise ValueError(f"processor consumed {self._count} actions, feed has {len(actions)}")
+        self._actions = actions
+
+    def _extends(self, actions):
+        return not self._count or (
+            len(actions) >= self._count
+            and actions[self._count - 1].get("actionNumber") == self._last_action_number
+        )
+
+    def _classify(self, actions):
+        """
+        How actions relate to what was consumed: "append" (only new actions),
+        "edited" (same actionNumbers, some content changed), "reordered"
+        (actions removed, inserted or renumbered) or "rewritten" (changed,
+        in a processor that does not track edits).
+        Returns (kind, index of the first action to process again).
+        """
+        count = self._count
+        if not count:
+            return "append", 0
+        if not self.track_edits:
+            if getattr(actions, "rewritten", None) or not self._extends(actions):
+                return "rewritten", 0
+            return "append", count
+
+        hashes = self._hashes
+        limit = min(len(actions), count)
+        # Leading actions the feed's digest vouches for (see parse_playbyplay_feed)
+        # are not hashed again.
+        checked = min(getattr(actions, "unchanged", 0), limit)
+        first = next((i for i in range(checked, limit) if hashes[i] != action_hash(actions[i])), limit)
+        if first == count:
+            return "append", count
+        if len(actions) >= count and all(
+            actions[i].get("actionNumber") == self._numbers[i] for i in range(first, count)
+        ):
+            return "edited", first
+        return "reordered", first
+
+    def _rewind(self, index):
+        """
+        Restores the state from before the first action of the period holding
+        actions[index], using the snapshot taken when that period started.
+        """
+        points = self._rewind_points
+        while points and points[-1]["count"] > index:
+            points.pop()
+        if not points:
+            self.reset()
+            return
+        # Replaying from here takes this period's snapshot again.
+        cp = points.pop()
+        count = cp["count"]
+        for team in ("away", "home"):
+            kept = {name: entry[0] for name, entry in cp["players"][team].items()}
+            players = self._players[team]
+            keys = self._event_keys[team]
+            self._players[team] = {name: players[name][:n] for name, n in kept.items()}
+            self._event_keys[team] = {name: keys[name][:n] for name, n in kept.items()}
+            self._firsts[team] = {
+                name: first for name, first in self._firsts[team].items() if kept.get(name)
+            }
+            self._playtimes[team] = {
+                name: Playtime([Segment(period, start, end) for period, start, end in times], bool(on))
+                for name, (on, times) in cp["playtimes"][team].items()
+            }
+            self._lineups[team] = LineupTracker.from_checkpoint(cp["lineups"][team])
+        self._s_away, self._s_home, score_len = cp["score"]
+        del self._score[score_len:]
+        del self._compacts[count:]
+        del self._hashes[count:]
+        del self._numbers[count:]
+        self._count = count
+        self._last_action_number = cp["lastActionNumber"]
+        self._current_q = cp["period"]
+
+    def feed_stats(self):
+        """
+        Update kinds seen since the processor was created, plus the number of
+        actions consumed in total and re-consumed after a rewind.
+        """
+        return dict(self._feed_stats)
+
+    def pending(self, actions):
+        """Number of actions update(actions) would process, counting a replay."""
+        actions = actions or []
+        _, start = self._classify(actions)
+        if start < self._count:
+            points = [p["count"] for p in self._rewind_points if p["count"] <= start]
+            start = points[-1] if points else 0
+        return len(actions) - start
+
+    def _consume(self, a):
+        self._compacts.append(None)
+        prev_away, prev_home = self._s_away, self._s_home
+        self._update_score(a)
+
+        team = None
+        team_id = a.get("teamId")
+        action_type = a.get("actionType")
+        if team_id == self.away_team_id:
+            team = "away"
+        elif team_id == self.home_team_id:
+            team = "home"
+
+        # Derived per-action fields are computed once and shared by every stage.
+        player_name = assist_name = sub_name = None
+        if team is not None:
+            player_name, assist_name, sub_name = self._resolve_names(a, team_id)
+            if player_name:
+                self._add_player_action(a, team, player_name, assist_name, sub_name)
+
         period = a.get("period") or 1
-        if period != current_q:
-            away_playtimes = quarter_change(away_playtimes)
-            home_playtimes = quarter_change(home_playtimes)
-            current_q = period
-
-        if away_team_id is not None and a.get("teamId") == away_team_id:
-            away_playtimes = update_playtimes_with_action(a, away_playtimes)
-        if home_team_id is not None and a.get("teamId") == home_team_id:
-            home_playtimes = update_playtimes_with_action(a, home_playtimes)
-
-    away_playtimes = end_playtimes(away_playtimes, last_action)
-    home_playtimes = end_playtimes(home_playtimes, last_action)
-
-    trimmed_away_players = _trim_action_map(away_players)
-    trimmed_home_players = _trim_action_map(home_players)
-
-    last_payload = None
-    if last_action:
-        last_payload = {
-            "quarter": last_action.get("period"),
-            "time": _trim_clock(last_action.get("clock")),
-            "awayScore": last_action.get("scoreAway"),
-            "homeScore": last_action.get("scoreHome"),
+        if period != self._current_q:
+            quarter_change(self._playtimes["away"])
+            quarter_change(self._playtimes["home"])
+            self._current_q = period
+            self._new_lineup_period(period)
+        elif not self._lineups["away"].stints:
+            self._new_lineup_period(period)
+
+        if self._s_away != prev_away or self._s_home != prev_home:
+            away_pts = safe_int(self._s_away) - safe_int(prev_away)
+            home_pts = safe_int(self._s_home) - safe_int(prev_home)
+            self._lineups["away"].score(away_pts, home_pts)
+            self._lineups["home"].score(home_pts, away_pts)
+
+        if team is not None and team_id is not None:
+            names = []
+            for name in (player_name, assist_name, sub_name):
+                if name and name not in names:
+                    names.append(name)
+            playtimes = self._playtimes[team]
+            if action_type != "Substitution" and action_type != "substitution" and all(
+                pt is None or pt.on for pt in map(playtimes.get, names)
+            ):
+                # Players already on court only extend their open stints, so
+                # the lineup cannot change.
+                _update_playtimes(a, playtimes, player_name, assist_name, sub_name)
+                return
+            before = [_playtime_state(playtimes.get(name)) for name in names]
+            _update_playtimes(a, playtimes, player_name, assist_name, sub_name)
+            self._update_lineup(team, a, names, before)
+
+    def _new_lineup_period(self, period):
+        start = _period_start_clock(period)
+        self._lineups["away"].new_period(period, start)
+        self._lineups["home"].new_period(period, start)
+
+    def _update_lineup(self, team, a, names, before):
+        """Feeds the on/off changes _update_playtimes just made into the lineup tracker."""
+        tracker = self._lineups[team]
+        playtimes = self._playtimes[team]
+        clock = a.get("clock")
+        changed = False
+        for name, (was_on, count) in zip(names, before):
+            pt = playtimes.get(name)
+            if pt is None:
+                continue
+            if len(pt.times) > count:
+                # A stint opened at this clock is a substitution; any other
+                # new stint was inferred back to the start of the period.
+                if pt.on and pt.times[-1].start == clock:
+                    tracker.enter(name)
+                    changed = True
+                else:
+                    tracker.backfill(name)
+                if not pt.on:
+                    tracker.leave(name)
+                    changed = True
+            elif was_on and not pt.on:
+                tracker.leave(name)
+                changed = True
+        if changed:
+            tracker.settle(self._current_q, clock)
+
+    def _resolve_names(self, a, team_id):
+        """
+        Player, assist and incoming-substitute names for an action. Ids resolve
+        through the roster; the description is only parsed for players the
+        roster has not seen yet, and what it yields is learned for next time.
+        """
+        roster = self.roster
+        person_id = a.get("personId")
+        player_name = roster.name_for(person_id)
+        if player_name is None:
+            player_name = roster.learn(person_id, fix_player_name(a), team_id)
+
+        assist_id = a.get("assistPersonId")
+        assist_name = roster.name_for(assist_id)
+        if assist_name is None:
+            assist_name = roster.learn(assist_id, parse_assist_name(a), team_id)
+
+        sub_name = None
+        action_type = a.get("actionType")
+        if action_type == "Substitution":
+            # Legacy feeds only name the incoming player, by last name.
+            parsed = _substitution_incoming_name(a)
+            sub_name = roster.name_for(roster.person_for(team_id, parsed)) or parsed
+        elif action_type == "substitution":
+            sub_name = player_name or _substitution_desc_name(a.get("description") or "")
+        return player_name, assist_name, sub_name
+
+    def _update_score(self, a):
+        if (a.get("scoreAway") or "") == "":
+            return
+        if a.get("scoreAway") != self._s_away:
+            self._score.append(self._score_entry(a))
+            self._s_away = a.get("scoreAway")
+        if a.get("scoreHome") != self._s_home:
+            self._score.append(self._score_entry(a))
+            self._s_home = a.get("scoreHome")
+
+    @staticmethod
+    def _score_entry(a):
+        return {
+            "quarter": a.get("period"),
+            "time": _trim_clock(a.get("clock")),
+            "awayScore": a.get("scoreAway"),
+            "homeScore": a.get("scoreHome"),
         }
 
-    payload = {
-        "v": 2,
-        "periods": num_periods,
-        "last": last_payload,
-        "score": _trim_score_timeline(score_timeline),
-        "players": {
-            "away": trimmed_away_players,
-            "home": trimmed_home_players,
-        },
-        "segments": {
-            "away": _trim_segments(away_playtimes),
-            "home": _trim_segments(home_playtimes),
-        },
-    }
+    def _add_player_action(self, a, team, player_name, assist_name, sub_name):
+        compact = self._trim(a, assist_name)
+        self._compacts[-1] = compact
+        self._append_player(team, player_name, a, compact)
+
+        if assist_name:
+            self._ensure_player(team, assist_name)
+            first = self._firsts[team].get(assist_name) or {}
+            assist_action = _build_assist_action(a, first, assist_name)
+            self._append_player(team, assist_name, assist_action, self._trim(assist_action))
+        if a.get("actionType") == "Substitution":
+            self._ensure_player(team, sub_name)
+
+    def _ensure_player(self, team, name):
+        players = self._players[team]
+        if name not in players:
+            players[name] = []
+            self._event_keys[team][name] = []
+            playtimes = self._playtimes[team]
+            if name not in playtimes:
+                playtimes[name] = Playtime()
+        return players[name]
+
+    def _append_player(self, team, name, action, compact):
+        acts = self._ensure_player(team, name)
+        if not acts:
+            self._firsts[team][name] = action
+        acts.append(compact)
+        self._event_keys[team][name].append(_event_sort_key(compact))
+
+    def _event_runs(self):
+        for team in ("away", "home"):
+            keys = self._event_keys[team]
+            for name, acts in self._players[team].items():
+                yield keys[name], acts
+
+    def iter_events(self):
+        """Streams the payload's "events" list without materializing it."""
+        return iter_merged_events(self._event_runs())
+
+    def _segment_names(self, team):
+        players = self._players[team]
+        names = list(players)
+        names.extend(name for name in self._playtimes[team] if name not in players)
+        return names
+
+    def court_index(self, team, last_action=_UNSET):
+        """CourtIndex over a team's segments, with open stints running to the latest action."""
+        if last_action is _UNSET:
+            last_action = self._actions[self._count - 1] if self._count else None
+        return CourtIndex.from_playtimes(
+            self._segment_names(team),
+            self._playtimes[team],
+            (last_action or {}).get("clock"),
+        )
 
-    if include_all_actions:
-        all_actions = []
-        for _, acts in trimmed_away_players.items():
-            all_actions.extend(acts)
-        for _, acts in trimmed_home_players.items():
-            all_actions.extend(acts)
-        payload["events"] = sort_actions(all_actions)
+    def _segments(self, team, last_action):
+        playtimes = self._playtimes[team]
+        names = self._segment_names(team)
+
+        end_clock = _trim_clock((last_action or {}).get("clock"))
+        segments = {}
+        for name in names:
+            pt = playtimes.get(name)
+            if pt is None:
+                segments[name] = []
+                continue
+            trimmed = [seg.to_json() for seg in pt.times]
+            # The open stint runs to the latest action without closing it in the state.
+            if pt.on is True and trimmed:
+                trimmed[-1]["end"] = end_clock
+            segments[name] = trimmed
+        return segments
+
+    def _feed(self):
+        compacts = self._compacts
+        for i, compact in enumerate(compacts):
+            if compact is None:
+                action = self._actions[i]
+                compacts[i] = self._trim(action, self._feed_assist_name(action))
+        return [c for c in compacts if c is not None]
+
+    def _feed_assist_name(self, a):
+        """
+        The assist name _consume trimmed a player action with, from the
+        roster, for compacts not kept in the state (actions consumed before
+        a checkpoint restore). Other actions trim with the parsed name.
+        """
+        team_id = a.get("teamId")
+        if team_id is None or team_id not in (self.away_team_id, self.home_team_id):
+            return _UNSET
+        roster = self.roster
+        if not (roster.name_for(a.get("personId")) or fix_player_name(a)):
+            return _UNSET
+        return roster.name_for(a.get("assistPersonId")) or parse_assist_name(a)
+
+    def payload(self, *, include_actions=True, include_all_actions=True, schema=2):
+        last_action = self._actions[self._count - 1] if self._count else None
+        with stage("pbp.players", items=self._count):
+            players = {
+                "away": {name: list(acts) for name, acts in self._players["away"].items()},
+                "home": {name: list(acts) for name, acts in self._players["home"].items()},
+            }
+        with stage("pbp.segments"):
+            segments = {
+                "away": self._segments("away", last_action),
+                "home": self._segments("home", last_action),
+            }
+        with stage("pbp.lineups"):
+            lineups = {
+                "away": self._lineups["away"].to_json((last_action or {}).get("clock")),
+                "home": self._lineups["home"].to_json((last_action or {}).get("clock")),
+            }
+        with stage("pbp.court"):
+            court = {
+                "away": self.court_index("away", last_action).to_json(),
+                "home": self.court_index("home", last_action).to_json(),
+            }
+        payload = {
+            "v": 2,
+            "periods": _count_periods(last_action),
+            "last": _trim_last_action(last_action),
+            "score": list(self._score),
+            "players": players,
+            "segments": segments,
+            "lineups": lineups,
+            "court": court,
+        }
 
-    if include_actions:
-        payload["feed"] = _trim_action_list(actions)
+        if include_all_actions:
+            with stage("pbp.events", items=self._count):
+                payload["events"] = _sorted_runs(self._event_runs())
 
-    return payload
+        if include_actions:
+            with stage("pbp.feed", items=self._count):
+                payload["feed"] = self._feed()
+
+        if schema == 3:
+            people = {
+                (team, name): first
+                for team, firsts in self._firsts.items()
+                for name, first in firsts.items()
+            }
+            with stage("pbp.flow_v3", items=self._count):
+                return flow_v2_to_v3(payload, people)
+        if schema != 2:
+            raise ValueError(f"Unsupported flow schema {schema}")
+        return payload
@@ -0,0 +1,63 @@
+class RosterIndex:
+    """
+    Per-game personId -> display name index used for play-by-play attribution.
+
+    The display name is the string the flow has always been keyed by (see
+    fix_player_name), learned from the first action a player appears in, so
+    later actions, assists (assistPersonId) and substitutions resolve with a
+    dict lookup instead of parsing the description again. Boxscore rosters
+    add family names per team, which lets legacy "SUB: X FOR Y" descriptions
+    that only carry a last name resolve to a personId.
+    """
+
+    def __init__(self):
+        self._names = {}  # personId -> display name
+        self._teams = {}  # personId -> teamId the name was learned under
+        self._people = {}  # (teamId, name) -> personId
+
+    def __len__(self):
+        return len(self._names)
+
+    def name_for(self, person_id):
+        return self._names.get(person_id) if person_id else None
+
+    def person_for(self, team_id, name):
+        return self._people.get((team_id, name)) if name else None
+
+    def learn(self, person_id, name, team_id=None):
+        """Records the display name for person_id unless one is already known."""
+        if not person_id or not name:
+            return name
+        known = self._names.get(person_id)
+        if known is None:
+            known = self._names[person_id] = name
+            self._teams[person_id] = team_id
+            if team_id:
+                self._people.setdefault((team_id, name), person_id)
+        return known
+
+    def add_boxscore(self, box_game):
+        """Indexes family names from the boxscore players arrays."""
+        if not isinstance(box_game, dict):
+            return self
+        for side in ("awayTeam", "homeTeam"):
+            team = box_game.get(side) or {}
+            team_id = team.get("teamId")
+            for player in team.get("players") or []:
+                if not isinstance(player, dict):
+                    continue
+                person_id = player.get("personId")
+                family_name = (player.get("familyName") or "").strip()
+                if person_id and family_name and team_id:
+                    self._people.setdefault((team_id, family_name), person_id)
+        return self
+
+    def to_json(self):
+        return [[person_id, name, self._teams.get(person_id)] for person_id, name in self._names.items()]
+
+    @classmethod
+    def from_json(cls, entries):
+        roster = cls()
+        for person_id, name, team_id in entries or []:
+            roster.learn(person_id, name, team_id)
+        return roster
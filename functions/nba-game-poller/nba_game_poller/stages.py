@@ -0,0 +1,100 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Opt-in stage timing. Code marks a stage with
+#
+#     with stage("pbp.consume", items=len(new_actions)):
+#         ...
+#
+# which costs one ContextVar lookup when no StageTimer is active. Items only
+# known inside the block are added with stage.count(n); the inactive stage is
+# a shared singleton, so it ignores count() and rejects attribute writes. The timer
+# is per context, so threads started by an executor do not report into the
+# poll that started them.
+
+_ACTIVE = ContextVar("stage_timer", default=None)
+
+
+class StageTimer:
+    """Wall time, number of calls and items (actions, bytes) per named stage."""
+
+    def __init__(self):
+        self.stages = {}
+
+    def add(self, name, seconds, items=0):
+        entry = self.stages.get(name)
+        if entry is None:
+            entry = self.stages[name] = [0.0, 0, 0]
+        entry[0] += seconds
+        entry[1] += 1
+        entry[2] += items
+
+    def merge(self, other):
+        """Adds another timer's totals, e.g. one game's into the invocation's."""
+        for name, (seconds, calls, items) in other.stages.items():
+            entry = self.stages.setdefault(name, [0.0, 0, 0])
+            entry[0] += seconds
+            entry[1] += calls
+            entry[2] += items
+
+    def to_json(self):
+        return {
+            name: {"ms": round(seconds * 1000, 3), "calls": calls, "items": items}
+            for name, (seconds, calls, items) in self.stages.items()
+        }
+
+
+class _Stage:
+    __slots__ = ("timer", "name", "items", "_start")
+
+    def __init__(self, timer, name, items):
+        self.timer = timer
+        self.name = name
+        self.items = items
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def count(self, items):
+        self.items += items
+
+    def __exit__(self, *exc):
+        self.timer.add(self.name, time.perf_counter() - self._start, self.items)
+        return False
+
+
+class _NullStage:
+    __slots__ = ()
+    items = 0
+
+    def __enter__(self):
+        return self
+
+    def count(self, items):
+        pass
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name, items=0):
+    """Context manager timing one stage into the active StageTimer, if any."""
+    timer = _ACTIVE.get()
+    if timer is None:
+        return _NULL_STAGE
+    return _Stage(timer, name, items)
+
+
+@contextmanager
+def stage_timing(timer):
+    """Makes timer (a StageTimer, or None to disable) active for the block."""
+    token = _ACTIVE.set(timer)
+    try:
+        yield timer
+    finally:
+        _ACTIVE.reset(token)
@@ -1,36 +1,197 @@
 import gzip
-import json
 from decimal import Decimal
 
-def upload_json_to_s3(*, s3_client, bucket, prefix, key, data, is_final=False):
-    json_str = json.dumps(data)
-    compressed = gzip.compress(json_str.encode("utf-8"))
+from nba_game_poller import codec
+from nba_game_poller.memory import track_memory
+from nba_game_poller.stages import stage
 
+_SUFFIXES = {"gzip": ".gz", None: ""}
+
+
+class CompressionPolicy:
+    """
+    How uploads of one key family are compressed: gzip at live_level while
+    the game (or day) is live and at final_level once is_final is set. A
+    level of None uploads the JSON uncompressed.
+    """
+
+    __slots__ = ("live_level", "final_level")
+
+    def __init__(self, live_level=3, final_level=9):
+        self.live_level = live_level
+        self.final_level = final_level
+
+    def __eq__(self, other):
+        return isinstance(other, CompressionPolicy) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __repr__(self):
+        return f"CompressionPolicy({self.live_level}, {self.final_level})"
+
+
+# Live gamepacks are rewritten every poll, so they use a fast level (3 costs
+# about as much CPU as 1 and is ~10% smaller on gamepacks); finals are cached
+# for a week and are compressed once at the highest level. The manifest stays
+# uncompressed, as it always was.
+DEFAULT_COMPRESSION_POLICIES = {
+    "gamepack": CompressionPolicy(live_level=3, final_level=9),
+    "schedule": CompressionPolicy(live_level=3, final_level=9),
+    "manifest": CompressionPolicy(live_level=None, final_level=None),
+}
+
+
+def _parse_level(value, low, high):
+    if value in ("", "none"):
+        return None
+    level = int(value)
+    if not low <= level <= high:
+        raise ValueError(f"level {level} outside {low}-{high}")
+    return level
+
+
+def parse_compression_policies(spec, defaults=None):
+    """
+    Policies per key family from a spec such as
+    "gamepack=3:9,schedule=6:9,manifest=none": live gzip level and final
+    gzip level, "none" meaning uncompressed. Families left out keep their
+    defaults.
+    """
+    policies = dict(DEFAULT_COMPRESSION_POLICIES if defaults is None else defaults)
+    for item in (spec or "").split(","):
+        item = item.strip().lower()
+        if not item:
+            continue
+        try:
+            family, _, levels = item.partition("=")
+            parts = levels.split(":")
+            if family not in policies or not 1 <= len(parts) <= 2:
+                raise ValueError("expected family=live[:final]")
+            live = _parse_level(parts[0], 0, 9)
+            final = _parse_level(parts[1], 0, 9) if len(parts) > 1 else live
+        except ValueError as e:
+            print(f"Ignoring compression policy {item!r}: {e}")
+            continue
+        policies[family] = CompressionPolicy(live, final)
+    return policies
+
+
+def _gzip(raw, level):
+    # mtime=0 keeps the bytes (and so the S3 ETag) stable for unchanged data.
+    return gzip.compress(raw, compresslevel=level, mtime=0)
+
+
+def compress_body(raw, policy, final=False):
+    """
+    Encoded body of raw JSON bytes under policy, as (content encoding, body):
+    ("gzip", ...) or (None, raw) when the level is None.
+    """
+    level = policy.final_level if final else policy.live_level
+    return (None, raw) if level is None else ("gzip", _gzip(raw, level))
+
+
+def upload_json_to_s3(
+    *,
+    s3_client,
+    bucket,
+    prefix,
+    key,
+    data,
+    is_final=False,
+    binary_encoder=None,
+    policy=None,
+    compress_final=None,
+):
+    """
+    Uploads data as JSON under {prefix}{key}.gz, compressed by policy
+    (DEFAULT_COMPRESSION_POLICIES["gamepack"] if not given). compress_final
+    overrides is_final for
+    the compression only (immutable but small objects such as deltas).
+    With binary_encoder (e.g. gamepack_binary.encode_gamepack), the binary
+    encoding is uploaded next to it, with ".json" in the key replaced by ".bin".
+    """
+    policy = policy or DEFAULT_COMPRESSION_POLICIES["gamepack"]
+    final = is_final if compress_final is None else compress_final
+    with stage("serialize") as timed, track_memory("serialize"):
+        raw = codec.dumps(data)
+        timed.count(len(raw))
+    with stage("compress", items=len(raw)):
+        encoding, body = compress_body(raw, policy, final)
+    upload_compressed_json_to_s3(
+        s3_client=s3_client,
+        bucket=bucket,
+        prefix=prefix,
+        key=key,
+        body=body,
+        is_final=is_final,
+        content_encoding=encoding,
+    )
+    if binary_encoder is not None:
+        try:
+            with stage("serialize.binary"):
+                binary = binary_encoder(data)
+        except ValueError as e:
+            print(f"Skipping binary upload for {key}: {e}")
+            return
+        level = policy.final_level if final else policy.live_level
+        upload_compressed_json_to_s3(
+            s3_client=s3_client,
+            bucket=bucket,
+            prefix=prefix,
+            key=f"{key[:-5] if key.endswith('.json') else key}.bin",
+            body=_gzip(binary, 9 if level is None else level),
+            is_final=is_final,
+            content_type="application/octet-stream",
+        )
+
+
+def upload_compressed_json_to_s3(
+    *,
+    s3_client,
+    bucket,
+    prefix,
+    key,
+    body,
+    is_final=False,
+    content_type="application/json",
+    content_encoding="gzip",
+):
+    """
+    Uploads JSON that was already serialized and compressed (e.g. by a batch
+    worker) under {prefix}{key}, plus ".gz" when it is gzipped.
+    """
     cache_control = (
         "public, max-age=604800"
         if is_final
         else "s-maxage=0, max-age=0, must-revalidate"
     )
-    full_key = f"{prefix}{key}.gz"
-
-    s3_client.put_object(
-        Bucket=bucket,
-        Key=full_key,
-        Body=compressed,
-        ContentType="application/json",
-        ContentEncoding="gzip",
-        CacheControl=cache_control,
-    )
-    print(f"Uploaded S3: {full_key}")
+    full_key = f"{prefix}{key}{_SUFFIXES[content_encoding]}"
+
+    extra = {"ContentEncoding": content_encoding} if content_encoding else {}
+    with stage("upload", items=len(body)):
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=full_key,
+            Body=body,
+            ContentType=content_type,
+            CacheControl=cache_control,
+            **extra,
+        )
+    print(f"Uploaded S3: {full_key} ({len(body)} bytes)")
 
 
-def update_manifest(*, s3_client, bucket, manifest_key, game_id):
-    """Loads manifest.json from S3, adds the game key, uploads it back."""
+def update_manifest(*, s3_client, bucket, manifest_key, game_id, policy=None):
+    """
+    Loads manifest.json from S3, adds the game key, uploads it back
+    (uncompressed unless policy says otherwise).
+    """
     try:
         try:
             resp = s3_client.get_object(Bucket=bucket, Key=manifest_key)
-            content = resp["Body"].read().decode("utf-8")
-            manifest = set(json.loads(content))
+            body = resp["Body"].read()
+            if body[:2] == b"\x1f\x8b":
+                body = gzip.decompress(body)
+            manifest = set(codec.loads(body))
         except Exception:
             manifest = set()
 
@@ -38,17 +199,21 @@ def update_manifest(*, s3_client, bucket, manifest_key, game_id):
             return
 
         manifest.add(game_id)
+        policy = policy or DEFAULT_COMPRESSION_POLICIES["manifest"]
+        encoding, body = compress_body(codec.dumps(list(manifest)), policy)
+        extra = {"ContentEncoding": encoding} if encoding else {}
         s3_client.put_object(
             Bucket=bucket,
             Key=manifest_key,
-            Body=json.dumps(list(manifest)),
+            Body=body,
             ContentType="application/json",
+            **extra,
         )
         print(f"Manifest updated with {game_id}")
     except Exception as e:
         print(f"Manifest Error: {e}")
 
-def upload_schedule_s3(*, s3_client, bucket, games_list, date_str, prefix="schedule/"):
+def upload_schedule_s3(*, s3_client, bucket, games_list, date_str, prefix="schedule/", policy=None):
     """
     Cleans, sorts, and uploads the daily schedule to S3.
     """
@@ -71,6 +236,7 @@ def upload_schedule_s3(*, s3_client, bucket, games_list, date_str, prefix="sched
         key=f"{date_str}.json",
         data=cleaned_games,
         is_final=False,  # Forces volatile cache headers
+        policy=policy or DEFAULT_COMPRESSION_POLICIES["schedule"],
     )
 
 def convert_decimals(obj):
@@ -0,0 +1,622 @@
+import random
+from datetime import date
+
+# Seeded synthetic games in the shape of the NBA CDN liveData feeds, for load
+# and scaling tests: double overtimes, full nights and substitution-heavy
+# games we have no recordings of. Play-by-play follows the current CDN
+# vocabulary ("2pt", "freethrow", "SUB out: ...") and the boxscore is
+# rebuilt from the actions, so scores, minutes and stat lines always agree
+# with the feed they came with.
+#
+#     game = SyntheticGame("0022500001", 1610612740, 1610612759, seed=7, overtimes=2)
+#     for elapsed, play, box in game.snapshots(interval=60):
+#         ...
+#
+# Team rosters depend only on (seed, teamId), so a team is the same players
+# in every game generated with the same seed.
+
+TEAMS = {
+    1610612737: ("ATL", "Atlanta", "Hawks"),
+    1610612738: ("BOS", "Boston", "Celtics"),
+    1610612739: ("CLE", "Cleveland", "Cavaliers"),
+    1610612740: ("NOP", "New Orleans", "Pelicans"),
+    1610612741: ("CHI", "Chicago", "Bulls"),
+    1610612742: ("DAL", "Dallas", "Mavericks"),
+    1610612743: ("DEN", "Denver", "Nuggets"),
+    1610612744: ("GSW", "Golden State", "Warriors"),
+    1610612745: ("HOU", "Houston", "Rockets"),
+    1610612746: ("LAC", "LA", "Clippers"),
+    1610612747: ("LAL", "Los Angeles", "Lakers"),
+    1610612748: ("MIA", "Miami", "Heat"),
+    1610612749: ("MIL", "Milwaukee", "Bucks"),
+    1610612750: ("MIN", "Minnesota", "Timberwolves"),
+    1610612751: ("BKN", "Brooklyn", "Nets"),
+    1610612752: ("NYK", "New York", "Knicks"),
+    1610612753: ("ORL", "Orlando", "Magic"),
+    1610612754: ("IND", "Indiana", "Pacers"),
+    1610612755: ("PHI", "Philadelphia", "76ers"),
+    1610612756: ("PHX", "Phoenix", "Suns"),
+    1610612757: ("POR", "Portland", "Trail Blazers"),
+    1610612758: ("SAC", "Sacramento", "Kings"),
+    1610612759: ("SAS", "San Antonio", "Spurs"),
+    1610612760: ("OKC", "Oklahoma City", "Thunder"),
+    1610612761: ("TOR", "Toronto", "Raptors"),
+    1610612762: ("UTA", "Utah", "Jazz"),
+    1610612763: ("MEM", "Memphis", "Grizzlies"),
+    1610612764: ("WAS", "Washington", "Wizards"),
+    1610612765: ("DET", "Detroit", "Pistons"),
+    1610612766: ("CHA", "Charlotte", "Hornets"),
+}
+
+ROSTER_SIZE = 13
+REGULATION_PERIODS = 4
+
+_FIRST_NAMES = (
+    "Aaron", "Bruno", "Caleb", "Dario", "Elias", "Felix", "Goran", "Hugo", "Isaac", "Jalen",
+    "Kofi", "Luka", "Malik", "Nikola", "Omar", "Pascal", "Quinn", "Rudy", "Soren", "Tariq",
+    "Umar", "Victor", "Wendell", "Xavier", "Yusuf", "Zion",
+)
+# Family names are built from these so they never contain feed words ("Shot",
+# "Ball", "Free") that fix_player_name could find first in a description.
+_SYLLABLES = (
+    "ka", "ro", "vin", "del", "mar", "tu", "bel", "son", "ar", "qui", "los", "ne",
+    "dra", "ve", "zo", "hal", "mun", "tor", "ri", "ga", "len", "ost", "wy", "pe",
+)
+_SHOTS_2PT = (("Layup", 1), ("Driving Layup", 2), ("Dunk", 1), ("Jump Shot", 14), ("Floating Jump Shot", 8))
+_SHOTS_3PT = (("Jump Shot", 25), ("Pullup Jump Shot", 26), ("Step Back Jump Shot", 27))
+_ORDINALS = {1: "1st", 2: "2nd", 3: "3rd", 4: "4th"}
+
+
+def period_length(period):
+    """Seconds in a period: 12 minutes, or 5 for an overtime."""
+    return 720 if period <= REGULATION_PERIODS else 300
+
+
+def game_seconds(period, clock_cs):
+    """Seconds played at clock_cs (centiseconds left) in period."""
+    played = sum(period_length(p) for p in range(1, period))
+    return played + period_length(period) - clock_cs / 100
+
+
+def format_clock(clock_cs):
+    minutes, rest = divmod(int(clock_cs), 6000)
+    return f"PT{minutes:02d}M{rest // 100:02d}.{rest % 100:02d}S"
+
+
+def _period_name(period):
+    if period <= REGULATION_PERIODS:
+        return f"{_ORDINALS[period]} Period"
+    overtime = period - REGULATION_PERIODS
+    return f"{_ORDINALS.get(overtime, f'{overtime}th')} Overtime"
+
+
+def _status_period(period):
+    return f"Q{period}" if period <= REGULATION_PERIODS else f"OT{period - REGULATION_PERIODS}"
+
+
+def _family_name(rng, taken):
+    while True:
+        name = "".join(rng.choice(_SYLLABLES) for _ in range(rng.choice((2, 2, 3)))).capitalize()
+        if all(name not in other and other not in name for other in taken):
+            return name
+
+
+def team_roster(team_id, seed=0):
+    """ROSTER_SIZE players for a team, starters first, the same for every game with this seed."""
+    rng = random.Random(f"{seed}:{team_id}")
+    base = 1700000 + (int(team_id) % 1000) * 100
+    taken = []
+    players = []
+    for n in range(ROSTER_SIZE):
+        family = _family_name(rng, taken)
+        taken.append(family)
+        first = rng.choice(_FIRST_NAMES)
+        players.append({
+            "personId": base + n,
+            "firstName": first,
+            "familyName": family,
+            "nameI": f"{first[0]}. {family}",
+            "jerseyNum": str(rng.randint(0, 99)),
+            # Share of the team's shots while on court.
+            "usage": round(rng.uniform(0.5, 1.5) * (1.4 if n < 5 else 1.0), 3),
+        })
+    return players
+
+
+class SyntheticGame:
+    """
+    One generated game. actions holds the full play-by-play in feed order;
+    play_payload(n) and box_payload(n) are the CDN payloads after the first n
+    actions. overtimes forces that many overtime periods; sub_rate scales how
+    often (and how many) players are substituted at dead balls.
+    """
+
+    def __init__(
+        self,
+        game_id,
+        away_team_id,
+        home_team_id,
+        seed=0,
+        overtimes=0,
+        sub_rate=1.0,
+        start_time="2025-10-21T19:00:00Z",
+    ):
+        self.game_id = str(game_id)
+        self.seed = seed
+        self.overtimes = overtimes
+        self.sub_rate = sub_rate
+        self.start_time = start_time
+        self.team_ids = {"away": int(away_team_id), "home": int(home_team_id)}
+        self.rosters = {side: team_roster(team_id, seed) for side, team_id in self.team_ids.items()}
+        self.starters = {side: [p["personId"] for p in roster[:5]] for side, roster in self.rosters.items()}
+        self.actions = []
+        self._generate()
+
+    @property
+    def periods(self):
+        return REGULATION_PERIODS + self.overtimes
+
+    # --- generation ---
+
+    def _generate(self):
+        self._rng = random.Random(f"{self.seed}:{self.game_id}")
+        self._score = {"away": 0, "home": 0}
+        self._court = {side: list(ids) for side, ids in self.starters.items()}
+        self._people = {p["personId"]: (side, p) for side, roster in self.rosters.items() for p in roster}
+        self._counts = {}
+
+        offense = None
+        for period in range(1, self.periods + 1):
+            self._period = period
+            self._clock = period_length(period) * 100
+            self._emit(None, None, "period", "start", f"Start of {_period_name(period)}")
+            if period == 1:
+                offense = self._jumpball()
+            else:
+                self._substitutions()
+                offense = ("away", "home")[period % 2]
+            must_tie = REGULATION_PERIODS <= period < self.periods
+            while self._clock > 0:
+                offense = self._possession(offense, must_tie, period == self.periods)
+            while must_tie and self._score["away"] != self._score["home"]:
+                # Closing ran out of clock; the trailing team gets buzzer free throws.
+                trailing = min(self._score, key=self._score.get)
+                points = min(abs(self._score["away"] - self._score["home"]), 3)
+                self._free_throws(trailing, self._pick(trailing), points, points)
+            self._emit(None, None, "period", "end", f"End of {_period_name(period)}")
+        self._emit(None, None, "game", "end", "Game End")
+        del self._rng, self._court, self._people, self._counts
+
+    def _count(self, person_id, key, amount=1):
+        counts = self._counts.setdefault(person_id, {})
+        counts[key] = counts.get(key, 0) + amount
+        return counts[key]
+
+    def _emit(self, side, person_id, action_type, sub_type, description, **extra):
+        action = {
+            "actionNumber": len(self.actions) + 1,
+            "orderNumber": (len(self.actions) + 1) * 10000,
+            "clock": format_clock(self._clock),
+            "period": self._period,
+            "periodType": "REGULAR" if self._period <= REGULATION_PERIODS else "OVERTIME",
+            "actionType": action_type,
+            "subType": sub_type,
+            "description": description,
+            "personId": 0,
+            "scoreHome": str(self._score["home"]),
+            "scoreAway": str(self._score["away"]),
+            "isFieldGoal": 0,
+        }
+        if side is not None:
+            action["teamId"] = self.team_ids[side]
+            action["teamTricode"] = TEAMS[self.team_ids[side]][0]
+        if person_id:
+            player = self._people[person_id][1]
+            action["personId"] = person_id
+            action["playerName"] = player["familyName"]
+            action["playerNameI"] = player["nameI"]
+        action.update(extra)
+        self.actions.append(action)
+        return action
+
+    def _name(self, person_id):
+        return self._people[person_id][1]["nameI"]
+
+    def _pick(self, side, exclude=None):
+        court = [p for p in self._court[side] if p != exclude]
+        weights = [self._people[p][1]["usage"] for p in court]
+        return self._rng.choices(court, weights=weights)[0]
+
+    def _run_clock(self, low, high):
+        """Takes low..high seconds off the clock; tenths under a minute, as the feed does."""
+        spend = int(self._rng.uniform(low, high) * 100)
+        clock = max(self._clock - spend, 0)
+        self._clock = clock - clock % (10 if clock < 6000 else 100)
+
+    def _jumpball(self):
+        away, home = self._court["away"][4], self._court["home"][4]
+        winner = self._rng.choice(("away", "home"))
+        jumper = away if winner == "away" else home
+        tip_to = self._pick(winner, exclude=jumper)
+        self._emit(
+            winner, jumper, "jumpball", "recovered",
+            f"Jump Ball {self._name(away)} vs. {self._name(home)}: Tip to {self._name(tip_to)}",
+        )
+        return winner
+
+    def _substitutions(self):
+        rng = self._rng
+        for side in ("away", "home"):
+            if rng.random() >= min(0.35 * self.sub_rate, 1.0):
+                continue
+            bench = [p["personId"] for p in self.rosters[side] if p["personId"] not in self._court[side]]
+            count = rng.randint(1, min(5, 1 + int(self.sub_rate)))
+            for out_id, in_id in zip(rng.sample(self._court[side], count), rng.sample(bench, count)):
+                self._court[side][self._court[side].index(out_id)] = in_id
+                self._emit(side, out_id, "substitution", "out", f"SUB out: {self._name(out_id)}")
+                self._emit(side, in_id, "substitution", "in", f"SUB in: {self._name(in_id)}")
+
+    def _rebound(self, shooting_side):
+        defense = "home" if shooting_side == "away" else "away"
+        side = shooting_side if self._rng.random() < 0.25 else defense
+        player = self._pick(side)
+        kind = "offensive" if side == shooting_side else "defensive"
+        self._count(player, kind)
+        counts = self._counts[player]
+        self._emit(
+            side, player, "rebound", kind,
+            f"{self._name(player)} REBOUND (Off:{counts.get('offensive', 0)} Def:{counts.get('defensive', 0)})",
+        )
+        return side
+
+    def _shot(self, side, shooter, three, made, assist=True):
+        kind, distance = self._rng.choice(_SHOTS_3PT if three else _SHOTS_2PT)
+        label = f"{distance}' {'3PT ' if three else ''}{kind}"
+        extra = {
+            "isFieldGoal": 1,
+            "shotResult": "Made" if made else "Missed",
+            "shotDistance": distance,
+        }
+        if not made:
+            self._emit(side, shooter, "3pt" if three else "2pt", kind, f"MISS {self._name(shooter)} {label}", **extra)
+            return
+        self._score[side] += 3 if three else 2
+        points = self._count(shooter, "points", 3 if three else 2)
+        description = f"{self._name(shooter)} {label} ({points} PTS)"
+        if assist and self._rng.random() < 0.6:
+            assister = self._pick(side, exclude=shooter)
+            assists = self._count(assister, "assists")
+            description += f" ({self._name(assister)} {assists} AST)"
+            extra.update(
+                assistPersonId=assister,
+                assistPlayerNameInitial=self._name(assister),
+                assistTotal=assists,
+            )
+        self._emit(side, shooter, "3pt" if three else "2pt", kind, description, **extra)
+
+    def _free_throws(self, side, shooter, attempts, makes=None):
+        """Emits a free-throw trip; makes forces how many go in, counting from the first."""
+        made_last = False
+        for n in range(1, attempts + 1):
+            made = n <= makes if makes is not None else self._rng.random() < 0.77
+            extra = {"shotResult": "Made" if made else "Missed"}
+            if made:
+                self._score[side] += 1
+                points = self._count(shooter, "points")
+                description = f"{self._name(shooter)} Free Throw {n} of {attempts} ({points} PTS)"
+            else:
+                description = f"MISS {self._name(shooter)} Free Throw {n} of {attempts}"
+            self._emit(side, shooter, "freethrow", f"{n} of {attempts}", description, **extra)
+            made_last = made
+        return made_last
+
+    def _foul(self, defense):
+        fouler = self._pick(defense)
+        fouls = self._count(fouler, "fouls")
+        self._emit(
+            defense, fouler, "foul", "personal", f"{self._name(fouler)} shooting personal FOUL ({fouls} PF)",
+            descriptor="shooting",
+        )
+
+    def _possession(self, offense, must_tie, final):
+        rng = self._rng
+        defense = "home" if offense == "away" else "away"
+        lead = self._score[offense] - self._score[defense]
+        closing = must_tie and self._clock <= (abs(lead) * 8 + 30) * 100
+        if closing:
+            self._run_clock(4, 10)
+        else:
+            self._run_clock(6, 22)
+        last = self._clock == 0
+
+        if closing:
+            # Closing out a period that has to end level: the leader misses,
+            # the trailing team scores what it needs, nobody scores when tied.
+            shooter = self._pick(offense)
+            if lead >= 0:
+                self._shot(offense, shooter, rng.random() < 0.4, made=False)
+                return self._rebound(offense)
+            needed = min(-lead, 3)
+            if needed == 1:
+                self._foul(defense)
+                if not self._free_throws(offense, shooter, 2, makes=1):
+                    return self._rebound(offense)
+                return defense
+            self._shot(offense, shooter, needed == 3, made=True, assist=False)
+            return defense
+
+        if final and last and lead == 0:
+            # Nobody wins a tie in the last period.
+            self._shot(offense, self._pick(offense), False, made=True)
+            return defense
+
+        roll = rng.random()
+        if roll < 0.12:
+            player = self._pick(offense)
+            turnovers = self._count(player, "turnovers")
+            self._emit(offense, player, "turnover", "bad pass", f"{self._name(player)} bad pass TURNOVER ({turnovers} TO)")
+            if rng.random() < 0.5:
+                stealer = self._pick(defense)
+                steals = self._count(stealer, "steals")
+                self._emit(defense, stealer, "steal", "", f"{self._name(stealer)} STEAL ({steals} STL)")
+            return defense
+        if roll < 0.21:
+            self._foul(defense)
+            self._substitutions()
+            if self._free_throws(offense, self._pick(offense), 2):
+                return defense
+            return self._rebound(offense)
+        if roll < 0.25:
+            side = rng.choice((offense, defense))
+            self._emit(side, None, "timeout", "full", f"{TEAMS[self.team_ids[side]][2]} Timeout")
+            self._substitutions()
+            return offense
+
+        three = rng.random() < 0.4
+        made = rng.random() < (0.36 if three else 0.52)
+        self._shot(offense, self._pick(offense), three, made)
+        if made:
+            return defense
+        return self._rebound(offense)
+
+    # --- payloads ---
+
+    def elapsed(self, n):
+        """Game seconds played after the first n actions."""
+        if n <= 0:
+            return 0.0
+        last = self.actions[n - 1]
+        clock = last["clock"]
+        clock_cs = int(clock[2:4]) * 6000 + int(clock[5:7]) * 100 + int(clock[8:10])
+        return game_seconds(last["period"], clock_cs)
+
+    def play_payload(self, n=None):
+        actions = self.actions if n is None else self.actions[:n]
+        return {
+            "meta": {"version": 1, "code": 200},
+            "game": {"gameId": self.game_id, "actions": [dict(a) for a in actions]},
+        }
+
+    def box_payload(self, n=None):
+        n = len(self.actions) if n is None else n
+        box = _BoxState(self)
+        for action in self.actions[:n]:
+            box.apply(action)
+        return box.payload(n)
+
+    def snapshot_points(self, interval=60):
+        """
+        (elapsed, n) for each snapshot: the feeds as they stood every interval
+        game seconds, skipping intervals with no new actions, and once more at
+        the end. elapsed is in game seconds; stoppages are not modelled.
+        """
+        points = []
+        total = len(self.actions)
+        cut = interval
+        for n in range(1, total + 1):
+            if n < total and self.elapsed(n + 1) <= cut:
+                continue
+            points.append((cut if n < total else self.elapsed(n), n))
+            while n < total and cut < self.elapsed(n + 1):
+                cut += interval
+        return points
+
+    def snapshots(self, interval=60):
+        """Yields (elapsed, play, box) for each of snapshot_points(interval), in game order."""
+        box = _BoxState(self)
+        applied = 0
+        for elapsed, n in self.snapshot_points(interval):
+            while applied < n:
+                box.apply(self.actions[applied])
+                applied += 1
+            yield elapsed, self.play_payload(n), box.payload(n)
+
+
+class _BoxState:
+    """Boxscore totals rebuilt action by action from a SyntheticGame's feed."""
+
+    _STATS = (
+        "points", "fieldGoalsMade", "fieldGoalsAttempted", "threePointersMade", "threePointersAttempted",
+        "freeThrowsMade", "freeThrowsAttempted", "reboundsOffensive", "reboundsDefensive", "assists",
+        "steals", "blocks", "turnovers", "foulsPersonal", "plusMinusPoints",
+    )
+
+    def __init__(self, game):
+        self.game = game
+        self.side_of = {p["personId"]: side for side, roster in game.rosters.items() for p in roster}
+        self.stats = {person_id: dict.fromkeys(self._STATS, 0) for person_id in self.side_of}
+        self.seconds = dict.fromkeys(self.side_of, 0.0)
+        self.played = set()
+        self.on = {side: set(ids) for side, ids in game.starters.items()}
+        self.score = {"away": 0, "home": 0}
+        self.period_scores = {"away": {}, "home": {}}
+        self.elapsed = 0.0
+        self.n = 0
+
+    def apply(self, action):
+        self.n += 1
+        elapsed = self.game.elapsed(self.n)
+        if elapsed > self.elapsed:
+            for side in ("away", "home"):
+                for person_id in self.on[side]:
+                    self.seconds[person_id] += elapsed - self.elapsed
+                    self.played.add(person_id)
+            self.elapsed = elapsed
+
+        score = {"away": int(action["scoreAway"]), "home": int(action["scoreHome"])}
+        for side, other in (("away", "home"), ("home", "away")):
+            gained = score[side] - self.score[side]
+            if gained:
+                period = self.period_scores[side]
+                period[action["period"]] = period.get(action["period"], 0) + gained
+                for person_id in self.on[side]:
+                    self.stats[person_id]["plusMinusPoints"] += gained
+                for person_id in self.on[other]:
+                    self.stats[person_id]["plusMinusPoints"] -= gained
+        self.score = score
+
+        person_id = action.get("personId")
+        stats = self.stats.get(person_id)
+        if stats is None:
+            return
+        action_type = action["actionType"]
+        made = action.get("shotResult") == "Made"
+        if action_type in ("2pt", "3pt"):
+            stats["fieldGoalsAttempted"] += 1
+            if action_type == "3pt":
+                stats["threePointersAttempted"] += 1
+            if made:
+                stats["fieldGoalsMade"] += 1
+                stats["points"] += 3 if action_type == "3pt" else 2
+                if action_type == "3pt":
+                    stats["threePointersMade"] += 1
+                if action.get("assistPersonId"):
+                    self.stats[action["assistPersonId"]]["assists"] += 1
+        elif action_type == "freethrow":
+            stats["freeThrowsAttempted"] += 1
+            if made:
+                stats["freeThrowsMade"] += 1
+                stats["points"] += 1
+        elif action_type == "rebound":
+            stats["reboundsOffensive" if action["subType"] == "offensive" else "reboundsDefensive"] += 1
+        elif action_type == "steal":
+            stats["steals"] += 1
+        elif action_type == "turnover":
+            stats["turnovers"] += 1
+        elif action_type == "foul":
+            stats["foulsPersonal"] += 1
+        elif action_type == "substitution":
+            side = self.side_of[person_id]
+            if action["subType"] == "out":
+                self.on[side].discard(person_id)
+            else:
+                self.on[side].add(person_id)
+
+    def _team(self, side):
+        team_id = self.game.team_ids[side]
+        tricode, city, name = TEAMS[team_id]
+        players = []
+        for order, player in enumerate(self.game.rosters[side], start=1):
+            person_id = player["personId"]
+            stats = dict(self.stats[person_id])
+            stats["reboundsTotal"] = stats["reboundsOffensive"] + stats["reboundsDefensive"]
+            minutes, seconds = divmod(round(self.seconds[person_id] * 100), 6000)
+            stats["minutes"] = f"PT{minutes:02d}M{seconds // 100:02d}.{seconds % 100:02d}S"
+            players.append({
+                "status": "ACTIVE",
+                "order": order,
+                "personId": person_id,
+                "jerseyNum": player["jerseyNum"],
+                "starter": "1" if order <= 5 else "0",
+                "oncourt": "1" if person_id in self.on[side] else "0",
+                "played": "1" if person_id in self.played else "0",
+                "name": f"{player['firstName']} {player['familyName']}",
+                "nameI": player["nameI"],
+                "firstName": player["firstName"],
+                "familyName": player["familyName"],
+                "statistics": stats,
+            })
+        last_period = self.game.actions[self.n - 1]["period"] if self.n else 1
+        return {
+            "teamId": team_id,
+            "teamName": name,
+            "teamCity": city,
+            "teamTricode": tricode,
+            "score": self.score[side],
+            "wins": 0,
+            "losses": 0,
+            "periods": [
+                {
+                    "period": period,
+                    "periodType": "REGULAR" if period <= REGULATION_PERIODS else "OVERTIME",
+                    "score": self.period_scores[side].get(period, 0),
+                }
+                for period in range(1, max(last_period, REGULATION_PERIODS) + 1)
+            ],
+            "players": players,
+        }
+
+    def payload(self, n):
+        game = self.game
+        last = game.actions[n - 1] if n else None
+        if last is None:
+            status, status_text, period, clock = 1, "Pregame", 0, ""
+        elif last["actionType"] == "game":
+            overtimes = last["period"] - REGULATION_PERIODS
+            status, period, clock = 3, last["period"], "PT00M00.00S"
+            status_text = "Final" if overtimes <= 0 else f"Final/{'' if overtimes == 1 else overtimes}OT"
+        else:
+            status, period, clock = 2, last["period"], last["clock"]
+            if last["actionType"] == "period" and last["subType"] == "end":
+                status_text = "Half" if period == 2 else f"End {_status_period(period)}"
+            else:
+                minutes, rest = divmod(int(clock[2:4]) * 60 + int(clock[5:7]), 60)
+                status_text = f"{_status_period(period)} {minutes}:{rest:02d}"
+        return {
+            "meta": {"version": 1, "code": 200},
+            "game": {
+                "gameId": game.game_id,
+                "gameTimeUTC": game.start_time,
+                "gameEt": game.start_time,
+                "gameStatus": status,
+                "gameStatusText": status_text,
+                "period": period,
+                "gameClock": clock,
+                "awayTeam": self._team("away"),
+                "homeTeam": self._team("home"),
+            },
+        }
+
+
+def season_game_id(date_str, number):
+    """Regular-season style gameId ("0022500123") for the number-th game on date_str."""
+    day = date.fromisoformat(date_str)
+    season = day.year if day.month >= 7 else day.year - 1
+    sequence = (day - date(season, 10, 1)).days * 15 + number
+    return f"002{season % 100:02d}{sequence % 100000:05d}"
+
+
+def generate_night(date_str, count=10, seed=0, overtime_rate=0.06, sub_rate=1.0):
+    """
+    count games on date_str between distinct teams (at most 15), with
+    staggered tip-offs; each overtime happens with probability overtime_rate.
+    """
+    if not 0 < count <= len(TEAMS) // 2:
+        raise ValueError(f"count must be between 1 and {len(TEAMS) // 2}, got {count}")
+    rng = random.Random(f"{seed}:{date_str}")
+    team_ids = rng.sample(sorted(TEAMS), count * 2)
+    games = []
+    for n in range(count):
+        overtimes = 0
+        while overtimes < 4 and rng.random() < overtime_rate:
+            overtimes += 1
+        games.append(SyntheticGame(
+            season_game_id(date_str, n + 1),
+            team_ids[2 * n],
+            team_ids[2 * n + 1],
+            seed=seed,
+            overtimes=overtimes,
+            sub_rate=sub_rate,
+            start_time=f"{date_str}T{19 + n % 4:02d}:{30 * (n // 4 % 2):02d}:00Z",
+        ))
+    return games
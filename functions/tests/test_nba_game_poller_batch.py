@@ -0,0 +1,88 @@
+import gzip
+import json
+import os
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from nba_game_poller.batch import process_game_payload, process_games_batch
+from nba_game_poller.playbyplay_processing import process_playbyplay_payload
+
+
+AWAY = 1610612740
+HOME = 1610612759
+
+
+class TestProcessGamesBatch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        fixture_path = os.path.join(os.path.dirname(__file__), "fixtures/0012200039.json")
+        with open(fixture_path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        cls.actions = payload["actions"] if isinstance(payload, dict) else payload
+        cls.box = {
+            "game": {
+                "gameStatusText": "Final",
+                "awayTeam": {"teamId": AWAY, "teamTricode": "NOP", "players": []},
+                "homeTeam": {"teamId": HOME, "teamTricode": "SAS", "players": []},
+            }
+        }
+
+    def _raw(self, game_key, actions):
+        # The play feed is passed as bytes, as a worker would receive a response body.
+        return {
+            "id": game_key,
+            "nbaGameId": "0012200039",
+            "play": json.dumps({"game": {"actions": actions}}).encode("utf-8"),
+            "box": self.box,
+        }
+
+    def test_single_payload_result(self):
+        result = process_game_payload(self._raw("g1", self.actions))
+        self.assertIsNone(result["error"])
+        self.assertTrue(result["final"])
+        gamepack = json.loads(gzip.decompress(result["body"]))
+        self.assertEqual(gamepack["publicId"], "g1")
+        expected = process_playbyplay_payload(
+            game_id="0012200039",
+            actions=self.actions,
+            away_team_id=AWAY,
+            home_team_id=HOME,
+            include_actions=False,
+            include_all_actions=False,
+        )
+        self.assertEqual(gamepack["flow"], json.loads(json.dumps(expected)))
+
+    def test_incomplete_and_broken_payloads(self):
+        empty = process_game_payload({"id": "g2", "play": None, "box": self.box})
+        self.assertIsNone(empty["body"])
+        self.assertIsNone(empty["error"])
+
+        broken = process_game_payload({"id": "g3", "play": b"{not json", "box": self.box})
+        self.assertIsNone(broken["body"])
+        self.assertIn("JSONDecodeError", broken["error"])
+
+    def test_pool_matches_inline(self):
+        raws = [self._raw(f"g{i}", self.actions[: 100 + 80 * i]) for i in range(5)]
+        inline = {r["id"]: r for r in process_games_batch(iter(raws), workers=1)}
+        pooled = {r["id"]: r for r in process_games_batch(iter(raws), workers=2)}
+        self.assertEqual(sorted(pooled), sorted(inline))
+        for game_key, result in inline.items():
+            self.assertEqual(
+                gzip.decompress(pooled[game_key]["body"]),
+                gzip.decompress(result["body"]),
+            )
+
+
+    def test_shared_pool_is_reused_across_batches(self):
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            for batch in range(2):
+                raws = [self._raw(f"d{batch}g{i}", self.actions[: 100 + 80 * i]) for i in range(3)]
+                results = list(process_games_batch(iter(raws), workers=2, pool=pool))
+                self.assertEqual(sorted(r["id"] for r in results), sorted(r["id"] for r in raws))
+                self.assertTrue(all(r["body"] for r in results))
+            # Still usable: process_games_batch does not shut a caller's pool down.
+            self.assertEqual(pool.submit(sum, [1, 2]).result(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from nba_game_poller.clock import (
+    clock_centiseconds,
+    clock_seconds,
+    format_minutes,
+    format_trimmed_clock,
+    trim_clock,
+    trimmed_clock_centiseconds,
+)
+
+
+class TestClock(unittest.TestCase):
+    def test_canonical_clock(self):
+        self.assertEqual(clock_centiseconds("PT11M43.00S"), 70300)
+        self.assertEqual(clock_centiseconds("PT00M04.70S"), 470)
+        self.assertEqual(clock_seconds("PT11M43.00S"), 703.0)
+        self.assertEqual(trim_clock("PT11M43.00S"), "1143.00")
+
+    def test_other_clock_shapes(self):
+        # Trimmed, colon and short-fraction forms go through the regex path.
+        self.assertEqual(clock_centiseconds("1143.00"), 70300)
+        self.assertEqual(clock_centiseconds("11:43.50"), 70350)
+        self.assertEqual(clock_centiseconds("PT5M3S"), 30300)
+        self.assertEqual(clock_centiseconds("PT11M43.5S"), 70305)
+        self.assertEqual(trim_clock(" PT5M03.00S "), "503.00")
+
+    def test_invalid_clock(self):
+        self.assertEqual(clock_centiseconds(None), 0)
+        self.assertEqual(clock_centiseconds("garbage"), 0)
+        self.assertEqual(clock_seconds(""), 0.0)
+        self.assertIsNone(trim_clock(None))
+        self.assertEqual(trim_clock(""), "")
+
+    def test_format_minutes(self):
+        self.assertEqual(format_minutes("PT25M01.00S"), "25:01")
+        self.assertEqual(format_minutes("PT05.50S"), "00:05")
+        self.assertEqual(format_minutes("PT125M59.99S"), "125:59")
+        self.assertEqual(format_minutes("31:12"), "31:12")
+        self.assertEqual(format_minutes(None), "00:00")
+        self.assertEqual(format_minutes("bogus"), "00:00")
+
+    def test_trimmed_clock_centiseconds(self):
+        self.assertEqual(trimmed_clock_centiseconds("1143.00"), 70300)
+        self.assertEqual(format_trimmed_clock(70300), "1143.00")
+        self.assertEqual(trimmed_clock_centiseconds("0005.50"), 550)
+        # Only values that format back unchanged are converted.
+        self.assertIsNone(trimmed_clock_centiseconds("11:43.00"))
+        self.assertIsNone(trimmed_clock_centiseconds(""))
+        self.assertIsNone(trimmed_clock_centiseconds(None))
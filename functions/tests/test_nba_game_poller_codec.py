@@ -0,0 +1,62 @@
+import importlib
+import json
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+from nba_game_poller import codec
+from nba_game_poller.playbyplay_processing import process_playbyplay_payload
+
+
+def _load_codec_without_extensions():
+    # Re-imports the module as it behaves in a stdlib-only Lambda bundle.
+    with patch.dict(sys.modules, {"orjson": None, "msgspec": None}):
+        sys.modules.pop("nba_game_poller._codec_stdlib", None)
+        spec = importlib.util.spec_from_file_location("nba_game_poller._codec_stdlib", codec.__file__)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    return module
+
+
+class TestCodec(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        fixture_path = os.path.join(os.path.dirname(__file__), "fixtures/0012200039.json")
+        with open(fixture_path, "r", encoding="utf-8") as f:
+            actions = json.load(f)
+        cls.flow = process_playbyplay_payload(
+            game_id="0012200039",
+            actions=actions,
+            away_team_id=1610612740,
+            home_team_id=1610612759,
+        )
+        cls.stdlib = _load_codec_without_extensions()
+
+    def test_stdlib_fallback(self):
+        self.assertEqual(self.stdlib.BACKEND, "stdlib")
+        body = self.stdlib.dumps({"b": [1, 2.5, None], "a": "Dončić"})
+        self.assertEqual(body, '{"b":[1,2.5,null],"a":"Dončić"}'.encode("utf-8"))
+        self.assertEqual(self.stdlib.loads(body), {"b": [1, 2.5, None], "a": "Dončić"})
+
+    def test_backends_write_the_same_bytes(self):
+        samples = [
+            self.flow,
+            [{"id": "2025-01-01-nop-sas", "homescore": 101, "status": "Final", "name": "Nikola Jokić"}],
+            {"score": [], "nested": {"x": [True, False, 0.1, -3]}},
+        ]
+        for sample in samples:
+            self.assertEqual(codec.dumps(sample), self.stdlib.dumps(sample))
+            self.assertEqual(codec.dumps(sample, sort_keys=True), self.stdlib.dumps(sample, sort_keys=True))
+            self.assertEqual(codec.loads(codec.dumps(sample)), sample)
+
+    def test_edge_cases(self):
+        big = {"id": 2 ** 70}
+        self.assertEqual(codec.loads(codec.dumps(big)), big)
+        self.assertEqual(codec.dumps({1: "a"}), b'{"1":"a"}')
+        with self.assertRaises(json.JSONDecodeError):
+            codec.loads(b"{not json")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import json
+import os
+import unittest
+
+from nba_game_poller.clock import game_time_centiseconds
+from nba_game_poller.court_index import CourtIndex
+from nba_game_poller.playbyplay_processing import PlayByPlayProcessor
+
+
+def scan_on_court(segments, t):
+    """Reference linear scan over trimmed segments."""
+    names = []
+    for name, segs in segments.items():
+        for seg in segs:
+            start = game_time_centiseconds(seg["quarter"], seg["start"])
+            end = game_time_centiseconds(seg["quarter"], seg["end"])
+            if start <= t < end:
+                names.append(name)
+                break
+    return names
+
+
+class TestCourtIndex(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        fixture_path = os.path.join(os.path.dirname(__file__), "fixtures/0012200039.json")
+        with open(fixture_path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        cls.actions = payload["actions"] if isinstance(payload, dict) else payload
+
+    def _processor(self, actions):
+        processor = PlayByPlayProcessor(
+            game_id="0012200039",
+            away_team_id=1610612740,
+            home_team_id=1610612759,
+        )
+        processor.update(actions)
+        return processor
+
+    def test_on_court_at_matches_segment_scan(self):
+        for count in (180, len(self.actions)):
+            processor = self._processor(self.actions[:count])
+            flow = processor.payload(include_actions=False, include_all_actions=False)
+            for team in ("away", "home"):
+                index = CourtIndex.from_json(json.loads(json.dumps(flow["court"][team])))
+                segments = flow["segments"][team]
+                for t in range(0, 4 * 72000, 1250):
+                    self.assertEqual(
+                        sorted(index.on_court_at(t)),
+                        sorted(scan_on_court(segments, t)),
+                        f"{team} at {t} after {count} actions",
+                    )
+
+    def test_on_court_at_q3_clock(self):
+        index = self._processor(self.actions).court_index("away")
+        on_court = index.on_court_at(game_time_centiseconds(3, "PT07M32.00S"))
+        self.assertEqual(len(on_court), 5)
+        self.assertEqual(index.on_court_at(-1), [])
+
+    def test_overlap_covers_every_lineup_in_range(self):
+        index = self._processor(self.actions).court_index("home")
+        first_quarter = index.overlap(0, 72000)
+        for t in range(0, 72000, 500):
+            self.assertTrue(set(index.on_court_at(t)) <= set(first_quarter))
+        self.assertEqual(index.overlap(100, 100), [])
+        self.assertEqual(sorted(index.overlap(100, 101)), sorted(index.on_court_at(100)))
+
+
+if __name__ == "__main__":
+    unittest.main()
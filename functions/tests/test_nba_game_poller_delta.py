@@ -0,0 +1,87 @@
+import json
+import os
+import unittest
+
+from nba_game_poller import codec
+from nba_game_poller.delta import (
+    apply_gamepack_delta,
+    apply_patch,
+    build_gamepack_delta,
+    diff,
+)
+from nba_game_poller.playbyplay_processing import PlayByPlayProcessor
+
+
+def _box(points):
+    return {
+        "start": "2022-10-07T20:00:00Z",
+        "teams": {
+            "away": {"id": 1610612740, "abbr": "NOP", "players": [{"last": "Jones", "stats": {"pts": points}}]},
+            "home": {"id": 1610612759, "abbr": "SAS", "players": [{"last": "Vassell", "stats": {"pts": 2}}]},
+        },
+    }
+
+
+class TestGamepackDelta(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        fixture_path = os.path.join(os.path.dirname(__file__), "fixtures/0012200039.json")
+        with open(fixture_path, "r", encoding="utf-8") as f:
+            cls.actions = json.load(f)
+
+    def _versions(self, step=23):
+        processor = PlayByPlayProcessor(game_id="0012200039", away_team_id=1610612740, home_team_id=1610612759)
+        versions = []
+        for version, end in enumerate(range(step, len(self.actions) + step, step), start=1):
+            processor.update(self.actions[:end])
+            versions.append({
+                "v": 1,
+                "id": "0012200039",
+                "publicId": "game",
+                "lineage": "a1b2c3d4",
+                "box": _box(version),
+                "flow": processor.payload(include_actions=False, include_all_actions=False),
+                "version": version,
+                "parent": version - 1 or None,
+            })
+        return versions
+
+    def test_applying_deltas_reproduces_every_version(self):
+        versions = self._versions()
+        current = versions[0]
+        delta_bytes = full_bytes = 0
+        for previous, following in zip(versions, versions[1:]):
+            delta = codec.loads(codec.dumps(build_gamepack_delta(previous, following)))
+            current = apply_gamepack_delta(current, delta)
+            self.assertEqual(current, following)
+            delta_bytes += len(codec.dumps(delta))
+            full_bytes += len(codec.dumps(following))
+        self.assertLess(delta_bytes, full_bytes // 4)
+
+        with self.assertRaises(ValueError):
+            apply_gamepack_delta(versions[0], build_gamepack_delta(versions[1], versions[2]))
+        # Same version number, but from another lineage.
+        with self.assertRaises(ValueError):
+            apply_gamepack_delta(dict(versions[0], lineage="e5f6a7b8"), build_gamepack_delta(versions[0], versions[1]))
+
+    def test_patch_shapes(self):
+        cases = [
+            ({"a": 1, "b": [1, 2]}, {"a": 1, "b": [1, 2, 3]}),
+            ({"a": 1, "b": 2}, {"b": 3, "c": {"x": None}}),
+            ([{"end": "0500.00"}, {"end": "0300.00"}], [{"end": "0500.00"}, {"end": "0100.00"}]),
+            ([1, 2, 3], [1, 5]),
+            ({"a": [1]}, {"a": "text"}),
+        ]
+        for previous, current in cases:
+            patch = diff(previous, current)
+            self.assertEqual(apply_patch(previous, patch), current)
+        self.assertIsNone(diff({"a": [1]}, {"a": [1]}))
+        self.assertEqual(diff([1, 2], [1, 2, 3]), {"at": 2, "add": [3]})
+
+        previous = {"segments": [{"end": "0500.00"}]}
+        apply_patch(previous, diff(previous, {"segments": [{"end": "0400.00"}]}))
+        self.assertEqual(previous, {"segments": [{"end": "0500.00"}]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import multiprocessing
+import os
+import unittest
+from unittest.mock import patch
+
+from nba_game_poller.executor import (
+    ExecutorTaskError,
+    PipeProcessExecutor,
+    ThreadExecutor,
+    make_executor,
+)
+from nba_game_poller.playbyplay_processing import build_playbyplay_processor
+
+
+def _square(value):
+    return value * value
+
+
+def _fail(value):
+    raise ValueError(f"bad {value}")
+
+
+def _no_semaphores(*args, **kwargs):
+    # What SemLock creation does on AWS Lambda, where /dev/shm is missing.
+    raise OSError(38, "Function not implemented")
+
+
+class TestExecutor(unittest.TestCase):
+    def test_process_backend_without_shared_memory(self):
+        with patch("_multiprocessing.SemLock", side_effect=_no_semaphores):
+            with self.assertRaises(OSError):
+                multiprocessing.Queue()
+            executor = make_executor(2)
+            try:
+                self.assertIsInstance(executor, PipeProcessExecutor)
+                self.assertEqual(executor.map(_square, range(7)), [x * x for x in range(7)])
+                task = executor.submit(_fail, 3)
+                with self.assertRaises(ExecutorTaskError):
+                    task.result()
+                # The worker survives a failed task.
+                self.assertEqual(executor.submit(_square, 5).result(), 25)
+            finally:
+                executor.close()
+
+    def test_falls_back_to_threads(self):
+        with patch("multiprocessing.context.ForkContext.Process", side_effect=OSError("no fork")):
+            executor = make_executor(2)
+        try:
+            self.assertIsInstance(executor, ThreadExecutor)
+            self.assertEqual(executor.map(_square, [1, 2, 3]), [1, 4, 9])
+        finally:
+            executor.close()
+
+    def test_replayed_processor_round_trips(self):
+        fixture_path = os.path.join(os.path.dirname(__file__), "fixtures/0012200039.json")
+        with open(fixture_path, "r", encoding="utf-8") as f:
+            actions = json.load(f)
+        kwargs = dict(game_id="0012200039", away_team_id=1610612740, home_team_id=1610612759)
+        inline = build_playbyplay_processor(actions=actions, **kwargs)
+
+        with make_executor(2) as executor:
+            replayed = executor.submit(build_playbyplay_processor, actions=actions, **kwargs).result()
+        # The raw feed is not sent back; update() with the same feed restores it.
+        self.assertEqual(replayed.update(actions), 0)
+        self.assertEqual(
+            replayed.payload(include_actions=False, include_all_actions=False),
+            inline.payload(include_actions=False, include_all_actions=False),
+        )
+        self.assertEqual(replayed.checkpoint(), inline.checkpoint())
+
+
+if __name__ == "__main__":
+    unittest.main()
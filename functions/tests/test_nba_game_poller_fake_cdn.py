@@ -0,0 +1,110 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from nba_game_poller.fake_cdn import (
+    SCHEDULE_PATH,
+    SCOREBOARD_PATH,
+    FakeCdn,
+    load_recording,
+    save_recording,
+    start_server,
+)
+from nba_game_poller.nba_api import boxscore_url, fetch_nba_data_urllib, playbyplay_url
+from nba_game_poller.synthetic import generate_night
+
+
+def _path(url):
+    return url[len("http://cdn"):]
+
+
+class TestFakeCdn(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.games = generate_night("2025-10-21", count=2, seed=5)
+
+    def setUp(self):
+        self.now = [0.0]
+        self.cdn = FakeCdn.from_night(self.games, interval=60, clock=lambda: self.now[0])
+        self.game = self.games[0]
+        self.play_path = _path(playbyplay_url(self.game.game_id, "http://cdn"))
+        self.box_path = _path(boxscore_url(self.game.game_id, "http://cdn"))
+
+    def test_replays_snapshots_with_etags(self):
+        status, _, _ = self.cdn.respond(self.play_path)
+        self.assertEqual(status, 403)
+        status, _, body = self.cdn.respond(self.box_path)
+        self.assertEqual(json.loads(body)["game"]["gameStatusText"], "Pregame")
+
+        self.now[0] = 600
+        status, headers, body = self.cdn.respond(self.play_path)
+        self.assertEqual(status, 200)
+        actions = json.loads(body)["game"]["actions"]
+        self.assertEqual(actions, self.game.actions[: len(actions)])
+        etag = headers["ETag"]
+
+        status, headers, body = self.cdn.respond(self.play_path, {"If-None-Match": etag})
+        self.assertEqual((status, headers["ETag"], body), (304, etag, b""))
+
+        self.now[0] = 1200
+        status, headers, body = self.cdn.respond(self.play_path, {"If-None-Match": etag, "Accept-Encoding": "gzip"})
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertNotEqual(headers["ETag"], etag)
+        self.assertGreater(len(json.loads(gzip.decompress(body))["game"]["actions"]), len(actions))
+
+        self.now[0] = 10**6
+        _, _, body = self.cdn.respond(self.box_path)
+        self.assertEqual(json.loads(body)["game"]["gameStatus"], 3)
+        self.assertEqual(self.cdn.respond(_path(playbyplay_url("0099999999", "http://cdn")))[0], 404)
+        self.assertEqual(self.cdn.stats[304], 1)
+
+    def test_scoreboard_and_schedule_follow_the_clock(self):
+        self.now[0] = 600
+        status, headers, body = self.cdn.respond(SCOREBOARD_PATH)
+        games = json.loads(body)["scoreboard"]["games"]
+        self.assertEqual([g["gameId"] for g in games], [g.game_id for g in self.games])
+        self.assertTrue(games[0]["gameStatusText"].startswith("Q1"))
+        self.assertEqual(games[1]["gameStatusText"], "Pregame")
+        self.assertEqual(self.cdn.respond(SCOREBOARD_PATH, {"If-None-Match": headers["ETag"]})[0], 304)
+
+        _, _, body = self.cdn.respond(SCHEDULE_PATH)
+        (game_date,) = json.loads(body)["leagueSchedule"]["gameDates"]
+        self.assertEqual(game_date["gameDate"], "10/21/2025 00:00:00")
+        self.assertEqual(game_date["games"][1]["gameDateTimeEst"], self.games[1].start_time)
+
+    def test_error_rate_and_recordings(self):
+        failing = FakeCdn(error_rate=1.0)
+        self.assertEqual(failing.respond(SCOREBOARD_PATH)[0], 503)
+
+        snapshots = list(self.game.snapshots(interval=600))[:3]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "game.jsonl")
+            save_recording(path, snapshots)
+            recorded = load_recording(path)
+        self.assertEqual(recorded, snapshots)
+
+        cdn = FakeCdn(clock=lambda: self.now[0]).add_game("1", recorded, tip_off=100)
+        self.now[0] = 100 + snapshots[1][0]
+        _, _, body = cdn.respond("/static/json/liveData/boxscore/boxscore_1.json")
+        self.assertEqual(json.loads(body), snapshots[1][2])
+
+    def test_poller_fetch_against_server(self):
+        self.now[0] = 900
+        server, base_url = start_server(self.cdn)
+        try:
+            url = playbyplay_url(self.game.game_id, base_url)
+            data, etag = fetch_nba_data_urllib(url)
+            self.assertEqual(data["game"]["gameId"], self.game.game_id)
+            self.assertEqual(fetch_nba_data_urllib(url, etag), (None, etag))
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(self.cdn.stats[200], 1)
+        self.assertEqual(self.cdn.stats[304], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import json
+import os
+import unittest
+
+from nba_game_poller.feed_stream import LazyActions, parse_playbyplay_feed
+from nba_game_poller.playbyplay_processing import PlayByPlayProcessor
+
+
+def _body(actions, **game):
+    return json.dumps({"meta": {"version": 1}, "game": dict(game, actions=actions)}).encode("utf-8")
+
+
+class TestParsePlaybyplayFeed(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        fixture_path = os.path.join(os.path.dirname(__file__), "fixtures/0012200039.json")
+        with open(fixture_path, "r", encoding="utf-8") as f:
+            cls.actions = json.load(f)
+
+    def test_matches_json_loads(self):
+        body = _body(self.actions, gameId="0012200039")
+        data = parse_playbyplay_feed(body)
+        actions = data["game"]["actions"]
+        self.assertIsInstance(actions, LazyActions)
+        self.assertEqual(actions.decoded_count(), 0)
+        self.assertEqual(data["meta"], {"version": 1})
+        self.assertEqual(data["game"]["gameId"], "0012200039")
+        self.assertEqual(actions[-1], self.actions[-1])
+        self.assertEqual(list(actions), self.actions)
+
+        empty = parse_playbyplay_feed(_body([]))
+        self.assertEqual(len(empty["game"]["actions"]), 0)
+
+    def test_watermark_decodes_only_new_actions(self):
+        full = PlayByPlayProcessor(game_id="0012200039", away_team_id=1610612740, home_team_id=1610612759)
+        full.update(self.actions)
+
+        processor = PlayByPlayProcessor(game_id="0012200039", away_team_id=1610612740, home_team_id=1610612759)
+        first = parse_playbyplay_feed(_body(self.actions[:400]))["game"]["actions"]
+        processor.update(first)
+
+        later = parse_playbyplay_feed(_body(self.actions), first.watermark)["game"]["actions"]
+        self.assertFalse(later.rewritten)
+        self.assertEqual(processor.update(later), len(self.actions) - 400)
+        # Only the new actions; the digest vouches for the consumed ones.
+        self.assertEqual(later.decoded_count(), len(self.actions) - 400)
+        self.assertEqual(
+            processor.payload(include_actions=False, include_all_actions=False),
+            full.payload(include_actions=False, include_all_actions=False),
+        )
+
+    def test_detects_edited_and_truncated_actions(self):
+        watermark = parse_playbyplay_feed(_body(self.actions[:300]))["game"]["actions"].watermark
+
+        edited = [dict(a) for a in self.actions]
+        edited[10]["description"] += " (corrected)"
+        self.assertTrue(parse_playbyplay_feed(_body(edited), watermark)["game"]["actions"].rewritten)
+        self.assertTrue(parse_playbyplay_feed(_body(self.actions[:200]), watermark)["game"]["actions"].rewritten)
+        self.assertFalse(parse_playbyplay_feed(_body(self.actions[:300]), watermark)["game"]["actions"].rewritten)
+
+    def test_processor_rewinds_on_edited_feed(self):
+        processor = PlayByPlayProcessor(game_id="0012200039", away_team_id=1610612740, home_team_id=1610612759)
+        first = parse_playbyplay_feed(_body(self.actions[:450]))["game"]["actions"]
+        processor.update(first)
+
+        edited = [dict(a) for a in self.actions]
+        edited[440]["description"] += " (corrected)"
+        later = parse_playbyplay_feed(_body(edited), first.watermark)["game"]["actions"]
+        self.assertTrue(later.rewritten)
+        consumed = processor.update(later)
+        self.assertEqual(processor.last_update["kind"], "edited")
+        self.assertLess(consumed, len(edited) - 300)
+
+        full = PlayByPlayProcessor(game_id="0012200039", away_team_id=1610612740, home_team_id=1610612759)
+        full.update(edited)
+        self.assertEqual(processor.payload(), full.payload())
+
+    def test_cold_restore_without_watermark_finds_edits(self):
+        # A cold container restores from the checkpoint but has no watermark yet.
+        processor = PlayByPlayProcessor(game_id="0012200039", away_team_id=1610612740, home_team_id=1610612759)
+        processor.update(self.actions[:400])
+        flow = json.loads(json.dumps(processor.payload(include_actions=False, include_all_actions=False)))
+        restored = PlayByPlayProcessor.from_checkpoint(json.loads(json.dumps(processor.checkpoint())), flow)
+
+        edited = [dict(a) for a in self.actions]
+        edited[150]["description"] += " (corrected)"
+        later = parse_playbyplay_feed(_body(edited))["game"]["actions"]
+        self.assertEqual((later.rewritten, later.unchanged), (None, 0))
+        restored.update(later)
+        self.assertEqual(restored.last_update["kind"], "edited")
+
+        full = PlayByPlayProcessor(game_id="0012200039", away_team_id=1610612740, home_team_id=1610612759)
+        full.update(edited)
+        self.assertEqual(restored.payload(), full.payload())
+
+    def test_unusual_actions_still_parse(self):
+        tricky = [dict(a) for a in self.actions[:20]]
+        tricky[3]["description"] = 'Jump Ball },{ "x" }]'
+        tricky[5]["extra"] = {"nested": [1, 2]}
+        for actions in (tricky[:5], tricky):
+            data = parse_playbyplay_feed(_body(actions))
+            self.assertEqual(list(data["game"]["actions"]), actions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import gzip
+import json
+import os
+import unittest
+
+from nba_game_poller import codec
+from nba_game_poller.flow_v3 import flow_v2_to_v3, flow_v3_to_v2
+from nba_game_poller.playbyplay_processing import build_playbyplay_processor, process_playbyplay_payload
+
+
+class TestFlowV3(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        fixture_path = os.path.join(os.path.dirname(__file__), "fixtures/0012200039.json")
+        with open(fixture_path, "r", encoding="utf-8") as f:
+            cls.actions = json.load(f)
+
+    def _payload(self, schema, end=None):
+        return process_playbyplay_payload(
+            game_id="0012200039",
+            actions=self.actions[:end],
+            away_team_id=1610612740,
+            home_team_id=1610612759,
+            schema=schema,
+        )
+
+    def test_round_trip_to_v2(self):
+        for end in (40, 250, None):
+            v2 = self._payload(2, end)
+            v3 = self._payload(3, end)
+            self.assertEqual(v3["v"], 3)
+            self.assertEqual(flow_v3_to_v2(v3), v2)
+            self.assertEqual(flow_v3_to_v2(codec.loads(codec.dumps(v3))), v2)
+
+    def test_player_table_and_clocks(self):
+        v3 = self._payload(3)
+        names = {(p["team"], p["name"]) for p in v3["players"]}
+        self.assertEqual(len(names), len(v3["players"]))
+        williamson = next(p for p in v3["players"] if p["name"] == "Williamson")
+        self.assertEqual((williamson["personId"], williamson["nameI"]), (1629627, "Z. Williamson"))
+        clock = v3["fields"]["actions"].index("clock")
+        self.assertTrue(all(isinstance(row[clock], int) for row in v3["actions"]))
+        self.assertEqual(len(v3["events"]), len(self._payload(2)["events"]))
+
+    def test_smaller_compressed(self):
+        v2 = gzip.compress(codec.dumps(self._payload(2)))
+        v3 = gzip.compress(codec.dumps(self._payload(3)))
+        self.assertLess(len(v3), len(v2))
+
+    def test_irregular_clocks_kept(self):
+        flow = {
+            "v": 2,
+            "periods": 1,
+            "last": {"quarter": 1, "time": "11:43", "awayScore": "", "homeScore": ""},
+            "score": [{"quarter": 1, "time": "1100.00", "awayScore": "2", "homeScore": "0"}],
+            "players": {"away": {"Jones": [], "Smith": [
+                {"quarter": 1, "time": "", "type": "Jump Ball", "text": "x", "detail": None,
+                 "seq": 1, "awayScore": "", "homeScore": ""},
+            ]}, "home": {}},
+            "segments": {"away": {"Jones": []}, "home": {}},
+            "lineups": {"away": [], "home": []},
+            "court": {"away": {"names": [], "t": [], "on": []}, "home": {"names": [], "t": [], "on": []}},
+        }
+        v3 = flow_v2_to_v3(flow)
+        self.assertEqual(v3["score"][0][1], 66000)
+        self.assertEqual(v3["last"]["clock"], "11:43")
+        self.assertEqual(flow_v3_to_v2(v3), flow)
+
+    def test_processor_people(self):
+        processor = build_playbyplay_processor(
+            game_id="0012200039",
+            actions=self.actions,
+            away_team_id=1610612740,
+            home_team_id=1610612759,
+        )
+        v3 = processor.payload(include_actions=False, include_all_actions=False, schema=3)
+        self.assertNotIn("feed", v3)
+        self.assertNotIn("events", v3)
+        with self.assertRaises(ValueError):
+            processor.payload(schema=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
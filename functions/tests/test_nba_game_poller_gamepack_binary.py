@@ -0,0 +1,93 @@
+import gzip
+import json
+import os
+import unittest
+from unittest.mock import MagicMock
+
+from nba_game_poller import codec
+from nba_game_poller.gamepack_binary import decode_gamepack, encode_gamepack, read_columns
+from nba_game_poller.playbyplay_processing import process_playbyplay_payload
+from nba_game_poller.storage import upload_json_to_s3
+
+
+class TestGamepackBinary(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        fixture_path = os.path.join(os.path.dirname(__file__), "fixtures/0012200039.json")
+        with open(fixture_path, "r", encoding="utf-8") as f:
+            actions = json.load(f)
+        flow = process_playbyplay_payload(
+            game_id="0012200039",
+            actions=actions,
+            away_team_id=1610612740,
+            home_team_id=1610612759,
+            include_actions=False,
+            include_all_actions=False,
+        )
+        cls.gamepack = {
+            "v": 1,
+            "id": "0012200039",
+            "publicId": "game",
+            "box": {"teams": {"away": {"abbr": "NOP"}, "home": {"abbr": "SAS"}}},
+            "flow": flow,
+            "version": 4,
+            "parent": 3,
+        }
+
+    def test_round_trip_and_size(self):
+        data = encode_gamepack(self.gamepack)
+        self.assertEqual(decode_gamepack(data), self.gamepack)
+        self.assertLess(len(data), len(codec.dumps(self.gamepack)) // 2)
+
+    def test_columns_without_records(self):
+        header, tables = read_columns(encode_gamepack(self.gamepack))
+        first_player = header["players"][0]
+        team, name, start, count = first_player
+        acts = self.gamepack["flow"]["players"][team][name]
+        self.assertEqual(count, len(acts))
+        kind, clocks = tables["actions"]["time"]
+        self.assertEqual(kind, "clock")
+        self.assertEqual(clocks[start], 11 * 6000 + 43 * 100)
+        self.assertEqual(len(tables["score"]["awayScore"][1]), len(self.gamepack["flow"]["score"]))
+
+    def test_irregular_values_fall_back_to_dictionary(self):
+        gamepack = {
+            "v": 1,
+            "flow": {
+                "v": 2,
+                "players": {
+                    "away": {
+                        "A": [
+                            {"quarter": 1, "time": "1143.00", "seq": 7, "awayScore": "", "text": "x"},
+                            {"quarter": "1", "time": "PT11M40.00S", "seq": "7a", "awayScore": "007"},
+                            {"quarter": None, "time": None, "seq": True, "r": "m", "awayScore": "12"},
+                        ],
+                    },
+                    "home": {},
+                },
+                "score": [],
+            },
+        }
+        self.assertEqual(decode_gamepack(encode_gamepack(gamepack)), gamepack)
+        with self.assertRaises(ValueError):
+            encode_gamepack({"flow": {"players": {"away": {"A": [{"nested": {"x": 1}}]}}}})
+
+    def test_upload_ships_binary_next_to_json(self):
+        s3_client = MagicMock()
+        upload_json_to_s3(
+            s3_client=s3_client,
+            bucket="b",
+            prefix="data/",
+            key="gamepack/game.json",
+            data=self.gamepack,
+            binary_encoder=encode_gamepack,
+        )
+        json_call, binary_call = s3_client.put_object.call_args_list
+        self.assertEqual(json_call.kwargs["Key"], "data/gamepack/game.json.gz")
+        self.assertEqual(binary_call.kwargs["Key"], "data/gamepack/game.bin.gz")
+        self.assertEqual(binary_call.kwargs["ContentType"], "application/octet-stream")
+        self.assertEqual(decode_gamepack(gzip.decompress(binary_call.kwargs["Body"])), self.gamepack)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -53,3 +53,154 @@ class TestNbaGamePollerLambda:
 
         self.module.poller_logic(None)
         assert self.module.disable_self.called
+
+    def test_main_handler_logs_memory_profile_on_request(self, capsys):
+        # "memoryProfile" in the event logs the peak memory of the task.
+        self.module.reconcile_recent_schedule = MagicMock()
+
+        self.module.main_handler({"task": "reconcile"}, None)
+        assert "Poller: memory" not in capsys.readouterr().out
+
+        self.module.main_handler({"task": "reconcile", "memoryProfile": True}, None)
+        assert 'Poller: memory {"task":"reconcile","memory":{"reconcile":' in capsys.readouterr().out
+
+    def test_get_playbyplay_processor_restores_checkpoint_on_first_touch(self):
+        # A cold container should resume from the S3 checkpoint instead of replaying.
+        restored = self.module.PlayByPlayProcessor(
+            game_id="0022400001",
+            away_team_id=1610612740,
+            home_team_id=1610612759,
+        )
+        self.module.PLAYBYPLAY_PROCESSORS.clear()
+        self.module.restore_playbyplay_processor = MagicMock(return_value=restored)
+
+        processor = self.module.get_playbyplay_processor("game", "0022400001", 1610612740, 1610612759)
+        assert processor is restored
+        assert self.module.PLAYBYPLAY_PROCESSORS["game"] is restored
+
+        # Warm containers reuse the in-memory processor without touching S3 again.
+        self.module.get_playbyplay_processor("game", "0022400001", 1610612740, 1610612759)
+        assert self.module.restore_playbyplay_processor.call_count == 1
+
+    def test_process_game_hands_replay_to_executor(self):
+        # A cold full-feed replay runs on the executor and gives the same gamepack.
+        import json
+        from nba_game_poller.executor import make_executor
+
+        fixture_path = os.path.join(os.path.dirname(__file__), "fixtures/0012200039.json")
+        with open(fixture_path, "r", encoding="utf-8") as f:
+            actions = json.load(f)
+        play = json.dumps({"game": {"actions": actions}}).encode()
+        box = {
+            "game": {
+                "gameStatusText": "Q4 1:00",
+                "awayTeam": {"teamId": 1610612740, "teamTricode": "NOP", "players": []},
+                "homeTeam": {"teamId": 1610612759, "teamTricode": "SAS", "players": []},
+            }
+        }
+        feeds = {"playbyplay": (play, "p1"), "boxscore": (box, "b1")}
+
+        def fetch(url, etag, ua, parse=None):
+            body, etag = feeds["playbyplay" if "playbyplay" in url else "boxscore"]
+            return (parse(body) if parse else body), etag
+
+        self.module.fetch_nba_data_urllib = MagicMock(side_effect=fetch)
+        self.module.restore_playbyplay_processor = MagicMock(return_value=None)
+        self.module.upload_processor_checkpoint = MagicMock()
+        self.module.upload_json_to_s3 = MagicMock()
+        self.module.load_gamepack = MagicMock(return_value=None)
+
+        flows = []
+        executor = make_executor(2)
+        try:
+            for run_executor in (None, executor):
+                self.module.PLAYBYPLAY_PROCESSORS.clear()
+                self.module.LAST_GAMEPACKS.clear()
+                self.module.FEED_WATERMARKS.clear()
+                poll = self.module.start_game({"id": "game", "nbaGameId": "0012200039"}, executor=run_executor)
+                assert (poll["replay"] is not None) == (run_executor is not None)
+                is_final, updates = self.module.finish_game(poll)
+                assert updates["play_etag"] == "p1"
+                if run_executor is not None:
+                    # Only the worker decodes the feed; here just the last action is read.
+                    assert poll["play_data"]["game"]["actions"].decoded_count() == 1
+                flows.append(self.module.upload_json_to_s3.call_args.kwargs["data"]["flow"])
+        finally:
+            executor.close()
+        assert flows[0] == flows[1]
+        assert self.module.upload_processor_checkpoint.call_count == 2
+
+    def test_single_cpu_processes_inline(self, monkeypatch):
+        # One vCPU gets no executor: a worker would only add handoff cost.
+        monkeypatch.setattr(self.module, "GAME_EXECUTOR", None)
+        monkeypatch.setattr(self.module, "make_executor", MagicMock())
+        monkeypatch.setattr(self.module.os, "cpu_count", lambda: 1)
+        assert self.module.get_game_executor() is None
+        monkeypatch.setattr(self.module, "POLLER_WORKERS", "1")
+        monkeypatch.setattr(self.module.os, "cpu_count", lambda: 4)
+        assert self.module.get_game_executor() is None
+        assert not self.module.make_executor.called
+
+        monkeypatch.setattr(self.module, "POLLER_WORKERS", None)
+        assert self.module.get_game_executor() is self.module.make_executor.return_value
+        self.module.make_executor.assert_called_once_with(4)
+
+    def test_publish_gamepack_uploads_delta_against_previous_version(self):
+        # Each publish bumps the version; from the second one on a delta is uploaded first.
+        from nba_game_poller.delta import apply_gamepack_delta
+
+        self.module.upload_json_to_s3 = MagicMock()
+        self.module.load_gamepack = MagicMock(return_value=None)
+        self.module.LAST_GAMEPACKS.clear()
+
+        first = {"v": 1, "publicId": "game", "box": {"teams": {}}, "flow": {"score": [1]}}
+        self.module.publish_gamepack("game", first)
+        assert (first["version"], first["parent"]) == (1, None)
+        assert first["lineage"]
+        assert self.module.upload_json_to_s3.call_count == 1
+
+        self.module.upload_json_to_s3.reset_mock()
+        second = {"v": 1, "publicId": "game", "box": {"teams": {}}, "flow": {"score": [1, 2]}}
+        self.module.publish_gamepack("game", second)
+        delta_call, gamepack_call = self.module.upload_json_to_s3.call_args_list
+        assert delta_call.kwargs["key"] == f"gamepack-delta/game/{first['lineage']}/2.json"
+        assert delta_call.kwargs["is_final"] is True
+        assert gamepack_call.kwargs["key"] == "gamepack/game.json"
+        assert apply_gamepack_delta(first, delta_call.kwargs["data"]) == second
+        assert self.module.load_gamepack.call_count == 1
+
+    def test_publish_gamepack_starts_new_lineage_when_parent_fails_to_load(self):
+        # A transient S3 error is not cached and never overwrites the old lineage's deltas.
+        from botocore.exceptions import ClientError
+
+        self.module.upload_json_to_s3 = MagicMock()
+        self.module.s3_client = MagicMock()
+        self.module.s3_client.get_object.side_effect = ClientError(
+            {"Error": {"Code": "SlowDown"}}, "GetObject"
+        )
+        self.module.LAST_GAMEPACKS.clear()
+
+        first = {"v": 1, "publicId": "game", "box": {"teams": {}}, "flow": {"score": [1]}}
+        self.module.publish_gamepack("game", first)
+        assert (first["version"], first["parent"]) == (1, None)
+        assert self.module.upload_json_to_s3.call_args.kwargs["key"] == "gamepack/game.json"
+        assert self.module.upload_json_to_s3.call_count == 1
+        assert self.module.previous_gamepack("other") is None
+        assert "other" not in self.module.LAST_GAMEPACKS
+
+        self.module.upload_json_to_s3.reset_mock()
+        second = {"v": 1, "publicId": "game", "box": {"teams": {}}, "flow": {"score": [1, 2]}}
+        self.module.publish_gamepack("game", second)
+        assert (second["lineage"], second["version"]) == (first["lineage"], 2)
+        delta_key = self.module.upload_json_to_s3.call_args_list[0].kwargs["key"]
+        assert delta_key == f"gamepack-delta/game/{first['lineage']}/2.json"
+
+    def test_load_gamepack_treats_missing_object_as_new_game(self):
+        from botocore.exceptions import ClientError
+
+        self.module.s3_client = MagicMock()
+        self.module.s3_client.get_object.side_effect = ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        assert self.module.load_gamepack("game") is None
+        self.module.s3_client.get_object.side_effect = ClientError({"Error": {"Code": "SlowDown"}}, "GetObject")
+        with pytest.raises(ClientError):
+            self.module.load_gamepack("game")
@@ -0,0 +1,68 @@
+import json
+import os
+import tracemalloc
+import unittest
+from unittest.mock import MagicMock
+
+from nba_game_poller.memory import MemoryProfile, memory_tracking, track_memory
+from nba_game_poller.playbyplay_processing import PlayByPlayProcessor
+from nba_game_poller.storage import upload_json_to_s3
+
+
+class TestMemoryProfile(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        fixture_path = os.path.join(os.path.dirname(__file__), "fixtures/0012200039.json")
+        with open(fixture_path, "r", encoding="utf-8") as f:
+            cls.actions = json.load(f)
+
+    def test_disabled_is_a_no_op(self):
+        with track_memory("anything"):
+            pass
+        with memory_tracking(None, "game") as profile:
+            with track_memory("ignored"):
+                pass
+        self.assertIsNone(profile)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_records_nested_peaks_and_sites(self):
+        profile = MemoryProfile()
+        processor = PlayByPlayProcessor(game_id="0012200039", away_team_id=1610612740, home_team_id=1610612759)
+        with memory_tracking(profile, "game"):
+            processor.update(self.actions)
+            with track_memory("pbp.payload"):
+                flow = processor.payload(include_actions=False, include_all_actions=False)
+            upload_json_to_s3(s3_client=MagicMock(), bucket="b", prefix="data/", key="g.json", data=flow)
+            with track_memory("scratch"):
+                scratch = [bytes(1024) for _ in range(200)]
+                del scratch
+        self.assertFalse(tracemalloc.is_tracing())
+
+        report = profile.to_json()
+        self.assertEqual(set(report), {"game", "pbp.payload", "serialize", "scratch"})
+        self.assertEqual(report["serialize"]["calls"], 1)
+        self.assertGreater(report["pbp.payload"]["top"][0][1], 0)
+        # The freed scratch buffers still count towards the peaks, the enclosing game's too.
+        self.assertGreaterEqual(report["scratch"]["peakKb"], 200)
+        self.assertEqual(report["scratch"]["top"], [])
+        self.assertGreaterEqual(report["game"]["peakKb"], report["scratch"]["peakKb"])
+        self.assertGreaterEqual(report["game"]["peakKb"], report["pbp.payload"]["peakKb"])
+
+    def test_merge_keeps_the_largest_peaks(self):
+        first = MemoryProfile(top=2)
+        first.add("game", 2048, [("a.py:1", 1024), ("b.py:2", 512)])
+        second = MemoryProfile()
+        second.add("game", 1024, [("b.py:2", 2048), ("c.py:3", 100)])
+        second.add("serialize", 512)
+        first.merge(second)
+        self.assertEqual(
+            first.to_json(),
+            {
+                "game": {"peakKb": 2.0, "calls": 2, "top": [["b.py:2", 2.0], ["a.py:1", 1.0]]},
+                "serialize": {"peakKb": 0.5, "calls": 1, "top": []},
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
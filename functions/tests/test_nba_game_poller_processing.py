@@ -1,7 +1,76 @@
+import copy
 import json
 import os
 import unittest
-from nba_game_poller.playbyplay_processing import process_playbyplay_payload, time_to_seconds
+from nba_game_poller import playbyplay_processing as pbp
+from nba_game_poller.playbyplay_processing import (
+    ActionTextCache,
+    PlayByPlayProcessor,
+    build_playbyplay_processor,
+    process_playbyplay_payload,
+    time_to_seconds,
+)
+
+
+def multipass_payload(actions, away_team_id, home_team_id, include_actions=True, include_all_actions=True):
+    """Reference pipeline built from the per-stage helpers, one pass per stage."""
+    away_team_id = int(away_team_id)
+    home_team_id = int(home_team_id)
+    last_action = actions[-1] if actions else None
+
+    score_timeline = pbp.process_score_timeline(actions)
+    players = pbp.create_players(actions, away_team_id, home_team_id)
+    away_playtimes = pbp.create_playtimes(players["awayPlayers"])
+    home_playtimes = pbp.create_playtimes(players["homePlayers"])
+
+    current_q = 1
+    for a in actions:
+        period = a.get("period") or 1
+        if period != current_q:
+            pbp.quarter_change(away_playtimes)
+            pbp.quarter_change(home_playtimes)
+            current_q = period
+        if a.get("teamId") == away_team_id:
+            pbp.update_playtimes_with_action(a, away_playtimes)
+        if a.get("teamId") == home_team_id:
+            pbp.update_playtimes_with_action(a, home_playtimes)
+
+    away_playtimes = pbp.end_playtimes(away_playtimes, last_action)
+    home_playtimes = pbp.end_playtimes(home_playtimes, last_action)
+    trimmed_away = pbp._trim_action_map(players["awayPlayers"])
+    trimmed_home = pbp._trim_action_map(players["homePlayers"])
+
+    # Lineups and the court index have no per-stage helpers; take them from a
+    # fresh batch run.
+    batch = process_playbyplay_payload(
+        game_id="ref",
+        actions=actions,
+        away_team_id=away_team_id,
+        home_team_id=home_team_id,
+        include_actions=False,
+        include_all_actions=False,
+    )
+
+    payload = {
+        "v": 2,
+        "periods": pbp._count_periods(last_action),
+        "last": pbp._trim_last_action(last_action),
+        "score": pbp._trim_score_timeline(score_timeline),
+        "players": {"away": trimmed_away, "home": trimmed_home},
+        "segments": {
+            "away": pbp._trim_segments(away_playtimes),
+            "home": pbp._trim_segments(home_playtimes),
+        },
+        "lineups": batch["lineups"],
+        "court": batch["court"],
+    }
+    if include_all_actions:
+        all_actions = [a for acts in trimmed_away.values() for a in acts]
+        all_actions += [a for acts in trimmed_home.values() for a in acts]
+        payload["events"] = pbp.sort_actions(all_actions)
+    if include_actions:
+        payload["feed"] = pbp._trim_action_list(actions)
+    return payload
 
 class TestPlayByPlayProcessing(unittest.TestCase):
     @classmethod
@@ -33,6 +102,13 @@ class TestPlayByPlayProcessing(unittest.TestCase):
         self.assertIsInstance(processed["segments"], dict)
         self.assertIsInstance(processed["events"], list)
 
+    def test_infer_team_ids_from_actions(self):
+        self.assertEqual(
+            pbp.infer_team_ids_from_actions(self.actions),
+            (int(self.away_team_id), int(self.home_team_id)),
+        )
+        self.assertEqual(pbp.infer_team_ids_from_actions(self.actions[:1]), (None, None))
+
     def test_score_timeline_final_score_present(self):
         processed = process_playbyplay_payload(
             game_id="0012200039",
@@ -128,3 +204,276 @@ class TestPlayByPlayProcessing(unittest.TestCase):
                     self.assertIsNotNone(seg["start"])
                     self.assertIsNotNone(seg["end"])
         self.assertGreater(checked, 0, "Expected at least one playtime segment to be produced")
+
+    def _batch_json(self, actions, **flags):
+        return json.dumps(multipass_payload(actions, self.away_team_id, self.home_team_id, **flags))
+
+    def test_single_pass_matches_multipass_pipeline(self):
+        for flags in ({}, {"include_actions": False, "include_all_actions": False}):
+            processed = process_playbyplay_payload(
+                game_id="0012200039",
+                actions=self.actions,
+                away_team_id=self.away_team_id,
+                home_team_id=self.home_team_id,
+                **flags,
+            )
+            self.assertEqual(json.dumps(processed), self._batch_json(self.actions, **flags))
+
+    def test_incremental_processor_matches_batch(self):
+        processor = PlayByPlayProcessor(
+            game_id="0012200039",
+            away_team_id=self.away_team_id,
+            home_team_id=self.home_team_id,
+        )
+        for end in list(range(0, len(self.actions), 23)) + [len(self.actions)]:
+            processor.update(self.actions[:end])
+            for flags in ({}, {"include_actions": False, "include_all_actions": False}):
+                self.assertEqual(
+                    json.dumps(processor.payload(**flags)),
+                    self._batch_json(self.actions[:end], **flags),
+                    f"Mismatch after {end} actions with {flags}",
+                )
+
+    def test_incremental_processor_only_consumes_new_actions(self):
+        processor = PlayByPlayProcessor(
+            game_id="0012200039",
+            away_team_id=self.away_team_id,
+            home_team_id=self.home_team_id,
+        )
+        self.assertEqual(processor.update(self.actions[:300]), 300)
+        self.assertEqual(processor.update(self.actions[:300]), 0)
+        self.assertEqual(processor.update(self.actions[:310]), 10)
+
+    def test_incremental_processor_replays_when_feed_rewritten(self):
+        processor = PlayByPlayProcessor(
+            game_id="0012200039",
+            away_team_id=self.away_team_id,
+            home_team_id=self.home_team_id,
+        )
+        processor.update(self.actions[:300])
+        # A shorter feed is replayed from the start of the period of its last action.
+        period = self.actions[199].get("period")
+        period_start = next(i for i, a in enumerate(self.actions) if a.get("period") == period)
+        self.assertEqual(processor.pending(self.actions[:200]), 200 - period_start)
+        self.assertEqual(processor.update(self.actions[:200]), 200 - period_start)
+        self.assertEqual(processor.last_update["kind"], "reordered")
+        self.assertEqual(json.dumps(processor.payload()), self._batch_json(self.actions[:200]))
+
+    def test_incremental_processor_classifies_edits(self):
+        processor = PlayByPlayProcessor(
+            game_id="0012200039",
+            away_team_id=self.away_team_id,
+            home_team_id=self.home_team_id,
+        )
+        processor.update(self.actions[:400])
+        processor.update(self.actions[:450])
+
+        edited = copy.deepcopy(self.actions)
+        edited[420]["description"] = edited[420].get("description", "") + " (corrected)"
+        processor.update(edited)
+        self.assertEqual(processor.last_update["kind"], "edited")
+        self.assertLessEqual(processor.last_update["from"], 420)
+        self.assertLess(processor.last_update["consumed"], len(edited))
+        self.assertEqual(json.dumps(processor.payload()), self._batch_json(edited))
+
+        removed = edited[:100] + edited[101:]
+        processor.update(removed)
+        self.assertEqual(processor.last_update, {"kind": "reordered", "from": 100, "consumed": len(removed)})
+        self.assertEqual(json.dumps(processor.payload()), self._batch_json(removed))
+
+        stats = processor.feed_stats()
+        self.assertEqual((stats["append"], stats["edited"], stats["reordered"]), (2, 1, 1))
+        self.assertGreater(stats["replayed"], 0)
+
+    def test_batch_builder_does_not_track_edits(self):
+        processor = build_playbyplay_processor(
+            game_id="0012200039",
+            actions=self.actions[:400],
+            away_team_id=self.away_team_id,
+            home_team_id=self.home_team_id,
+        )
+        self.assertEqual((processor._hashes, processor._rewind_points), ([], []))
+        self.assertEqual(json.dumps(processor.payload()), self._batch_json(self.actions[:400]))
+
+        # Appends still resume; a shrunken feed has no snapshot to rewind to and replays everything.
+        self.assertEqual(processor.update(self.actions[:450]), 50)
+        processor.update(self.actions[:300])
+        self.assertEqual(processor.last_update, {"kind": "rewritten", "from": 0, "consumed": 300})
+        self.assertEqual(json.dumps(processor.payload()), self._batch_json(self.actions[:300]))
+
+    def test_checkpoint_roundtrip_resumes_processing(self):
+        processor = PlayByPlayProcessor(
+            game_id="0012200039",
+            away_team_id=self.away_team_id,
+            home_team_id=self.home_team_id,
+        )
+        processor.update(self.actions[:250])
+        flow = json.loads(json.dumps(processor.payload(include_actions=False, include_all_actions=False)))
+        checkpoint = json.loads(json.dumps(processor.checkpoint()))
+
+        restored = PlayByPlayProcessor.from_checkpoint(checkpoint, flow)
+        self.assertIsNotNone(restored)
+        self.assertEqual(restored.update(self.actions), len(self.actions) - 250)
+        self.assertEqual(json.dumps(restored.payload()), self._batch_json(self.actions))
+
+    def test_checkpoint_restore_finds_edits_before_the_restore(self):
+        processor = PlayByPlayProcessor(
+            game_id="0012200039",
+            away_team_id=self.away_team_id,
+            home_team_id=self.home_team_id,
+        )
+        processor.update(self.actions[:400])
+        flow = json.loads(json.dumps(processor.payload(include_actions=False, include_all_actions=False)))
+        checkpoint = json.loads(json.dumps(processor.checkpoint()))
+        restored = PlayByPlayProcessor.from_checkpoint(checkpoint, flow)
+
+        # Edited in place, same length and actionNumbers.
+        edited = copy.deepcopy(self.actions)
+        edited[150]["description"] = edited[150].get("description", "") + " (corrected)"
+        restored.update(edited)
+        self.assertEqual(restored.last_update["kind"], "edited")
+        self.assertLessEqual(restored.last_update["from"], 150)
+        self.assertEqual(json.dumps(restored.payload()), self._batch_json(edited))
+
+        checkpoint["hashes"] = checkpoint["hashes"][16:]
+        self.assertIsNone(PlayByPlayProcessor.from_checkpoint(checkpoint, flow))
+
+    def test_checkpoint_restore_keeps_roster_assist_names_in_feed(self):
+        # The assister is named "Z. Williamson" in the description but resolves by id.
+        actions = copy.deepcopy(self.actions)
+        person_id = next(a["personId"] for a in actions if a.get("playerName") == "Williamson")
+        index = next(
+            i for i, a in enumerate(actions)
+            if "(Williamson" in (a.get("description") or "")
+            and any(b.get("personId") == person_id for b in actions[:i])
+        )
+        actions[index]["description"] = actions[index]["description"].replace("(Williamson", "(Z. Williamson")
+        actions[index]["assistPersonId"] = person_id
+
+        processor = PlayByPlayProcessor(
+            game_id="0012200039",
+            away_team_id=self.away_team_id,
+            home_team_id=self.home_team_id,
+        )
+        processor.update(actions[: index + 50])
+        flow = json.loads(json.dumps(processor.payload(include_actions=False, include_all_actions=False)))
+        checkpoint = json.loads(json.dumps(processor.checkpoint()))
+
+        restored = PlayByPlayProcessor.from_checkpoint(checkpoint, flow, text_cache=ActionTextCache())
+        restored.update(actions)
+        batch = process_playbyplay_payload(
+            game_id="0012200039",
+            actions=actions,
+            away_team_id=self.away_team_id,
+            home_team_id=self.home_team_id,
+        )
+        self.assertEqual(json.dumps(restored.payload()), json.dumps(batch))
+        self.assertIn("ast Williamson", restored.payload()["feed"][index]["text"])
+
+    def test_checkpoint_rejects_mismatched_flow(self):
+        processor = PlayByPlayProcessor(
+            game_id="0012200039",
+            away_team_id=self.away_team_id,
+            home_team_id=self.home_team_id,
+        )
+        processor.update(self.actions[:250])
+        checkpoint = processor.checkpoint()
+
+        processor.update(self.actions[:300])
+        stale_flow = processor.payload(include_actions=False, include_all_actions=False)
+        self.assertIsNone(PlayByPlayProcessor.from_checkpoint(checkpoint, stale_flow))
+        self.assertIsNone(PlayByPlayProcessor.from_checkpoint({**checkpoint, "v": 999}, stale_flow))
+
+    def test_text_cache_reused_when_feed_replayed(self):
+        cache = ActionTextCache()
+        processor = PlayByPlayProcessor(
+            game_id="0012200039",
+            away_team_id=self.away_team_id,
+            home_team_id=self.home_team_id,
+            text_cache=cache,
+        )
+        processor.update(self.actions[:300])
+        misses = cache.misses
+        self.assertEqual(cache.hits, 0)
+
+        processor.update(self.actions[:200])
+        self.assertEqual(cache.misses, misses)
+        self.assertGreater(cache.hits, 0)
+        self.assertEqual(json.dumps(processor.payload()), self._batch_json(self.actions[:200]))
+
+        processor.update(self.actions)
+        self.assertEqual(json.dumps(processor.payload()), self._batch_json(self.actions))
+
+    def test_text_cache_is_size_bounded(self):
+        cache = ActionTextCache(max_size=50)
+        for action in self.actions[:120]:
+            self.assertEqual(cache.trim(action), pbp._trim_action(action))
+        self.assertEqual(len(cache), 50)
+        # The oldest entries were evicted, the newest are still served from the cache.
+        cache.trim(self.actions[119])
+        self.assertEqual(cache.hits, 1)
+        cache.trim(self.actions[0])
+        self.assertEqual(cache.hits, 1)
+
+    def test_assist_record_trims_like_action_dict(self):
+        action = next(a for a in self.actions if "AST" in (a.get("description") or ""))
+        assist = pbp._build_assist_action(action, {}, pbp.parse_assist_name(action))
+        as_dict = {field: getattr(assist, field) for field in pbp.AssistAction.__slots__}
+        self.assertEqual(pbp._trim_action(assist), pbp._trim_action(as_dict))
+        self.assertIsNone(assist.get("shotResult"))
+
+    def test_iter_events_streams_payload_events(self):
+        processor = PlayByPlayProcessor(
+            game_id="0012200039",
+            away_team_id=self.away_team_id,
+            home_team_id=self.home_team_id,
+        )
+        processor.update(self.actions)
+        self.assertEqual(list(processor.iter_events()), processor.payload()["events"])
+
+    def test_merged_events_match_sort_actions_for_unordered_runs(self):
+        runs = [
+            [{"quarter": 1, "time": "1100.00", "seq": 1}, {"quarter": 2, "time": "1000.00", "seq": 2}],
+            # Out of order, and ties with the first run on (1, 11:00).
+            [{"quarter": 1, "time": "0500.00", "seq": 3}, {"quarter": 1, "time": "1100.00", "seq": 4}],
+            [],
+        ]
+        expected = pbp.sort_actions([a for run in runs for a in run])
+        keyed = [([pbp._event_sort_key(a) for a in run], run) for run in runs]
+        self.assertEqual(list(pbp.iter_merged_events(keyed)), expected)
+        self.assertEqual([a["seq"] for a in expected], [1, 4, 3, 2])
+
+    def test_lineup_stints_follow_segments_and_score(self):
+        processed = process_playbyplay_payload(
+            game_id="0012200039",
+            actions=self.actions,
+            away_team_id=self.away_team_id,
+            home_team_id=self.home_team_id,
+            include_actions=False,
+            include_all_actions=False,
+        )
+        last = processed["last"]
+        for team, score_for, score_against in (
+            ("away", last["awayScore"], last["homeScore"]),
+            ("home", last["homeScore"], last["awayScore"]),
+        ):
+            stints = processed["lineups"][team]
+            self.assertEqual(sum(s["for"] for s in stints), int(score_for))
+            self.assertEqual(sum(s["against"] for s in stints), int(score_against))
+
+            segments = processed["segments"][team]
+            for stint in stints:
+                self.assertEqual(len(stint["players"]), 5, stint)
+                self.assertEqual(stint["players"], sorted(stint["players"]))
+                start, end = time_to_seconds(stint["start"]), time_to_seconds(stint["end"])
+                for name in stint["players"]:
+                    # Every listed player has a segment covering the whole stint.
+                    self.assertTrue(
+                        any(
+                            seg["quarter"] == stint["quarter"]
+                            and time_to_seconds(seg["start"]) >= start
+                            and time_to_seconds(seg["end"]) <= end
+                            for seg in segments[name]
+                        ),
+                        f"{name} not on court for {stint}",
+                    )
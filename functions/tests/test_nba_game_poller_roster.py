@@ -0,0 +1,88 @@
+import unittest
+
+from nba_game_poller.playbyplay_processing import PlayByPlayProcessor
+from nba_game_poller.roster import RosterIndex
+
+
+AWAY = 1610612740
+HOME = 1610612759
+
+
+def _action(number, person_id, player_name, description, action_type="2pt", **extra):
+    action = {
+        "actionNumber": number,
+        "clock": f"PT11M{59 - number:02d}.00S",
+        "period": 1,
+        "teamId": AWAY,
+        "teamTricode": "NOP",
+        "personId": person_id,
+        "playerName": player_name,
+        "playerNameI": player_name,
+        "description": description,
+        "actionType": action_type,
+        "subType": "",
+        "shotResult": "Made",
+        "scoreAway": str(number * 2),
+        "scoreHome": "0",
+    }
+    action.update(extra)
+    return action
+
+
+class TestRosterIndex(unittest.TestCase):
+    def test_first_learned_name_wins(self):
+        roster = RosterIndex()
+        self.assertEqual(roster.learn(1, "H. Jones", AWAY), "H. Jones")
+        self.assertEqual(roster.learn(1, "Jones", AWAY), "H. Jones")
+        self.assertEqual(roster.name_for(1), "H. Jones")
+        self.assertEqual(roster.person_for(AWAY, "H. Jones"), 1)
+        self.assertIsNone(roster.name_for(0))
+        self.assertIsNone(roster.learn(2, None))
+
+    def test_boxscore_family_names_and_json_roundtrip(self):
+        roster = RosterIndex().add_boxscore(
+            {
+                "awayTeam": {"teamId": AWAY, "players": [{"personId": 7, "familyName": "Roby "}]},
+                "homeTeam": {"teamId": HOME, "players": [None]},
+            }
+        )
+        self.assertEqual(roster.person_for(AWAY, "Roby"), 7)
+        self.assertIsNone(roster.person_for(HOME, "Roby"))
+
+        roster.learn(7, "I. Roby", AWAY)
+        restored = RosterIndex.from_json(roster.to_json())
+        self.assertEqual(restored.name_for(7), "I. Roby")
+        self.assertEqual(restored.person_for(AWAY, "I. Roby"), 7)
+
+    def test_processor_credits_assists_by_person_id(self):
+        processor = PlayByPlayProcessor(game_id="g", away_team_id=AWAY, home_team_id=HOME)
+        processor.update(
+            [
+                _action(1, 11, "Jones", "H. Jones 2' Layup (2 PTS)"),
+                # The description abbreviates the assister differently than his own actions.
+                _action(2, 22, "Murphy III", "T. Murphy III 2' Layup (2 PTS) (Jones 1 AST)", assistPersonId=11),
+            ]
+        )
+        players = processor.payload()["players"]["away"]
+        self.assertEqual(list(players), ["H. Jones", "T. Murphy III"])
+        self.assertEqual(len(players["H. Jones"]), 2)
+
+    def test_processor_resolves_legacy_substitution_through_boxscore(self):
+        processor = PlayByPlayProcessor(game_id="g", away_team_id=AWAY, home_team_id=HOME)
+        processor.roster.add_boxscore(
+            {"awayTeam": {"teamId": AWAY, "players": [{"personId": 33, "familyName": "Roby"}]}}
+        )
+        processor.update(
+            [
+                _action(1, 33, "Roby", "I. Roby 2' Layup (2 PTS)"),
+                _action(2, 11, "Jones", "SUB: Roby FOR Jones", action_type="Substitution", scoreAway=""),
+            ]
+        )
+        segments = processor.payload()["segments"]["away"]
+        self.assertIn("I. Roby", segments)
+        self.assertNotIn("Roby", segments)
+        self.assertEqual(len(segments["I. Roby"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import json
+import os
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from nba_game_poller.playbyplay_processing import PlayByPlayProcessor
+from nba_game_poller.stages import StageTimer, stage, stage_timing
+from nba_game_poller.storage import upload_json_to_s3
+
+
+class TestStageTiming(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        fixture_path = os.path.join(os.path.dirname(__file__), "fixtures/0012200039.json")
+        with open(fixture_path, "r", encoding="utf-8") as f:
+            cls.actions = json.load(f)
+
+    def test_disabled_is_a_no_op(self):
+        with stage("anything") as timed:
+            timed.count(5)
+            with self.assertRaises(AttributeError):
+                timed.items = 5
+        self.assertEqual(stage("anything").items, 0)
+        timer = StageTimer()
+        with stage_timing(timer):
+            with stage_timing(None):
+                with stage("ignored"):
+                    pass
+        self.assertEqual(timer.stages, {})
+
+    def test_records_processing_and_upload_stages(self):
+        timer = StageTimer()
+        processor = PlayByPlayProcessor(game_id="0012200039", away_team_id=1610612740, home_team_id=1610612759)
+        with stage_timing(timer):
+            processor.update(self.actions[:300])
+            processor.update(self.actions)
+            flow = processor.payload(include_actions=False, include_all_actions=False)
+            upload_json_to_s3(s3_client=MagicMock(), bucket="b", prefix="data/", key="g.json", data=flow)
+
+        report = timer.to_json()
+        self.assertEqual(report["pbp.consume"]["calls"], 2)
+        self.assertEqual(report["pbp.consume"]["items"], len(self.actions))
+        self.assertEqual(report["pbp.segments"]["calls"], 1)
+        self.assertNotIn("pbp.events", report)
+        self.assertGreater(report["serialize"]["items"], report["upload"]["items"])
+        for name in ("pbp.classify", "pbp.players", "compress", "upload"):
+            self.assertIn(name, report)
+
+    def test_merge_and_thread_isolation(self):
+        game = StageTimer()
+        invocation = StageTimer()
+        with stage_timing(game):
+            with stage("fetch.play", items=1):
+                worker = threading.Thread(target=lambda: stage("worker").__enter__())
+                worker.start()
+                worker.join()
+        invocation.merge(game)
+        invocation.merge(game)
+        self.assertEqual(list(game.stages), ["fetch.play"])
+        self.assertEqual(invocation.to_json()["fetch.play"]["calls"], 2)
+        self.assertEqual(invocation.to_json()["fetch.play"]["items"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import gzip
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from nba_game_poller.storage import (
+    DEFAULT_COMPRESSION_POLICIES,
+    CompressionPolicy,
+    parse_compression_policies,
+    update_manifest,
+    upload_json_to_s3,
+)
+
+
+class TestCompressionPolicy(unittest.TestCase):
+    data = {"score": [{"quarter": q, "time": "1143.00"} for q in range(1, 5)] * 50}
+
+    def _upload(self, **kwargs):
+        s3_client = MagicMock()
+        upload_json_to_s3(s3_client=s3_client, bucket="b", prefix="data/", key="gamepack/game.json",
+                          data=self.data, **kwargs)
+        return [c.kwargs for c in s3_client.put_object.call_args_list]
+
+    def test_live_and_final_levels(self):
+        policy = CompressionPolicy(live_level=1, final_level=9)
+        with patch("nba_game_poller.storage.gzip.compress", wraps=gzip.compress) as compress:
+            (live,) = self._upload(policy=policy)
+            (final,) = self._upload(policy=policy, is_final=True)
+        self.assertEqual([c.kwargs["compresslevel"] for c in compress.call_args_list], [1, 9])
+        self.assertEqual(live["ContentEncoding"], "gzip")
+        self.assertIn("must-revalidate", live["CacheControl"])
+        self.assertIn("max-age=604800", final["CacheControl"])
+        self.assertEqual(json.loads(gzip.decompress(final["Body"])), self.data)
+        # Same data, same bytes: S3 ETags do not change between polls.
+        self.assertEqual(self._upload(policy=policy)[0]["Body"], live["Body"])
+
+    def test_compress_final_override(self):
+        policy = CompressionPolicy(live_level=1, final_level=9)
+        with patch("nba_game_poller.storage.gzip.compress", wraps=gzip.compress) as compress:
+            # Immutable deltas keep the cache headers but skip the final recompress.
+            (delta,) = self._upload(policy=policy, is_final=True, compress_final=False)
+        self.assertEqual(compress.call_args.kwargs["compresslevel"], 1)
+        self.assertEqual(delta["Key"], "data/gamepack/game.json.gz")
+        self.assertIn("max-age=604800", delta["CacheControl"])
+
+    def test_parse_policies(self):
+        policies = parse_compression_policies("gamepack=1:6, schedule=9, manifest=6, bogus=1, schedule=x, manifest=1:2:3")
+        self.assertEqual(policies["gamepack"], CompressionPolicy(1, 6))
+        self.assertEqual(policies["schedule"], CompressionPolicy(9, 9))
+        self.assertEqual(policies["manifest"], CompressionPolicy(6, 6))
+        self.assertEqual(parse_compression_policies(None), DEFAULT_COMPRESSION_POLICIES)
+
+    def test_manifest_policy(self):
+        s3_client = MagicMock()
+        s3_client.get_object.side_effect = Exception("missing")
+        update_manifest(s3_client=s3_client, bucket="b", manifest_key="manifest.json", game_id="g1")
+        plain = s3_client.put_object.call_args.kwargs
+        self.assertNotIn("ContentEncoding", plain)
+        self.assertEqual(json.loads(plain["Body"]), ["g1"])
+
+        s3_client.get_object.side_effect = None
+        s3_client.get_object.return_value = {"Body": MagicMock(read=lambda: gzip.compress(b'["g1"]'))}
+        update_manifest(s3_client=s3_client, bucket="b", manifest_key="manifest.json", game_id="g2",
+                        policy=CompressionPolicy(6, 6))
+        packed = s3_client.put_object.call_args.kwargs
+        self.assertEqual(packed["ContentEncoding"], "gzip")
+        self.assertEqual(sorted(json.loads(gzip.decompress(packed["Body"]))), ["g1", "g2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
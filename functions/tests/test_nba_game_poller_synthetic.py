@@ -0,0 +1,102 @@
+import unittest
+
+from nba_game_poller.gamepack import build_gamepack
+from nba_game_poller.playbyplay_processing import PlayByPlayProcessor
+from nba_game_poller.synthetic import SyntheticGame, generate_night
+
+
+AWAY = 1610612740
+HOME = 1610612759
+
+
+class TestSyntheticGame(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.game = SyntheticGame("0022500001", AWAY, HOME, seed=7, overtimes=2)
+
+    def test_seeded_and_reproducible(self):
+        again = SyntheticGame("0022500001", AWAY, HOME, seed=7, overtimes=2)
+        self.assertEqual(again.actions, self.game.actions)
+        self.assertEqual(again.box_payload(), self.game.box_payload())
+        other = SyntheticGame("0022500001", AWAY, HOME, seed=8, overtimes=2)
+        self.assertNotEqual(other.actions, self.game.actions)
+
+    def test_scores_and_periods_are_consistent(self):
+        actions = self.game.actions
+        self.assertEqual(max(a["period"] for a in actions), 6)
+        self.assertEqual(actions[-1]["description"], "Game End")
+
+        end_of_regulation = next(
+            a for a in actions if a["actionType"] == "period" and a["subType"] == "end" and a["period"] == 4
+        )
+        self.assertEqual(end_of_regulation["scoreAway"], end_of_regulation["scoreHome"])
+        self.assertNotEqual(actions[-1]["scoreAway"], actions[-1]["scoreHome"])
+
+        points = {"away": 0, "home": 0}
+        for a in actions:
+            if a.get("shotResult") == "Made":
+                side = "away" if a["teamId"] == AWAY else "home"
+                points[side] += {"2pt": 2, "3pt": 3, "freethrow": 1}[a["actionType"]]
+        self.assertEqual(points, {"away": int(actions[-1]["scoreAway"]), "home": int(actions[-1]["scoreHome"])})
+
+        box = self.game.box_payload()["game"]
+        self.assertEqual(box["gameStatusText"], "Final/2OT")
+        for side in ("away", "home"):
+            team = box[f"{side}Team"]
+            self.assertEqual(team["score"], points[side])
+            self.assertEqual(sum(p["statistics"]["points"] for p in team["players"]), points[side])
+            self.assertEqual(sum(period["score"] for period in team["periods"]), points[side])
+            # Five players on court for the 58 minutes of a double-overtime game.
+            minutes = sum(int(p["statistics"]["minutes"][2:4]) * 60 + float(p["statistics"]["minutes"][5:10])
+                          for p in team["players"])
+            self.assertAlmostEqual(minutes, 5 * 58 * 60, places=3)
+
+    def test_snapshots_are_prefixes_in_game_order(self):
+        snapshots = list(self.game.snapshots(interval=120))
+        counts = [len(play["game"]["actions"]) for _, play, _ in snapshots]
+        self.assertEqual(counts, sorted(set(counts)))
+        self.assertEqual(counts[-1], len(self.game.actions))
+        elapsed = [e for e, _, _ in snapshots]
+        self.assertEqual(elapsed, sorted(elapsed))
+
+        _, play, box = snapshots[10]
+        self.assertEqual(play["game"]["actions"], self.game.actions[: counts[10]])
+        self.assertEqual(box, self.game.box_payload(counts[10]))
+        self.assertTrue(box["game"]["gameStatusText"].startswith("Q"))
+        self.assertEqual(snapshots[-1][2]["game"]["gameStatus"], 3)
+
+    def test_processor_consumes_feed_and_substitutions(self):
+        game = SyntheticGame("0022500002", AWAY, HOME, seed=1, sub_rate=3.0)
+        processor = PlayByPlayProcessor(game_id=game.game_id, away_team_id=AWAY, home_team_id=HOME)
+        processor.roster.add_boxscore(game.box_payload()["game"])
+        for _, play, _ in game.snapshots(interval=90):
+            processor.update(play["game"]["actions"])
+
+        flow = processor.payload(include_actions=False, include_all_actions=False)
+        # Every substituted player resolves to a roster name, not a parsed fragment.
+        names = {name for _, name, _ in processor.roster.to_json()}
+        for team in ("away", "home"):
+            self.assertLessEqual(set(flow["segments"][team]), names)
+        last = game.actions[-1]
+        self.assertEqual((flow["last"]["awayScore"], flow["last"]["homeScore"]), (last["scoreAway"], last["scoreHome"]))
+        names = {p["nameI"] for p in game.rosters["away"]}
+        self.assertTrue(set(flow["players"]["away"]) <= names)
+        substituted = [name for name, segs in flow["segments"]["away"].items() if len(segs) > 4]
+        self.assertTrue(substituted)
+
+        gamepack, is_final = build_gamepack("game", game.game_id, game.play_payload(), game.box_payload())
+        self.assertTrue(is_final)
+        self.assertEqual(gamepack["flow"]["last"], flow["last"])
+        self.assertEqual(gamepack["box"]["teams"]["home"]["abbr"], "SAS")
+
+    def test_night_has_distinct_teams(self):
+        games = generate_night("2025-10-21", count=15, seed=3)
+        teams = [team_id for game in games for team_id in game.team_ids.values()]
+        self.assertEqual(len(set(teams)), 30)
+        self.assertEqual(len({game.game_id for game in games}), 15)
+        with self.assertRaises(ValueError):
+            generate_night("2025-10-21", count=16)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ import os
 import sys
 import time
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 
 import boto3
@@ -13,11 +14,16 @@ from botocore.exceptions import ClientError
 ROOT = os.path.dirname(os.path.dirname(__file__))
 sys.path.insert(0, os.path.join(ROOT, "functions", "nba-game-poller"))
 
-from nba_game_poller.nba_api import fetch_nba_data_urllib  # noqa: E402
-from nba_game_poller.playbyplay_processing import process_playbyplay_payload  # noqa: E402
-from nba_game_poller.storage import upload_json_to_s3  # noqa: E402
-
-SCHEDULE_FEED_URL = "https://cdn.nba.com/static/json/staticData/scheduleLeagueV2_1.json"
+from nba_game_poller.batch import process_games_batch  # noqa: E402
+from nba_game_poller.clock import trim_clock  # noqa: E402
+from nba_game_poller.gamepack import build_gamepack  # noqa: E402
+from nba_game_poller.nba_api import (  # noqa: E402
+    boxscore_url,
+    fetch_nba_data_urllib,
+    playbyplay_url,
+    schedule_feed_url,
+)
+from nba_game_poller.storage import upload_compressed_json_to_s3, upload_json_to_s3  # noqa: E402
 
 
 def parse_args():
@@ -69,6 +75,11 @@ def parse_args():
         default="private/gameIdMap/",
         help="S3 prefix for game id map files",
     )
+    parser.add_argument(
+        "--cdn-base-url",
+        default=None,
+        help="Fetch NBA feeds from this base URL instead of cdn.nba.com (e.g. a local fake_cdn).",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -91,6 +102,12 @@ def parse_args():
         default=2.0,
         help="Delay between each date (default: 2.0s).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to build gamepacks (default: 1, inline).",
+    )
     parser.add_argument(
         "--skip-future",
         action="store_true",
@@ -213,16 +230,7 @@ def build_game_slug(date_str, away_team, home_team, fallback_id=None):
 
 
 def trim_clock_value(clock):
-    if not clock or not isinstance(clock, str):
-        return clock
-    trimmed = clock.strip()
-    if trimmed.startswith("PT"):
-        trimmed = trimmed[2:]
-    if trimmed.endswith("S"):
-        trimmed = trimmed[:-1]
-    if "M" in trimmed:
-        trimmed = trimmed.replace("M", "")
-    return trimmed
+    return trim_clock(clock)
 
 
 def coerce_nba_game_id(value):
@@ -232,8 +240,8 @@ def coerce_nba_game_id(value):
     return raw if raw.isdigit() else None
 
 
-def build_feed_schedule(date_str):
-    data, _ = fetch_nba_data_urllib(SCHEDULE_FEED_URL)
+def build_feed_schedule(date_str, base_url=None):
+    data, _ = fetch_nba_data_urllib(schedule_feed_url(base_url))
     league = data.get("leagueSchedule", {}) if isinstance(data, dict) else {}
     game_dates = league.get("gameDates", []) if isinstance(league, dict) else []
     schedule = []
@@ -348,8 +356,8 @@ def build_game_id_map_from_schedule(schedule, date_str):
     return mapping
 
 
-def load_games_from_feed(date_str):
-    data, _ = fetch_nba_data_urllib(SCHEDULE_FEED_URL)
+def load_games_from_feed(date_str, base_url=None):
+    data, _ = fetch_nba_data_urllib(schedule_feed_url(base_url))
     league = data.get("leagueSchedule", {}) if isinstance(data, dict) else {}
     game_dates = league.get("gameDates", []) if isinstance(league, dict) else []
     games = []
@@ -367,143 +375,23 @@ def load_games_from_feed(date_str):
     return games
 
 
-def build_box_payload(game_id, box_game):
-    if not isinstance(box_game, dict):
-        return None
-    return {
-        "start": (
-            box_game.get("gameEt")
-            or box_game.get("gameTimeUTC")
-            or box_game.get("gameDateTimeUTC")
-        ),
-        "teams": {
-            "away": build_team_payload(box_game.get("awayTeam")),
-            "home": build_team_payload(box_game.get("homeTeam")),
-        },
-    }
-
-
-def build_team_payload(team):
-    if not isinstance(team, dict):
-        return None
-    players = []
-    for player in team.get("players") or []:
-        if not isinstance(player, dict):
-            continue
-        stats = player.get("statistics") or {}
-        players.append(
-            {
-                "first": (player.get("firstName") or "").strip(),
-                "last": (player.get("familyName") or "").strip(),
-                "stats": {
-                    "min": normalize_minutes(stats.get("minutes")),
-                    "pts": safe_int(stats.get("points")),
-                    "fgm": safe_int(stats.get("fieldGoalsMade")),
-                    "fga": safe_int(stats.get("fieldGoalsAttempted")),
-                    "tpm": safe_int(stats.get("threePointersMade")),
-                    "tpa": safe_int(stats.get("threePointersAttempted")),
-                    "ftm": safe_int(stats.get("freeThrowsMade")),
-                    "fta": safe_int(stats.get("freeThrowsAttempted")),
-                    "oreb": safe_int(stats.get("reboundsOffensive")),
-                    "dreb": safe_int(stats.get("reboundsDefensive")),
-                    "ast": safe_int(stats.get("assists")),
-                    "stl": safe_int(stats.get("steals")),
-                    "blk": safe_int(stats.get("blocks")),
-                    "to": safe_int(stats.get("turnovers")),
-                    "pf": safe_int(stats.get("foulsPersonal")),
-                    "pm": safe_int(stats.get("plusMinusPoints")),
-                },
-            }
-        )
-    return {
-        "id": team.get("teamId"),
-        "abbr": team.get("teamTricode"),
-        "name": team.get("teamName"),
-        "players": players,
-    }
-
-
-def normalize_minutes(raw_minutes):
-    if not raw_minutes:
-        return "00:00"
-    if isinstance(raw_minutes, str):
-        minutes = raw_minutes.strip()
-        if minutes.startswith("PT") and minutes.endswith("S"):
-            stripped = minutes[2:-1]
-            if "M" in stripped:
-                mins_part, sec_part = stripped.split("M", 1)
-                mins = safe_int(mins_part)
-                secs = int(float(sec_part)) if sec_part else 0
-            else:
-                mins = 0
-                secs = int(float(stripped)) if stripped else 0
-            return f"{mins:02d}:{secs:02d}"
-        if ":" in minutes:
-            return minutes
-    return "00:00"
-
-
-def safe_int(value):
-    if value is None:
-        return 0
-    try:
-        return int(value)
-    except (TypeError, ValueError):
-        try:
-            return int(float(value))
-        except (TypeError, ValueError):
-            return 0
-
+def fetch_raw_game(game_key, nba_game_id, base_url=None, parse=None):
+    play_data, _ = fetch_nba_data_urllib(playbyplay_url(nba_game_id, base_url), parse=parse)
+    box_data, _ = fetch_nba_data_urllib(boxscore_url(nba_game_id, base_url), parse=parse)
+    return {"id": str(game_key), "nbaGameId": str(nba_game_id), "play": play_data, "box": box_data}
 
-def backfill_gamepack_for_game(game_key, nba_game_id, s3_client, bucket, prefix, dry_run=False):
-    play_url = f"https://cdn.nba.com/static/json/liveData/playbyplay/playbyplay_{nba_game_id}.json"
-    box_url = f"https://cdn.nba.com/static/json/liveData/boxscore/boxscore_{nba_game_id}.json"
-    play_data, _ = fetch_nba_data_urllib(play_url)
-    box_data, _ = fetch_nba_data_urllib(box_url)
 
-    if not play_data or not box_data:
+def backfill_gamepack_for_game(game_key, nba_game_id, s3_client, bucket, prefix, dry_run=False, base_url=None):
+    raw = fetch_raw_game(game_key, nba_game_id, base_url)
+    if not raw["play"] or not raw["box"]:
         print(f"Skip {game_key}: missing play or box data.")
         return False
 
-    actions = play_data.get("game", {}).get("actions", [])
-    box_game = box_data.get("game", {})
-    if not actions or not box_game:
+    gamepack, is_final = build_gamepack(game_key, nba_game_id, raw["play"], raw["box"])
+    if gamepack is None:
         print(f"Skip {game_key}: empty actions or box payload.")
         return False
 
-    home_team_id = (
-        box_game.get("homeTeam", {}).get("teamId") or box_game.get("homeTeamId")
-    )
-    away_team_id = (
-        box_game.get("awayTeam", {}).get("teamId") or box_game.get("awayTeamId")
-    )
-    play_game = play_data.get("game", {})
-    home_team_id = home_team_id or play_game.get("homeTeamId") or play_game.get("homeTeam", {}).get("teamId")
-    away_team_id = away_team_id or play_game.get("awayTeamId") or play_game.get("awayTeam", {}).get("teamId")
-
-    processed = process_playbyplay_payload(
-        game_id=str(nba_game_id),
-        actions=actions,
-        away_team_id=away_team_id,
-        home_team_id=home_team_id,
-        include_actions=False,
-        include_all_actions=False,
-    )
-    slim_box = build_box_payload(str(nba_game_id), box_game)
-
-    last_desc = (actions[-1].get("description") or "").strip() if actions else ""
-    is_play_final = last_desc.startswith("Game End")
-    status_text = (box_game.get("gameStatusText") or "").strip()
-    is_box_final = status_text.startswith("Final")
-
-    gamepack = {
-        "v": 1,
-        "id": str(nba_game_id),
-        "publicId": str(game_key),
-        "box": slim_box,
-        "flow": processed,
-    }
-
     if dry_run:
         print(f"DRY RUN: would upload gamepack for {game_key}")
         return True
@@ -514,11 +402,51 @@ def backfill_gamepack_for_game(game_key, nba_game_id, s3_client, bucket, prefix,
         prefix=prefix,
         key=f"gamepack/{game_key}.json",
         data=gamepack,
-        is_final=is_play_final or is_box_final,
+        is_final=is_final,
     )
     return True
 
 
+def iter_raw_games(games, sleep_seconds, base_url=None):
+    # Feeds stay undecoded response bodies; the pool workers parse them.
+    for index, game in enumerate(games):
+        if sleep_seconds and index:
+            time.sleep(sleep_seconds)
+        yield fetch_raw_game(game["id"], game["nbaGameId"], base_url, parse=lambda body: body)
+
+
+def backfill_gamepacks_in_pool(
+    games, s3_client, bucket, prefix, workers, sleep_seconds=0, dry_run=False, base_url=None, pool=None
+):
+    """
+    Fetches games sequentially and processes them across a process pool,
+    pool if given (sized workers), otherwise one created for these games.
+    """
+    success = 0
+    raw_games = iter_raw_games(games, sleep_seconds, base_url)
+    for result in process_games_batch(raw_games, workers=workers, pool=pool):
+        game_key = result["id"]
+        if result["error"]:
+            print(f"Skip {game_key}: {result['error']}")
+            continue
+        if result["body"] is None:
+            print(f"Skip {game_key}: missing or empty play or box data.")
+            continue
+        success += 1
+        if dry_run:
+            print(f"DRY RUN: would upload gamepack for {game_key}")
+            continue
+        upload_compressed_json_to_s3(
+            s3_client=s3_client,
+            bucket=bucket,
+            prefix=prefix,
+            key=f"gamepack/{game_key}.json",
+            body=result["body"],
+            is_final=result["final"],
+        )
+    return success
+
+
 def main():
     args = parse_args()
     s3_client = boto3.client("s3", region_name=args.region)
@@ -551,23 +479,29 @@ def main():
     total_dates = len(date_list)
     print(f"Processing {total_dates} date(s).")
 
-    for index, date_str in enumerate(date_list, start=1):
-        print(f"\n[{index}/{total_dates}] Backfill for {date_str}")
-        run_for_date(args, s3_client, date_str)
-        if args.sleep_date_seconds and index < total_dates:
-            time.sleep(args.sleep_date_seconds)
+    # One pool for the whole run, so worker startup is not paid per date.
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    try:
+        for index, date_str in enumerate(date_list, start=1):
+            print(f"\n[{index}/{total_dates}] Backfill for {date_str}")
+            run_for_date(args, s3_client, date_str, pool=pool)
+            if args.sleep_date_seconds and index < total_dates:
+                time.sleep(args.sleep_date_seconds)
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
 
-def run_for_date(args, s3_client, date_str):
+def run_for_date(args, s3_client, date_str, pool=None):
     if args.use_feed:
-        schedule = build_feed_schedule(date_str)
+        schedule = build_feed_schedule(date_str, args.cdn_base_url)
     else:
         schedule = load_schedule_from_s3(
             s3_client, args.bucket, date_str, args.schedule_prefix
         )
         if not schedule:
             print("Schedule file missing or empty; falling back to NBA schedule feed.")
-            schedule = build_feed_schedule(date_str)
+            schedule = build_feed_schedule(date_str, args.cdn_base_url)
 
     schedule_map = build_game_id_map_from_schedule(schedule, date_str)
     schedule = build_schedule_payload(schedule, date_str) if schedule else []
@@ -596,7 +530,7 @@ def run_for_date(args, s3_client, date_str):
             game_id_map,
         )
     if not game_id_map:
-        feed_games = load_games_from_feed(date_str)
+        feed_games = load_games_from_feed(date_str, args.cdn_base_url)
         game_id_map = {entry["id"]: entry["nbaGameId"] for entry in feed_games}
         if game_id_map:
             upload_game_id_map_to_s3(
@@ -623,6 +557,21 @@ def run_for_date(args, s3_client, date_str):
         return
 
     print(f"Backfilling {len(games)} games for {date_str}...")
+    if args.workers > 1:
+        success = backfill_gamepacks_in_pool(
+            games,
+            s3_client=s3_client,
+            bucket=args.bucket,
+            prefix=args.prefix,
+            workers=args.workers,
+            sleep_seconds=args.sleep_seconds,
+            dry_run=args.dry_run,
+            base_url=args.cdn_base_url,
+            pool=pool,
+        )
+        print(f"Done. Uploaded {success}/{len(games)} gamepacks for {date_str}.")
+        return
+
     success = 0
     for game in games:
         if backfill_gamepack_for_game(
@@ -632,6 +581,7 @@ def run_for_date(args, s3_client, date_str):
             bucket=args.bucket,
             prefix=args.prefix,
             dry_run=args.dry_run,
+            base_url=args.cdn_base_url,
         ):
             success += 1
         if args.sleep_seconds:
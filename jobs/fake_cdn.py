@@ -0,0 +1,132 @@
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "functions", "nba-game-poller"))
+
+from nba_game_poller.fake_cdn import FakeCdn, load_recording, make_server  # noqa: E402
+from nba_game_poller.synthetic import generate_night  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Serve a local stand-in for the NBA CDN that replays synthetic or recorded games. "
+            "Point the poller (NBA_CDN_BASE_URL) or backfill_gamepack.py (--cdn-base-url) at it."
+        )
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8765, help="Port (default: 8765).")
+    parser.add_argument(
+        "--date",
+        default="2025-10-21",
+        help="Date of the synthetic night in YYYY-MM-DD (default: 2025-10-21).",
+    )
+    parser.add_argument(
+        "--games",
+        type=int,
+        default=10,
+        help="Synthetic games on the night, 0 for none (default: 10).",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Generator seed (default: 0).")
+    parser.add_argument(
+        "--overtime-rate",
+        type=float,
+        default=0.06,
+        help="Chance of each overtime period in synthetic games (default: 0.06).",
+    )
+    parser.add_argument(
+        "--sub-rate",
+        type=float,
+        default=1.0,
+        help="Substitution rate multiplier for synthetic games (default: 1.0).",
+    )
+    parser.add_argument(
+        "--recording",
+        action="append",
+        default=[],
+        help="GAME_ID=PATH[@TIP_OFF] JSON lines snapshot file to replay; repeatable.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=30,
+        help="Game seconds between synthetic snapshots (default: 30).",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=10.0,
+        help="Fake seconds per wall second (default: 10).",
+    )
+    parser.add_argument(
+        "--start-at",
+        type=float,
+        default=0.0,
+        help="Start the fake clock at this many fake seconds (default: 0).",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay per request in ms (default: 0).")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra random delay up to this many ms.")
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with a 503 (default: 0).",
+    )
+    return parser.parse_args()
+
+
+def parse_recording(spec):
+    game_id, _, rest = spec.partition("=")
+    path, _, tip_off = rest.partition("@")
+    if not game_id or not path:
+        raise SystemExit(f"--recording expects GAME_ID=PATH[@TIP_OFF], got {spec!r}")
+    return game_id, path, float(tip_off or 0)
+
+
+def main():
+    args = parse_args()
+    games = generate_night(
+        args.date,
+        count=args.games,
+        seed=args.seed,
+        overtime_rate=args.overtime_rate,
+        sub_rate=args.sub_rate,
+    ) if args.games else []
+    cdn = FakeCdn.from_night(
+        games,
+        interval=args.interval,
+        speed=args.speed,
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    for spec in args.recording:
+        game_id, path, tip_off = parse_recording(spec)
+        cdn.add_game(game_id, load_recording(path), tip_off=tip_off)
+    cdn.set_time(args.start_at)
+
+    server = make_server(cdn, args.host, args.port)
+    base_url = f"http://{args.host}:{server.server_address[1]}"
+    print(f"Fake NBA CDN on {base_url} ({args.speed:g}x)")
+    for game in games:
+        away, home = game.team_ids["away"], game.team_ids["home"]
+        print(f"  {game.game_id} {away} @ {home} tip {game.start_time} ({game.overtimes} OT)")
+    print(f"  export NBA_CDN_BASE_URL={base_url}")
+
+    started = time.monotonic()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        elapsed = time.monotonic() - started
+        print(f"\nServed {cdn.stats['requests']} requests in {elapsed:.0f}s: {cdn.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -56,7 +56,8 @@ resource "aws_iam_role_policy" "nba_poller_policy" {
         Resource = [
           "arn:aws:s3:::roryeagan.com-nba-processed-data/data/*",
           "arn:aws:s3:::roryeagan.com-nba-processed-data/schedule/*",
-          "arn:aws:s3:::roryeagan.com-nba-processed-data/private/gameIdMap/*"
+          "arn:aws:s3:::roryeagan.com-nba-processed-data/private/gameIdMap/*",
+          "arn:aws:s3:::roryeagan.com-nba-processed-data/private/checkpoint/*"
         ]
       },
       # 3. EventBridge Rule Control
@@ -106,6 +107,11 @@ data "archive_file" "zip_nba_poller" {
   type        = "zip"
   source_dir  = local.src_nba_poller
   output_path = "${local.build_dir}/nba-game-poller.zip"
+  # Benchmark and local-testing helpers, never imported by the handler.
+  excludes = [
+    "nba_game_poller/fake_cdn.py",
+    "nba_game_poller/synthetic.py",
+  ]
 }
 
 resource "aws_lambda_function" "nba_poller" {
@@ -126,6 +132,7 @@ resource "aws_lambda_function" "nba_poller" {
       POLLER_RULE_NAME = aws_cloudwatch_event_rule.nba_poller_rule.name
       SCHEDULE_RECONCILE_DAYS = "4"
       GAME_ID_MAP_PREFIX = "private/gameIdMap/"
+      CHECKPOINT_PREFIX = "private/checkpoint/"
     }
   }
 }
@@ -34,6 +34,26 @@ resource "aws_s3_bucket_notification" "data_bucket_trigger" {
   ]
 }
 
+# Gamepack deltas (data/gamepack-delta/{game}/{lineage}/{version}.json) only
+# help clients that are following a game live; every poll adds one, and they
+# are never overwritten, so expire them once the week-long CDN cache is gone.
+resource "aws_s3_bucket_lifecycle_configuration" "data_bucket_lifecycle" {
+  bucket = aws_s3_bucket.data_bucket.id
+
+  rule {
+    id     = "expire-gamepack-deltas"
+    status = "Enabled"
+
+    filter {
+      prefix = "data/gamepack-delta/"
+    }
+
+    expiration {
+      days = 7
+    }
+  }
+}
+
 # 2. The Frontend Hosting Bucket
 resource "aws_s3_bucket" "frontend_bucket" {
   bucket = "roryeagan.com-nba"